@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+"""Offline audit of a persisted blockchain.
+
+Checks the hash of every block of a chain log written by the server
+(--chain-file), without starting the server nor loading the chain. The blocks
+are audited in parallel by a process pool, or sequentially, like the server
+does, with --sequential.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from models.server import Server
+from models.chain_store import ChainStore, read_header, record_at
+from models.parallel_audit import ParallelAudit
+from models.hash import Hash
+
+
+def audit_sequential(chain_file: str):
+    """Loads the chain and audits it in a single process.
+
+    A record that can't be decoded is an invalid block, as in the parallel
+    audit.
+
+    Returns:
+        The number of blocks and the index of the first invalid block, None
+        if all are valid: (int, Optional[int])
+    """
+    if not os.path.exists(chain_file):
+        raise FileNotFoundError(f"No such chain log: {chain_file}")
+
+    # Never written: not upgraded, and an interrupted write is only skipped
+    chain_store = ChainStore(chain_file, read_only=True)
+    server = Server(0)
+    server.terminate()  # Only the chain is used
+    server.block_encoding = chain_store.encoding
+
+    try:
+        for block in chain_store.load(repair=False):
+            server.block_chain.append(block)
+    except ValueError:
+        # Only the blocks before it can be audited
+        Hash.validate_blockchain_hash(server)
+        return (count_records(chain_file), server.verified_height)
+
+    if Hash.validate_blockchain_hash(server):
+        return (len(server.block_chain), None)
+    return (len(server.block_chain), server.verified_height)
+
+
+def count_records(chain_file: str) -> int:
+    """Counts the complete records of a chain log, without decoding them."""
+    with open(chain_file, "rb") as log:
+        read_header(log)
+        data = log.read()
+
+    count = 0
+    offset = 0
+    while True:
+        (hash_b, _, offset) = record_at(data, offset)
+        if hash_b is None:
+            return count
+        count += 1
+
+
+def main(chain_file: str, workers: int = None, sequential: bool = False) -> int:
+    start = time.perf_counter()
+    if sequential:
+        (count, first_invalid) = audit_sequential(chain_file)
+    else:
+        (count, first_invalid) = ParallelAudit.audit_log(chain_file, workers)
+    elapsed = time.perf_counter() - start
+
+    if first_invalid is None:
+        print(f"{count} blocks, all valid ({elapsed:.2f}s)")
+        return 0
+
+    print(f"{count} blocks, first invalid block: {first_invalid} ({elapsed:.2f}s)")
+    return 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Audit a persisted blockchain")
+    parser.add_argument("chain_file", type=str, help="Chain log of the server")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes auditing the chain (default: one per CPU).",
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Load the chain and audit it in a single process, the way the "
+        "server does.",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        sys.exit(main(args.chain_file, args.workers, args.sequential))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""Bulk import, export and migration of persisted blockchains.
+
+Exports the chain log of a server (--chain-file) to NDJSON or to the binary
+format, and imports such a file into a new chain log, checking every hash and
+rebuilding the balances in a single pass. Both stream the blocks, so files of
+any size can be converted with constant memory. Chains hashed with a legacy
+encoding are migrated to the current one, into a new chain log, the same way.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import argparse
+import sys
+import time
+
+from models.chain_io import ChainIO, FORMATS
+
+
+def export_command(args) -> int:
+    start = time.perf_counter()
+    count = ChainIO.export_chain(args.chain_file, args.output, args.format)
+    elapsed = time.perf_counter() - start
+
+    print(f"Exported {count} blocks to {args.output} ({elapsed:.2f}s)")
+    return 0
+
+
+def import_command(args) -> int:
+    start = time.perf_counter()
+    (count, accounts) = ChainIO.import_chain(args.input, args.chain_file, args.format)
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"Imported {count} blocks, {accounts} accounts to {args.chain_file} "
+        f"({elapsed:.2f}s)"
+    )
+    return 0
+
+
+def migrate_command(args) -> int:
+    start = time.perf_counter()
+    (count, accounts) = ChainIO.migrate_chain(args.chain_file, args.output)
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"Migrated {count} blocks, {accounts} accounts to {args.output} "
+        f"({elapsed:.2f}s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Import, export and migrate persisted blockchains"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser(
+        "export", help="Export a chain log to a file."
+    )
+    export_parser.add_argument("chain_file", type=str, help="Chain log to export")
+    export_parser.add_argument("output", type=str, help="File to create")
+    export_parser.set_defaults(handler=export_command)
+
+    import_parser = subparsers.add_parser(
+        "import", help="Import an exported file into a new chain log."
+    )
+    import_parser.add_argument("input", type=str, help="Exported file")
+    import_parser.add_argument(
+        "chain_file", type=str, help="Chain log to create, must not exist"
+    )
+    import_parser.set_defaults(handler=import_command)
+
+    migrate_parser = subparsers.add_parser(
+        "migrate",
+        help="Rehash a chain log of a legacy encoding into a new chain log.",
+    )
+    migrate_parser.add_argument("chain_file", type=str, help="Chain log to migrate")
+    migrate_parser.add_argument(
+        "output", type=str, help="Chain log to create, must not exist"
+    )
+    migrate_parser.set_defaults(handler=migrate_command)
+
+    for subparser in (export_parser, import_parser):
+        subparser.add_argument(
+            "--format",
+            choices=FORMATS,
+            default="ndjson",
+            help="Format of the exported file (default: ndjson).",
+        )
+
+    args = parser.parse_args()
+
+    try:
+        sys.exit(args.handler(args))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -5,14 +5,17 @@ which effectively creates their account. Stores the account creation timestamp
 in addition to standard block fields. Always represents a deposit operation.
 
 Authors: Andre Grassi de Jesus, Ricardo Faria
-Last Modified: Nov. 14 2025
+Last Modified: Oct. 18 2026
 """
 
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from models.operation import Operation
 from models.block import Block
+from models.amount import format_amount
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 
 class AccCreationBlock(Block):
@@ -27,12 +30,20 @@ class AccCreationBlock(Block):
         "created".
     """
 
-    def __init__(self, owner_name: str, amount: float, date: datetime):
+    KIND = 1
+
+    __slots__ = ("date",)
+
+    def __init__(self, owner_name: str, amount: int, date: datetime):
         # An account creation must always be a deposit
         super().__init__(owner_name, amount, Operation.DEPOSIT)
 
         self.date = date
 
+    def _date_us(self) -> int:
+        """Creation date in microseconds since the epoch (UTC)."""
+        return (self.date - EPOCH) // timedelta(microseconds=1)
+
     def __repr__(self):
         if self.hash_b is None:
             hash_hex = "None"
@@ -40,6 +51,5 @@ class AccCreationBlock(Block):
             hash_hex = self.hash_b.hex()[:3]
 
         date_str = self.date.strftime("%Y-%m-%d %H:%M:%S")
-        return (
-            f"Creation Block {self.owner_name} {date_str} {self.amount} hash={hash_hex}"
-        )
+        amount = format_amount(self.amount)
+        return f"Creation Block {self.owner_name} {date_str} {amount} hash={hash_hex}"
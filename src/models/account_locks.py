@@ -0,0 +1,35 @@
+"""Striped locks for the accounts of the blockchain.
+
+The transactions of a client only depend on the client's own balance and
+blocks, so they only need to be serialized with the other transactions of the
+same client. Each account is mapped to one of a fixed number of locks
+(stripes), so the memory used doesn't grow with the number of accounts, and
+clients that map to different stripes validate their transactions in
+parallel.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import threading
+
+STRIPES = 256  # Locks shared by all the accounts
+
+
+class AccountLocks:
+    """Fixed set of locks, each one shared by many accounts.
+
+    Attributes:
+        stripes (int): Number of locks.
+    """
+
+    def __init__(self, stripes: int = STRIPES):
+        self.stripes = stripes
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def lock_for(self, client_name: str) -> threading.Lock:
+        """Gets the lock of a client's account.
+
+        Always the same lock for the same client, in a process.
+        """
+        return self._locks[hash(client_name) % self.stripes]
@@ -0,0 +1,105 @@
+"""Registry of the accounts known by the server.
+
+An account is registered the first time a client sends its name (or a tagged
+request for it), and is kept with its registration time, the number of
+connections currently using it and free-form metadata. Lookups are hashed,
+so checking if an account exists costs the same with millions of accounts.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import datetime
+import threading
+from typing import Dict, Iterator, Optional
+
+
+class AccountInfo:
+    """An account in the registry.
+
+    Attributes:
+        name (str): Identification of the account's client.
+        registered_at (datetime.datetime): When it was registered, in UTC.
+        connections (int): Connections currently using the account.
+        metadata (Dict[str, str]): Free-form information about the account.
+    """
+
+    __slots__ = ("name", "registered_at", "connections", "metadata")
+
+    def __init__(self, name: str, registered_at: datetime.datetime):
+        self.name = name
+        self.registered_at = registered_at
+        self.connections = 0
+        self.metadata: Dict[str, str] = {}
+
+
+class AccountRegistry:
+    """Thread safe set of the registered accounts.
+
+    Registration takes a lock, membership checks and lookups don't: a dict
+    lookup is atomic, and accounts are never removed.
+
+    Attributes:
+        None
+    """
+
+    def __init__(self):
+        self._accounts: Dict[str, AccountInfo] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._accounts
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._accounts))
+
+    def get(self, name: str) -> Optional[AccountInfo]:
+        """Gets a registered account, None if it's not registered."""
+        return self._accounts.get(name)
+
+    def register(
+        self, name: str, metadata: Optional[Dict[str, str]] = None
+    ) -> AccountInfo:
+        """Registers an account, if it's not registered yet.
+
+        Args:
+            name (str): Identification of the account's client.
+            metadata (Optional[Dict[str, str]]): Added to the account's
+            metadata, replacing the values of the same keys.
+
+        Returns:
+            AccountInfo: The account, new or already registered.
+        """
+        with self._lock:
+            account = self._get_or_create(name)
+            if metadata:
+                account.metadata.update(metadata)
+            return account
+
+    def connect(self, name: str) -> AccountInfo:
+        """Registers an account, if needed, used by one more connection."""
+        with self._lock:
+            account = self._get_or_create(name)
+            account.connections += 1
+            return account
+
+    def disconnect(self, name: str):
+        """Releases an account from a connection that used it.
+
+        The account stays registered.
+        """
+        with self._lock:
+            account = self._accounts.get(name)
+            if account is not None and account.connections > 0:
+                account.connections -= 1
+
+    def _get_or_create(self, name: str) -> AccountInfo:
+        """Gets an account, registering it if needed. Needs the lock."""
+        account = self._accounts.get(name)
+        if account is None:
+            account = AccountInfo(name, datetime.datetime.now(datetime.timezone.utc))
+            self._accounts[name] = account
+        return account
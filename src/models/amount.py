@@ -0,0 +1,66 @@
+"""Fixed-point amounts of minicoins.
+
+Amounts are integers of micro-minicoins (UNITS_PER_MINICOIN of them make a
+minicoin), so balances are summed exactly however many blocks the chain has,
+and fit the int64 fields of the binary encodings. Minicoins are only used at
+the edges: parsing what a client typed and formatting what it's shown.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+from decimal import Decimal, InvalidOperation
+
+DECIMALS = 6
+UNITS_PER_MINICOIN = 10**DECIMALS
+MAX_UNITS = 2**63 - 1  # Largest amount of the int64 fields
+
+
+def parse_amount(text: str) -> int:
+    """Parses an amount of minicoins, e.g. "2.5", into micro-minicoins.
+
+    Raises:
+        ValueError: If text is not a finite number, has more than DECIMALS
+        decimal places or doesn't fit an int64.
+    """
+    try:
+        minicoins = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {text!r}") from None
+
+    if not minicoins.is_finite():
+        raise ValueError(f"Invalid amount: {text!r}")
+
+    units = minicoins.scaleb(DECIMALS)
+    if units != units.to_integral_value():
+        raise ValueError(f"Amounts have at most {DECIMALS} decimal places")
+    if abs(units) > MAX_UNITS:
+        raise ValueError("Amount too large")
+
+    return int(units)
+
+
+def format_amount(units: int) -> str:
+    """Formats micro-minicoins as minicoins, e.g. 2500000 as "2.5"."""
+    (minicoins, fraction) = divmod(abs(units), UNITS_PER_MINICOIN)
+    decimals = f"{fraction:0{DECIMALS}d}".rstrip("0") or "0"
+    sign = "-" if units < 0 else ""
+    return f"{sign}{minicoins}.{decimals}"
+
+
+def units_from_float(minicoins: float) -> int:
+    """Converts a float amount of the legacy encodings to micro-minicoins.
+
+    Raises:
+        ValueError: If the amount has more than DECIMALS decimal places, so it
+        can't be converted exactly.
+    """
+    units = round(minicoins * UNITS_PER_MINICOIN)
+    if units / UNITS_PER_MINICOIN != minicoins:
+        raise ValueError(f"Amount {minicoins!r} has more than {DECIMALS} decimals")
+    return units
+
+
+def units_to_float(units: int) -> float:
+    """Converts micro-minicoins to the float amount of the legacy encodings."""
+    return units / UNITS_PER_MINICOIN
@@ -0,0 +1,262 @@
+"""asyncio engine for the blockchain server.
+
+Alternative to running one thread per client: all the connections are served
+by a single event loop with asyncio streams, so idle clients cost only a
+socket and a small buffer. Messages are processed by the same logic as the
+threaded engine (Server.handle_message), and shutdown is event driven, without
+polling timeouts. Like the threaded engine, the replies to the messages
+received together are written together, with a single send.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import List, Set
+
+from models.server import Server, ClientSession
+from models.network_node import FrameTooLargeError, GOODBYE_MESSAGE, append_message
+from models.multiplexer import Multiplexer
+from models.wire_protocol import WireProtocol, HELLO, LENGTH, MAGIC
+from models import metrics
+
+READ_SIZE = 64 * 1024  # Bytes read from a connection at a time
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncServer:
+    """Serves the clients of a Server with asyncio.
+
+    The event loop runs on a single thread, so the lock passed to the server
+    is never contended. It's kept so the same transaction path is used.
+
+    Attributes:
+        server (Server): The server with the blockchain. Its socket must be
+        bound and listening.
+    """
+
+    def __init__(self, server: Server):
+        self.server = server
+
+        self._lock = threading.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def serve(self, shutdown_event: asyncio.Event):
+        """Accepts and answers clients until shutdown_event is set.
+
+        Then stops accepting, closes every client connection and returns.
+
+        Args:
+            shutdown_event (asyncio.Event): Event to signal shutdown.
+        """
+        self.server.socket.setblocking(False)
+        async_server = await asyncio.start_server(
+            self._on_connection, sock=self.server.socket
+        )
+
+        async with async_server:
+            await shutdown_event.wait()
+
+            async_server.close()
+
+            logger.info("Closing %d client connections...", len(self._tasks))
+            for task in list(self._tasks):
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _on_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """Registers the task of a new connection, so it can be cancelled."""
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        try:
+            await self.answer_client(reader, writer)
+        finally:
+            self._tasks.discard(task)
+
+    async def answer_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """Handles the communication with a client.
+
+        Args:
+            reader (asyncio.StreamReader): Stream with the client's messages.
+            writer (asyncio.StreamWriter): Stream to reply to the client.
+        """
+        logger.info("Accepted connection from %s", writer.get_extra_info("peername"))
+
+        session = ClientSession()
+        # Tagged requests are answered in order, by the event loop
+        mux = Multiplexer(self.server, self._lock)
+        metrics.ACTIVE_CONNECTIONS.inc()
+        is_binary = False
+        try:
+            # A NUL byte starts the handshake of the binary protocol
+            first = await reader.read(1)
+            if first == MAGIC[:1]:
+                is_binary = True
+                await self.answer_requests(reader, writer, session, first)
+                return
+
+            metrics.BYTES_RECEIVED.inc(len(first))
+            pending = bytearray(first)  # Received, not answered yet
+            while session.is_open:
+                messages = self._split_messages(pending)
+                if len(pending) > self.server.max_frame_size:
+                    raise FrameTooLargeError(
+                        f"Message longer than {self.server.max_frame_size} bytes"
+                    )
+
+                if len(messages) == 0:
+                    data = await reader.read(READ_SIZE)
+                    if not data:
+                        break  # Connection was closed
+                    metrics.BYTES_RECEIVED.inc(len(data))
+                    pending += data
+                    continue
+
+                received_at = time.perf_counter()
+                await self._answer_messages(writer, session, mux, messages)
+
+                elapsed = time.perf_counter() - received_at
+                for _ in range(len(messages)):
+                    metrics.REQUEST_LATENCY.observe(elapsed)
+
+        except FrameTooLargeError as e:
+            logger.warning("Sending to %s: %s", session.client_name, e)
+            writer.write(str(e).encode("utf-8") + b"\n")
+
+        except OSError:
+            pass  # Connection error
+
+        finally:
+            mux.close()
+            self.server.close_session(session)
+            metrics.ACTIVE_CONNECTIONS.dec()
+            logger.info("Closing connection with client %s", session.client_name)
+            try:
+                if not is_binary:
+                    writer.write(GOODBYE_MESSAGE.encode("utf-8") + b"\n")
+                writer.close()
+            except OSError:
+                pass  # Client already closed the connection
+
+    def _split_messages(self, pending: bytearray) -> List[str]:
+        """Removes the complete messages from pending and decodes them.
+
+        Each message is decoded straight from pending, without copying it.
+
+        Raises:
+            FrameTooLargeError: If a message is longer than max_frame_size.
+        """
+        messages = []
+        start = 0
+        with memoryview(pending) as view:
+            while True:
+                delimiter = pending.find(b"\n", start)
+                if delimiter == -1:
+                    break
+                if delimiter - start > self.server.max_frame_size:
+                    raise FrameTooLargeError(
+                        f"Message longer than {self.server.max_frame_size} bytes"
+                    )
+
+                messages.append(str(view[start:delimiter], "utf-8", "replace"))
+                start = delimiter + 1
+
+        del pending[:start]
+        return messages
+
+    async def _answer_messages(
+        self,
+        writer: asyncio.StreamWriter,
+        session: ClientSession,
+        mux: Multiplexer,
+        messages: List[str],
+    ):
+        """Answers messages received together, writing the replies together."""
+        buffers = []
+        for message in messages:
+            if not session.is_open:
+                break  # Ignore messages after quitting
+
+            if message.strip() == "":
+                continue  # Ignore empty messages
+
+            if Multiplexer.is_tagged(message):
+                reply = mux.handle(message)
+            else:
+                reply = self.server.handle_message(session, message, self._lock)
+            if reply is not None:
+                metrics.BYTES_SENT.inc(append_message(buffers, reply))
+
+        if len(buffers) > 0:
+            writer.writelines(buffers)
+            await writer.drain()
+
+    async def answer_requests(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        session: ClientSession,
+        first: bytes,
+    ):
+        """Handles a client of the binary protocol, from its handshake.
+
+        Args:
+            reader (asyncio.StreamReader): Stream with the client's requests.
+            writer (asyncio.StreamWriter): Stream to respond to the client.
+            session (ClientSession): State of the client's connection.
+            first (bytes): First byte of the handshake, already read.
+        """
+        try:
+            hello = first + await reader.readexactly(len(HELLO) - len(first))
+            (is_accepted, answer) = WireProtocol.answer_hello(hello)
+            writer.write(answer)
+            if not is_accepted:
+                return
+
+            pending = bytearray()  # Received, not answered yet
+            while session.is_open:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    break  # Connection was closed
+                metrics.BYTES_RECEIVED.inc(len(data))
+                pending += data
+
+                received_at = time.perf_counter()
+                responses = []
+                offset = 0
+                while session.is_open and len(pending) - offset >= LENGTH.size:
+                    (length,) = LENGTH.unpack_from(pending, offset)
+                    if length > self.server.max_frame_size:
+                        logger.warning("Closing binary connection: frame too long")
+                        return
+
+                    end = offset + LENGTH.size + length
+                    if end > len(pending):
+                        break  # Frame continues in the next read
+                    frame = bytes(pending[offset + LENGTH.size : end])
+                    offset = end
+
+                    response = self.server.handle_request(session, frame, self._lock)
+                    if response is not None:
+                        responses.append(response)
+                del pending[:offset]
+
+                if len(responses) > 0:
+                    writer.writelines(responses)
+                    await writer.drain()
+                    metrics.BYTES_SENT.inc(sum(len(r) for r in responses))
+
+                elapsed = time.perf_counter() - received_at
+                for _ in responses:
+                    metrics.REQUEST_LATENCY.observe(elapsed)
+
+        except asyncio.IncompleteReadError:
+            pass  # Connection was closed
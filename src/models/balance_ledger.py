@@ -0,0 +1,92 @@
+"""Balance ledger for the clients of the blockchain.
+
+Keeps the current balance of every client that owns a block in the chain,
+updated incrementally as blocks are appended to or popped from the chain, so
+the balance of a client can be read without walking the whole blockchain.
+Can be rebuilt from the chain when the server starts.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+from typing import Dict, Iterable
+
+from models.block import Block
+from models.operation import Operation
+
+
+class BalanceLedger:
+    """Materialized balance of each client of the blockchain.
+
+    Must be kept consistent with the chain: apply every appended block and
+    revert every popped block, in the same order.
+
+    Attributes:
+        balances (Dict[str, int]): Current balance of each client, in
+        micro-minicoins, indexed by the client's name.
+    """
+
+    def __init__(self):
+        self.balances: Dict[str, int] = {}
+
+    def balance(self, client_name: str) -> int:
+        """Gets the current balance of a client.
+
+        Args:
+            client_name (str): The identification of the client.
+
+        Returns:
+            int: The balance of the client, 0 if they have no blocks.
+        """
+        return self.balances.get(client_name, 0)
+
+    def apply(self, block: Block):
+        """Updates the balances of the owners of a new block's transactions.
+
+        Args:
+            block (Block): The block that was appended to the chain.
+        """
+        for entry in block.entries():
+            self.balances[entry.owner_name] = self.balance(
+                entry.owner_name
+            ) + self._signed_amount(entry)
+
+    def revert(self, block: Block):
+        """Undoes the effect of a block popped from the chain.
+
+        Args:
+            block (Block): The block that was popped from the chain.
+        """
+        for entry in reversed(block.entries()):
+            self.balances[entry.owner_name] = self.balance(
+                entry.owner_name
+            ) - self._signed_amount(entry)
+
+    def rebuild(self, block_chain: Iterable[Block]):
+        """Recomputes all the balances from the blocks of a chain.
+
+        Args:
+            block_chain (Iterable[Block]): The blocks, from genesis.
+        """
+        self.balances = {}
+        for block in block_chain:
+            self.apply(block)
+
+    def restore(self, balances: Dict[str, int], blocks: Iterable[Block]):
+        """Restores the balances from a checkpoint and the blocks after it.
+
+        Args:
+            balances (Dict[str, int]): The balances at the checkpoint.
+            blocks (Iterable[Block]): The blocks appended after the
+            checkpoint, in order.
+        """
+        self.balances = dict(balances)
+        for block in blocks:
+            self.apply(block)
+
+    @staticmethod
+    def _signed_amount(block: Block) -> int:
+        """Amount of the block, negative if it's a withdraw."""
+        if block.operation == Operation.WITHDRAW:
+            return -block.amount
+        return block.amount
@@ -0,0 +1,124 @@
+"""BatchBlock class for batches of transactions under a Merkle root.
+
+A block that stores many transactions (each one as a Block or
+AccCreationBlock) instead of a single one. Only the Merkle root of the
+transactions goes into the block's hash, so the chain grows by one block per
+batch, and a transaction can be proven to be in the chain with an O(log n)
+inclusion proof instead of rehashing the chain.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import json
+import struct
+from typing import List, Tuple
+
+from models.block import Block, BlockEncoding, ENCODING_VERSION
+from models.merkle import MerkleTree, ProofStep
+
+# version, kind, number of transactions, Merkle root
+BATCH_HEAD = struct.Struct("<BBI32s")
+
+
+class BatchBlock(Block):
+    """Block with a batch of transactions.
+
+    The owner, amount and operation of the block itself are not meaningful,
+    the transactions are read with entries().
+
+    Attributes:
+        transactions (List[Block]): The transactions of the batch, in order.
+        Their hashes are not used.
+        merkle_root (bytes): Merkle root of the transactions.
+        version (int): Version of the binary encoding of the batch and of its
+        transactions, their leaves are hashes of it.
+    """
+
+    KIND = 2
+
+    __slots__ = ("transactions", "merkle_root", "version", "_leaves")
+
+    def __init__(self, transactions: List[Block], version: int = ENCODING_VERSION):
+        if len(transactions) == 0:
+            raise ValueError("A batch must have at least one transaction")
+
+        self.owner_name = ""
+        self.amount = sum(transaction.amount for transaction in transactions)
+        self.operation = None
+        self.hash_b: bytes = None
+
+        self.transactions = transactions
+        self.version = version
+        self._leaves = [
+            MerkleTree.leaf_hash(t.to_bytes(version)) for t in transactions
+        ]
+        self.merkle_root = MerkleTree.root(self._leaves)
+
+    def entries(self) -> Tuple[Block, ...]:
+        return tuple(self.transactions)
+
+    def has_valid_root(self) -> bool:
+        """Checks if merkle_root matches the transactions."""
+        leaves = [
+            MerkleTree.leaf_hash(t.to_bytes(self.version))
+            for t in self.transactions
+        ]
+        return MerkleTree.root(leaves) == self.merkle_root
+
+    def inclusion_proof(self, index: int) -> Tuple[bytes, List[ProofStep]]:
+        """Computes the inclusion proof of a transaction of the batch.
+
+        Args:
+            index (int): Index of the transaction in the batch.
+
+        Returns:
+            The leaf hash of the transaction and its proof (verify it with
+            MerkleTree.verify against merkle_root): (bytes, List[ProofStep])
+        """
+        return (self._leaves[index], MerkleTree.proof(self._leaves, index))
+
+    def serialize(self, encoding: BlockEncoding = BlockEncoding.BINARY) -> bytes:
+        """Encodes the header of the batch for hashing.
+
+        The transactions are committed to by the Merkle root, so hashing the
+        block does not depend on the size of the batch.
+        """
+        if encoding == BlockEncoding.JSON:
+            json_s = json.dumps(self.to_dict(), sort_keys=True)
+            return json_s.encode("utf-8")
+
+        return self._head()
+
+    def to_bytes(self, version: int = ENCODING_VERSION) -> bytes:
+        """Encodes the batch with the binary encoding.
+
+        The header (BATCH_HEAD) is followed by the binary encoding of each
+        transaction. Always in the batch's own version, whatever version is
+        asked for: the Merkle root was computed from it.
+        """
+        return self._head() + b"".join(
+            t.to_bytes(self.version) for t in self.transactions
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "merkle_root": self.merkle_root.hex(),
+            "transactions": len(self.transactions),
+        }
+
+    def _head(self) -> bytes:
+        return BATCH_HEAD.pack(
+            self.version, self.KIND, len(self.transactions), self.merkle_root
+        )
+
+    def __repr__(self):
+        if self.hash_b is None:
+            hash_hex = "None"
+        else:
+            hash_hex = self.hash_b.hex()[:3]
+
+        return (
+            f"Batch Block {len(self.transactions)} transactions "
+            f"root={self.merkle_root.hex()[:3]} hash={hash_hex}"
+        )
@@ -0,0 +1,189 @@
+"""Client of the binary wire protocol.
+
+Connects with the handshake of models.wire_protocol and exchanges
+length-prefixed frames instead of text lines: requests are packed from their
+fields and responses come back with a numeric status, so neither side parses
+or formats text. Amounts are integers of micro-minicoins (see models.amount).
+Requests can be sent without waiting for their responses (pipelined), and are
+matched to them by request id.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import itertools
+from collections import deque
+from typing import List, Optional, Tuple
+
+from models.network_node import NetworkNode
+from models.operation import Operation
+from models.wire_protocol import (
+    WireProtocol,
+    LengthPrefixedReader,
+    Status,
+    HELLO,
+    BALANCE_PAYLOAD,
+    TIP_PAYLOAD,
+    LATEST,
+)
+
+
+class BinaryClient(NetworkNode):
+    """Connection speaking the binary protocol, for any number of accounts.
+
+    Not thread safe: use one per thread.
+
+    Attributes:
+        None
+    """
+
+    def __init__(self, server_ip: str, server_port: int):
+        super().__init__()
+
+        self.socket.connect((server_ip, server_port))
+        self.socket.sendall(HELLO)
+
+        answer = b""
+        while len(answer) < len(HELLO):
+            received = self.socket.recv(len(HELLO) - len(answer))
+            if received == b"":
+                break
+            answer += received
+        if answer != HELLO:
+            self.terminate()
+            raise ConnectionError("Binary protocol not accepted by the server")
+
+        self._request_ids = itertools.count(1)
+        self._reader = LengthPrefixedReader(
+            self.socket, self.buffer_size, self.max_frame_size
+        )
+        self._responses = deque()  # Received, not returned yet
+
+    def send(
+        self,
+        operation: Operation,
+        client_name: str,
+        amount: int = 0,
+        argument: int = 0,
+    ) -> int:
+        """Sends a request without waiting for its response.
+
+        Returns:
+            int: The request id, that the response will carry.
+        """
+        request_id = next(self._request_ids)
+        self.socket.sendall(
+            WireProtocol.encode_request(
+                operation, request_id, client_name, amount, argument
+            )
+        )
+        return request_id
+
+    def send_many(
+        self, requests: List[Tuple[Operation, str, int, int]]
+    ) -> List[int]:
+        """Sends many requests, with a single sendall.
+
+        Args:
+            requests (List[Tuple[Operation, str, int, int]]): The
+            operation, account's name, amount and argument of each request.
+
+        Returns:
+            List[int]: Their request ids, in order.
+        """
+        request_ids = []
+        frames = []
+        for operation, client_name, amount, argument in requests:
+            request_id = next(self._request_ids)
+            request_ids.append(request_id)
+            frames.append(
+                WireProtocol.encode_request(
+                    operation, request_id, client_name, amount, argument
+                )
+            )
+        self.socket.sendall(b"".join(frames))
+        return request_ids
+
+    def receive(self) -> Tuple[int, Status, bytes]:
+        """Waits for the next response.
+
+        Returns:
+            The request id, status and payload: (int, Status, bytes)
+
+        Raises:
+            ConnectionError: If the server closed the connection.
+        """
+        while len(self._responses) == 0:
+            frames = self._reader.recv_frames()
+            if frames is None:
+                raise ConnectionError("Connection closed by the server")
+            self._responses.extend(frames)
+
+        return WireProtocol.decode_response(self._responses.popleft())
+
+    def request(
+        self,
+        operation: Operation,
+        client_name: str,
+        amount: int = 0,
+        argument: int = 0,
+    ) -> Tuple[Status, bytes]:
+        """Sends a request and waits for its response.
+
+        Only valid while there are no other requests in flight.
+
+        Returns:
+            The status and payload: (Status, bytes)
+        """
+        request_id = self.send(operation, client_name, amount, argument)
+        (response_id, status, payload) = self.receive()
+        if response_id != request_id:
+            raise ConnectionError(f"Response to request {response_id} unexpected")
+        return (status, payload)
+
+    def deposit(self, client_name: str, amount: int) -> Status:
+        return self.request(Operation.DEPOSIT, client_name, amount)[0]
+
+    def withdraw(self, client_name: str, amount: int) -> Status:
+        return self.request(Operation.WITHDRAW, client_name, amount)[0]
+
+    def balance(self, client_name: str) -> int:
+        (_, payload) = self.request(Operation.BALANCE, client_name)
+        return BALANCE_PAYLOAD.unpack(payload)[0]
+
+    def tip(self, client_name: str) -> Tuple[int, Optional[bytes]]:
+        """Gets the height and hash of the tip, None if the chain is empty."""
+        (_, payload) = self.request(Operation.TIP, client_name)
+        (height, tip_hash) = TIP_PAYLOAD.unpack(payload)
+        return (height, tip_hash if height > 0 else None)
+
+    def history(
+        self, client_name: str, page: int = 1
+    ) -> Optional[Tuple[int, List[Tuple[int, Operation, int]]]]:
+        """Gets a page of the client's transactions, newest first.
+
+        Returns:
+            The number of pages and the height, operation and amount of each
+            transaction: (int, List[(int, Operation, int)]). None if there's
+            no such page.
+        """
+        (status, payload) = self.request(
+            Operation.HISTORY, client_name, argument=page
+        )
+        if status != Status.OK:
+            return None
+        (_, pages, items) = WireProtocol.decode_history(payload)
+        return (pages, items)
+
+    def proof(self, client_name: str, n: int = LATEST) -> Tuple[Status, str]:
+        """Gets the inclusion proof of the client's n-th transaction."""
+        (status, payload) = self.request(Operation.PROOF, client_name, argument=n)
+        return (status, payload.decode("utf-8"))
+
+    def quit(self):
+        """Closes the connection."""
+        try:
+            self.socket.sendall(WireProtocol.encode_request(Operation.QUIT, 0, ""))
+        except OSError:
+            pass  # Already closed by the server
+        self.terminate()
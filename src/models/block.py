@@ -2,16 +2,47 @@
 
 Each block stores transaction information (owner, amount, operation type) and
 a cryptographic hash linking it to the previous block. Provides serialization
-methods for computing hashes and maintaining blockchain integrity.
+methods for computing hashes and maintaining blockchain integrity: a compact
+binary encoding, and the JSON and float binary encodings kept as legacy modes
+so chains hashed with them still verify.
 
 Authors: Andre Grassi de Jesus, Ricardo Faria
-Last Modified: Nov. 14 2025
+Last Modified: Oct. 18 2026
 """
 
 import json
-from typing import Optional
+import struct
+import sys
+from enum import Enum
+from typing import Optional, Tuple
 
 from models.operation import Operation
+from models.amount import units_to_float, format_amount
+
+ENCODING_VERSION = 2
+
+# version, kind, operation, amount (micro-minicoins), creation date (µs since
+# epoch), name length
+BLOCK_HEAD = struct.Struct("<BBBqqH")
+# Version 1, with the amount in minicoins as a float64
+BLOCK_HEAD_V1 = struct.Struct("<BBBdqH")
+
+
+class BlockEncoding(Enum):
+    """Encodings of a block, used for hashing and storage."""
+
+    JSON = 0  # Legacy, sorted JSON object in UTF-8
+    BINARY_FLOAT = 1  # Legacy, binary encoding version 1 (float amounts)
+    BINARY = 2  # Fixed layout with struct, followed by the owner's name
+
+
+def record_version(encoding: BlockEncoding) -> int:
+    """Version of the binary encoding of the blocks of a chain.
+
+    Chains hashed with BINARY_FLOAT keep storing version 1, the bytes their
+    hashes were computed from. The others store the current version.
+    """
+    return 1 if encoding == BlockEncoding.BINARY_FLOAT else ENCODING_VERSION
 
 
 class Block:
@@ -20,16 +51,22 @@ class Block:
     Attributes:
         owner_name (str): The name of the client that did the operation
         registered.
-        amount (float): The amount of minicoins involved in the operation.
+        amount (int): The amount of micro-minicoins involved in the operation
+        (see models.amount).
         operation (Operation): The action that the client did.
         hash_b (bytes): The hash of the block. It's initialized as None and
         must be computed and set by the server with Hash class.
     """
 
+    KIND = 0  # Identifies the block's class in the binary encoding
+
+    # No __dict__ per block, the chain may hold millions of them
+    __slots__ = ("owner_name", "amount", "operation", "hash_b")
+
     def __init__(
         self,
         owner_name: str,
-        amount: float,
+        amount: int,
         operation: Operation,
     ):
         if amount <= 0:
@@ -38,28 +75,84 @@ class Block:
         if owner_name is None:
             raise ValueError("owner_name can't be None")
 
-        self.owner_name = owner_name
+        # Owners have many blocks, share a single copy of their name
+        self.owner_name = sys.intern(owner_name)
         self.amount = amount
         self.operation = operation
         self.hash_b: bytes = None
 
-    def serialize(self) -> bytes:
-        """Transforms the Block in a JSON object for hashing."""
-        json_s = json.dumps(self.to_dict(), sort_keys=True)
-        return json_s.encode("utf-8")
+    def serialize(self, encoding: BlockEncoding = BlockEncoding.BINARY) -> bytes:
+        """Encodes the Block for hashing.
+
+        Args:
+            encoding (BlockEncoding): BINARY, or JSON and BINARY_FLOAT for
+            chains hashed with the legacy encodings.
+        """
+        if encoding == BlockEncoding.JSON:
+            json_s = json.dumps(self.to_dict(), sort_keys=True)
+            return json_s.encode("utf-8")
+
+        return self.to_bytes(record_version(encoding))
+
+    def to_bytes(self, version: int = ENCODING_VERSION) -> bytes:
+        """Encodes the Block with the binary encoding.
+
+        The fixed fields (BLOCK_HEAD) are followed by the owner's name in
+        UTF-8, its length is the last fixed field. Does not include the hash.
+
+        Args:
+            version (int): ENCODING_VERSION, or 1 for the legacy encoding
+            with float amounts (BLOCK_HEAD_V1).
+        """
+        if version == 1:
+            (head, amount) = (BLOCK_HEAD_V1, units_to_float(self.amount))
+        else:
+            (head, amount) = (BLOCK_HEAD, self.amount)
+
+        name_b = self.owner_name.encode("utf-8")
+        return (
+            head.pack(
+                version,
+                self.KIND,
+                self.operation.code,
+                amount,
+                self._date_us(),
+                len(name_b),
+            )
+            + name_b
+        )
 
     def to_dict(self) -> dict:
-        """Transforms the Block into a dictionary for serialization."""
+        """Transforms the Block into a dictionary for serialization.
+
+        The amount is in minicoins, as a float, like the chains hashed with
+        the JSON encoding always had.
+        """
         return {
             "owner_name": self.owner_name,
-            "amount": self.amount,
+            "amount": units_to_float(self.amount),
             "operation": self.operation.value,
         }
 
+    def entries(self) -> Tuple["Block", ...]:
+        """Gets the transactions stored in the block.
+
+        An ordinary block stores a single transaction, itself. Batched blocks
+        store many, each one as a Block.
+        """
+        return (self,)
+
+    def _date_us(self) -> int:
+        """Date stored in the binary encoding, blocks without one use 0."""
+        return 0
+
     def __repr__(self):
         if self.hash_b is None:
             hash_hex = "None"
         else:
             hash_hex = self.hash_b.hex()[:3]
 
-        return f"Block {self.owner_name} {self.operation.value} {self.amount} hash={hash_hex}"
+        amount = format_amount(self.amount)
+        return (
+            f"Block {self.owner_name} {self.operation.value} {amount} hash={hash_hex}"
+        )
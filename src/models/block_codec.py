@@ -0,0 +1,94 @@
+"""Decoder of the binary encoding of blocks.
+
+Rebuilds Block, AccCreationBlock and BatchBlock objects from the bytes produced
+by their to_bytes. Lives apart from the block classes because it has to know all
+of them.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import datetime
+import struct
+from typing import Tuple
+
+from models.block import Block, BLOCK_HEAD, BLOCK_HEAD_V1, ENCODING_VERSION
+from models.acc_creation_block import AccCreationBlock, EPOCH
+from models.amount import units_from_float
+from models.batch_block import BatchBlock, BATCH_HEAD
+from models.operation import Operation
+
+_PREFIX = struct.Struct("<BB")  # version, kind: common to all the encodings
+
+
+def decode_block(buffer: bytes, offset: int = 0) -> Tuple[Block, int]:
+    """Decodes a block encoded with Block.to_bytes.
+
+    Both the current encoding version and version 1 are decoded, the float
+    amounts of version 1 are converted to micro-minicoins.
+
+    Args:
+        buffer (bytes): Bytes-like object with the encoded block.
+        offset (int): Where the encoded block starts in buffer.
+
+    Returns:
+        The decoded block, without hash, and the offset right after it:
+        (Block, int)
+
+    Raises:
+        ValueError: If the encoding version or the kind of block is unknown,
+        or the encoded block is corrupted.
+    """
+    try:
+        return _decode_block(buffer, offset)
+    except (struct.error, OverflowError) as e:
+        # Truncated fields, or a date out of range
+        raise ValueError(f"Corrupted block encoding: {e}") from None
+
+
+def _decode_block(buffer: bytes, offset: int) -> Tuple[Block, int]:
+    """Decodes a block, see decode_block."""
+    (version, kind) = _PREFIX.unpack_from(buffer, offset)
+    if version == ENCODING_VERSION:
+        head = BLOCK_HEAD
+    elif version == 1:
+        head = BLOCK_HEAD_V1
+    else:
+        raise ValueError(f"Unsupported block encoding version: {version}")
+
+    if kind == BatchBlock.KIND:
+        return _decode_batch(buffer, offset)
+
+    (_, _, op_code, amount, date_us, name_len) = head.unpack_from(buffer, offset)
+    if version == 1:
+        amount = units_from_float(amount)
+
+    name_start = offset + head.size
+    name_end = name_start + name_len
+    owner_name = bytes(buffer[name_start:name_end]).decode("utf-8")
+
+    if kind == AccCreationBlock.KIND:
+        date = EPOCH + datetime.timedelta(microseconds=date_us)
+        block = AccCreationBlock(owner_name, amount, date)
+    elif kind == Block.KIND:
+        block = Block(owner_name, amount, Operation.from_code(op_code))
+    else:
+        raise ValueError(f"Unknown kind of block: {kind}")
+
+    return (block, name_end)
+
+
+def _decode_batch(buffer: bytes, offset: int) -> Tuple[BatchBlock, int]:
+    """Decodes a BatchBlock, keeping the stored Merkle root."""
+    (version, _, count, merkle_root) = BATCH_HEAD.unpack_from(buffer, offset)
+
+    transactions = []
+    offset += BATCH_HEAD.size
+    for _ in range(count):
+        (transaction, offset) = decode_block(buffer, offset)
+        transactions.append(transaction)
+
+    block = BatchBlock(transactions, version)
+    # Audits compare it with the root of the decoded transactions
+    block.merkle_root = merkle_root
+    return (block, offset)
@@ -0,0 +1,385 @@
+"""Bulk import and export of blockchains.
+
+Exports the blocks of a chain log (ChainStore) to a stream, either NDJSON (a
+header line, then one JSON object per block) or the binary format of the
+chain log itself, and imports such a stream into a new chain log.
+
+Both directions stream the blocks: only the block being converted is kept
+in memory, so the size of the file doesn't matter. The import checks every
+hash against the previous one as it goes and rebuilds the balances in the
+same pass, then saves them as a checkpoint of the tip, so a server started
+on the imported log doesn't need to replay it.
+
+Chains hashed with a legacy encoding (JSON, or BINARY_FLOAT with float
+amounts) are migrated to the current one by rehashing them into a new log,
+once every hash of the old chain is checked.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import datetime
+import json
+import os
+from typing import Iterable, Iterator, Optional, TextIO, Tuple
+
+from models.block import Block, BlockEncoding
+from models.acc_creation_block import AccCreationBlock
+from models.amount import units_from_float
+from models.batch_block import BatchBlock
+from models.operation import Operation
+from models.hash import Hash
+from models.balance_ledger import BalanceLedger
+from models.chain_store import ChainStore
+from models.checkpoint import Checkpoint, CheckpointStore, SUFFIX
+
+FORMATS = ("ndjson", "binary")
+NDJSON_FORMAT = "mini_blockchain"  # Marks the header line of the NDJSON files
+NDJSON_VERSION = 2  # Version 1 had float amounts, in minicoins
+IMPORT_SYNC_EVERY = 1 << 16  # Records written between fsyncs while importing
+
+# Encodings named in the headers of version 1 NDJSON files
+_V1_ENCODINGS = {
+    "JSON": BlockEncoding.JSON,
+    "BINARY": BlockEncoding.BINARY_FLOAT,
+}
+
+
+class ChainIO:
+    """Streams blocks between chain logs and export files.
+
+    Attributes:
+        None
+    """
+
+    @staticmethod
+    def export_chain(chain_file: str, out_path: str, fmt: str = "ndjson") -> int:
+        """Exports the blocks of a chain log.
+
+        Args:
+            chain_file (str): The chain log, it's only read.
+            out_path (str): The file to create.
+            fmt (str): "ndjson" or "binary".
+
+        Returns:
+            int: Number of exported blocks.
+
+        Raises:
+            ValueError: If the chain log is invalid or fmt is unknown.
+        """
+        source = ChainIO._open_log(chain_file)
+        blocks = source.load(repair=False)
+
+        if fmt == "binary":
+            (count, _) = ChainIO._write_log(out_path, blocks, source.encoding)
+            return count
+        if fmt != "ndjson":
+            raise ValueError(f"Unknown format: {fmt}")
+
+        with open(out_path, "w", encoding="utf-8") as out:
+            return ChainIO.write_ndjson(out, blocks, source.encoding)
+
+    @staticmethod
+    def import_chain(
+        in_path: str, chain_file: str, fmt: str = "ndjson"
+    ) -> Tuple[int, int]:
+        """Imports an exported chain into a new chain log.
+
+        Every hash is checked and the balances are rebuilt in a single pass.
+        The log is written to a temporary file and only renamed to chain_file
+        if the whole chain is valid. The balances of the tip are saved as its
+        checkpoint.
+
+        Args:
+            in_path (str): The exported chain.
+            chain_file (str): The chain log to create, must not exist.
+            fmt (str): "ndjson" or "binary".
+
+        Returns:
+            The number of imported blocks and of accounts: (int, int)
+
+        Raises:
+            ValueError: If a block has an invalid hash, the input is not an
+            exported chain, fmt is unknown or chain_file already exists.
+        """
+        if os.path.exists(chain_file):
+            raise ValueError(f"{chain_file} already exists")
+
+        if fmt == "binary":
+            source = ChainIO._open_log(in_path)
+            return ChainIO._import_blocks(
+                source.load(repair=False), chain_file, source.encoding
+            )
+        if fmt == "ndjson":
+            with open(in_path, "r", encoding="utf-8") as source:
+                (encoding, blocks) = ChainIO.read_ndjson(source)
+                return ChainIO._import_blocks(blocks, chain_file, encoding)
+
+        raise ValueError(f"Unknown format: {fmt}")
+
+    @staticmethod
+    def migrate_chain(chain_file: str, out_file: str) -> Tuple[int, int]:
+        """Rewrites a chain hashed with a legacy encoding with BINARY.
+
+        Every hash of the old chain is checked against its own encoding, then
+        the blocks are rehashed with BINARY into a new log, the batches with
+        new Merkle roots over the current encoding of their transactions. The
+        balances of the tip are saved as its checkpoint. The old log is only
+        read, servers must be restarted on the new one.
+
+        Args:
+            chain_file (str): The chain log to migrate.
+            out_file (str): The chain log to create, must not exist.
+
+        Returns:
+            The number of migrated blocks and of accounts: (int, int)
+
+        Raises:
+            ValueError: If a block has an invalid hash, the chain already uses
+            BINARY or out_file already exists.
+        """
+        if os.path.exists(out_file):
+            raise ValueError(f"{out_file} already exists")
+
+        source = ChainIO._open_log(chain_file)
+        if source.encoding == BlockEncoding.BINARY:
+            raise ValueError(f"{chain_file} is already hashed with BINARY")
+
+        ledger = BalanceLedger()
+        blocks = ChainIO._rehashed(
+            ChainIO._verified(source.load(repair=False), source.encoding, ledger)
+        )
+        (count, tip_hash) = ChainIO._write_log(out_file, blocks, BlockEncoding.BINARY)
+        ChainIO._save_checkpoint(out_file, count, tip_hash, ledger)
+
+        return (count, len(ledger.balances))
+
+    @staticmethod
+    def write_ndjson(
+        out: TextIO, blocks: Iterable[Block], encoding: BlockEncoding
+    ) -> int:
+        """Writes the header line and one line per block.
+
+        Returns:
+            int: Number of blocks written.
+        """
+        header = {
+            "format": NDJSON_FORMAT,
+            "version": NDJSON_VERSION,
+            "encoding": encoding.name,
+        }
+        out.write(json.dumps(header) + "\n")
+
+        count = 0
+        for block in blocks:
+            record = ChainIO.block_to_dict(block)
+            record["hash"] = block.hash_b.hex()
+            out.write(json.dumps(record) + "\n")
+            count += 1
+
+        return count
+
+    @staticmethod
+    def read_ndjson(source: TextIO) -> Tuple[BlockEncoding, Iterator[Block]]:
+        """Reads the header line of an NDJSON export.
+
+        Returns:
+            The encoding used to hash the chain and a generator of its
+            blocks, with their hashes: (BlockEncoding, Iterator[Block])
+
+        Raises:
+            ValueError: If the file is not an NDJSON export.
+        """
+        try:
+            header = json.loads(source.readline())
+        except json.JSONDecodeError:
+            header = None
+        if not isinstance(header, dict) or header.get("format") != NDJSON_FORMAT:
+            raise ValueError("Not an NDJSON export of a blockchain")
+        version = header.get("version")
+        if version not in (1, NDJSON_VERSION):
+            raise ValueError(f"Unsupported NDJSON version: {version}")
+        encodings = _V1_ENCODINGS if version == 1 else BlockEncoding.__members__
+        if header.get("encoding") not in encodings:
+            raise ValueError(f"Unknown block encoding: {header.get('encoding')}")
+
+        def blocks() -> Iterator[Block]:
+            for line_number, line in enumerate(source, 2):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    block = ChainIO.block_from_dict(record, version)
+                    block.hash_b = bytes.fromhex(record["hash"])
+                except (KeyError, TypeError, ValueError) as e:
+                    raise ValueError(
+                        f"Invalid block at line {line_number}: {e}"
+                    ) from None
+                yield block
+
+        return (encodings[header["encoding"]], blocks())
+
+    @staticmethod
+    def block_to_dict(block: Block) -> dict:
+        """Converts a block, without its hash, to a JSON object."""
+        if isinstance(block, BatchBlock):
+            return {
+                "kind": block.KIND,
+                "version": block.version,
+                "merkle_root": block.merkle_root.hex(),
+                "transactions": [
+                    ChainIO.block_to_dict(transaction)
+                    for transaction in block.transactions
+                ],
+            }
+
+        record = {
+            "kind": block.KIND,
+            "owner_name": block.owner_name,
+            "amount": block.amount,
+            "operation": block.operation.value,
+        }
+        if isinstance(block, AccCreationBlock):
+            record["date"] = block.date.isoformat()
+        return record
+
+    @staticmethod
+    def block_from_dict(record: dict, version: int = NDJSON_VERSION) -> Block:
+        """Converts a JSON object from block_to_dict back to a block.
+
+        Args:
+            record (dict): The JSON object.
+            version (int): NDJSON version of the file it was read from.
+
+        Raises:
+            ValueError: If the kind of block is unknown or the amount is not
+            valid.
+        """
+        kind = record["kind"]
+        if kind == BatchBlock.KIND:
+            block = BatchBlock(
+                [ChainIO.block_from_dict(t, version) for t in record["transactions"]],
+                # Version 1 batches were all in encoding version 1
+                record["version"] if version > 1 else 1,
+            )
+            # Validated against the transactions by the import
+            block.merkle_root = bytes.fromhex(record["merkle_root"])
+            return block
+
+        amount = record["amount"]
+        if version == 1:
+            amount = units_from_float(amount)
+        elif not isinstance(amount, int):
+            raise ValueError("Amounts must be integers of micro-minicoins")
+
+        if kind == AccCreationBlock.KIND:
+            date = datetime.datetime.fromisoformat(record["date"])
+            return AccCreationBlock(record["owner_name"], amount, date)
+        if kind == Block.KIND:
+            return Block(record["owner_name"], amount, Operation(record["operation"]))
+
+        raise ValueError(f"Unknown kind of block: {kind}")
+
+    @staticmethod
+    def _import_blocks(
+        blocks: Iterable[Block], chain_file: str, encoding: BlockEncoding
+    ) -> Tuple[int, int]:
+        """Checks the blocks and writes them, with a checkpoint of the tip."""
+        ledger = BalanceLedger()
+        (count, tip_hash) = ChainIO._write_log(
+            chain_file, ChainIO._verified(blocks, encoding, ledger), encoding
+        )
+        ChainIO._save_checkpoint(chain_file, count, tip_hash, ledger)
+
+        return (count, len(ledger.balances))
+
+    @staticmethod
+    def _save_checkpoint(
+        chain_file: str, count: int, tip_hash: Optional[bytes], ledger: BalanceLedger
+    ):
+        """Saves the balances of the tip of a new chain log as its checkpoint."""
+        checkpoint = Checkpoint(count, tip_hash or bytes(32), ledger.balances)
+        CheckpointStore(chain_file + SUFFIX).save(checkpoint)
+
+    @staticmethod
+    def _rehashed(blocks: Iterable[Block]) -> Iterator[Block]:
+        """Passes the blocks on, rehashed from genesis with BINARY.
+
+        Batches are rebuilt in the current encoding version, so their Merkle
+        roots change too.
+        """
+        last_hash = None
+        for block in blocks:
+            if isinstance(block, BatchBlock):
+                block = BatchBlock(block.transactions)
+
+            block.hash_b = Hash.hash_block(block, last_hash, BlockEncoding.BINARY)
+            last_hash = block.hash_b
+            yield block
+
+    @staticmethod
+    def _verified(
+        blocks: Iterable[Block], encoding: BlockEncoding, ledger: BalanceLedger
+    ) -> Iterator[Block]:
+        """Passes the blocks on, checking their hashes and applying them.
+
+        Raises:
+            ValueError: At the first block with an invalid hash.
+        """
+        last_hash = None
+        for index, block in enumerate(blocks):
+            is_valid = block.hash_b == Hash.hash_block(block, last_hash, encoding)
+            if is_valid and isinstance(block, BatchBlock):
+                is_valid = block.has_valid_root()
+            if not is_valid:
+                raise ValueError(f"Invalid hash at block {index}")
+
+            ledger.apply(block)
+            last_hash = block.hash_b
+            yield block
+
+    @staticmethod
+    def _write_log(
+        path: str, blocks: Iterable[Block], encoding: BlockEncoding
+    ) -> Tuple[int, Optional[bytes]]:
+        """Writes the blocks to a new chain log.
+
+        The log is written to a temporary file, renamed to path only if all
+        the blocks were written.
+
+        Args:
+            path (str): The chain log to create.
+            blocks (Iterable[Block]): The blocks, from genesis.
+            encoding (BlockEncoding): Encoding used to hash the chain.
+
+        Returns:
+            The number of blocks written and the hash of the last one, None if
+            there are no blocks: (int, Optional[bytes])
+        """
+        tmp_path = path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)  # Left by an interrupted import
+        store = ChainStore(tmp_path, IMPORT_SYNC_EVERY, encoding)
+
+        count = 0
+        last_hash = None
+        try:
+            for block in blocks:
+                store.append(block)
+                last_hash = block.hash_b
+                count += 1
+        except BaseException:
+            store.close()
+            os.remove(tmp_path)
+            raise
+
+        store.close()
+        os.replace(tmp_path, path)
+        return (count, last_hash)
+
+    @staticmethod
+    def _open_log(path: str) -> ChainStore:
+        """Opens an existing chain log to read it, leaving it as it is."""
+        if not os.path.exists(path):
+            raise ValueError(f"No such chain log: {path}")
+        return ChainStore(path, read_only=True)
@@ -0,0 +1,367 @@
+"""Append-only persistent store for the blockchain.
+
+Stores the blocks of the chain in a binary log file, one length-prefixed
+record per block, so the server can be restarted without losing the ledger.
+Writes are buffered and fsynced in batches. The log is read back with a
+streaming reader that decodes the records with struct, without any JSON
+parsing. The header of the log records which encoding was used to hash the
+chain, and the blocks are stored in the version of the binary encoding that
+goes with it. Logs of the first version are upgraded when opened, unless
+they are opened read only.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import datetime
+import os
+import struct
+from collections import deque
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from models.block import Block, BlockEncoding, record_version
+from models.acc_creation_block import AccCreationBlock, EPOCH
+from models.amount import units_from_float
+from models.block_codec import decode_block
+from models.operation import Operation
+
+MAGIC = b"MBCS"
+FORMAT_VERSION = 2
+SYNC_EVERY = 64  # Records written between fsyncs
+READ_SIZE = 1 << 20  # Bytes read from the log at a time
+TAIL_OFFSETS = 4096  # Records at the end of the log that can be truncated
+
+_FILE_HEADER = struct.Struct("<4sB")  # magic, format version
+_ENCODING = struct.Struct("<B")  # hash encoding, after the header since v2
+_LENGTH = struct.Struct("<I")  # length of the record's payload
+_HASH = struct.Struct("<32s")  # hash of the block, before its encoding
+
+# Version 1 records: kind, operation, amount, hash, creation date (µs since
+# epoch), name length. Their chains were hashed with the JSON encoding.
+_V1_RECORD_HEAD = struct.Struct("<BBd32sqH")
+
+
+def read_header(log: BinaryIO) -> Tuple[int, BlockEncoding]:
+    """Checks the header of a chain log and reads it.
+
+    Leaves the file at the first record.
+
+    Returns:
+        The format version of the log and the encoding used to hash the
+        chain: (int, BlockEncoding)
+
+    Raises:
+        ValueError: If the file is not a chain log or its version is not
+        supported.
+    """
+    header = log.read(_FILE_HEADER.size)
+    if len(header) < _FILE_HEADER.size:
+        raise ValueError(f"{log.name} is not a chain log")
+
+    (magic, version) = _FILE_HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"{log.name} is not a chain log")
+
+    if version == 1:
+        return (version, BlockEncoding.JSON)
+    elif version == FORMAT_VERSION:
+        (encoding,) = _ENCODING.unpack(log.read(_ENCODING.size))
+        return (version, BlockEncoding(encoding))
+
+    raise ValueError(f"Unsupported chain log version: {version}")
+
+
+def record_at(buffer: bytes, offset: int) -> Tuple[Optional[bytes], int, int]:
+    """Locates the parts of the (current version) record starting at offset.
+
+    Args:
+        buffer (bytes): Bytes-like object with records, as stored in the log.
+        offset (int): Where the record starts in buffer.
+
+    Returns:
+        The block's hash, where its binary encoding starts and where the
+        record ends: (bytes, int, int). The hash is None if the record is
+        incomplete.
+    """
+    if len(buffer) - offset < _LENGTH.size:
+        return (None, offset, len(buffer))
+
+    (length,) = _LENGTH.unpack_from(buffer, offset)
+    end = offset + _LENGTH.size + length
+    if end > len(buffer) or length < _HASH.size:
+        return (None, offset, len(buffer))
+
+    (hash_b,) = _HASH.unpack_from(buffer, offset + _LENGTH.size)
+    return (hash_b, offset + _LENGTH.size + _HASH.size, end)
+
+
+class ChainStore:
+    """Append-only log of the blocks of the blockchain.
+
+    Every record is the payload length (uint32) followed by the payload, which
+    holds the block's hash and its binary encoding (Block.to_bytes, in the
+    version given by record_version of the chain's encoding). If the
+    server dies in the middle of a write, the incomplete record at the end of
+    the log is discarded by the next load.
+
+    Attributes:
+        path (str): Path of the log file.
+        sync_every (int): Number of appended records between fsyncs.
+        encoding (BlockEncoding): Encoding used to hash the stored chain. The
+        one in the header wins over the argument for existing logs.
+        read_only (bool): If the log is never written: it's not created nor
+        upgraded, blocks can't be appended and load doesn't repair it.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sync_every: Optional[int] = SYNC_EVERY,
+        encoding: BlockEncoding = BlockEncoding.BINARY,
+        read_only: bool = False,
+    ):
+        self.path = path
+        self.sync_every = sync_every
+        self.encoding = encoding
+        self.read_only = read_only
+
+        self._file: Optional[BinaryIO] = None
+        self._pending = 0  # Records written since the last fsync
+        self._offsets = deque(maxlen=TAIL_OFFSETS)  # Start of the last records
+
+        if read_only:
+            with open(path, "rb") as log:
+                self._read_header(log)
+        elif not os.path.exists(path) or os.path.getsize(path) == 0:
+            self._write_header(path, encoding)
+        else:
+            with open(path, "rb") as log:
+                version = self._read_header(log)
+            if version == 1:
+                self._upgrade_v1()
+
+    def load(self, repair: bool = True) -> Iterator[Block]:
+        """Reads all the blocks stored in the log, from genesis.
+
+        The log is read in large chunks and decoded in place, so the time to
+        load depends only on how fast the file can be read. An incomplete
+        record at the end of the log is truncated, or only skipped if repair
+        is False or the log is read only. The records of a version 1 log,
+        only found if it's read only, are decoded too.
+
+        Yields:
+            Block: The stored blocks, with their hashes, in order.
+
+        Raises:
+            ValueError: If the file is not a chain log or its version is not
+            supported.
+        """
+        with open(self.path, "rb") as log:
+            version = self._read_header(log)
+
+            valid_end = log.tell()
+            buffer = bytearray()
+            while True:
+                chunk = log.read(READ_SIZE)
+                if not chunk:
+                    break
+                buffer += chunk
+
+                offset = 0
+                while len(buffer) - offset >= _LENGTH.size:
+                    (length,) = _LENGTH.unpack_from(buffer, offset)
+                    end = offset + _LENGTH.size + length
+                    if end > len(buffer):
+                        break  # Record continues in the next chunk
+
+                    if version == 1:
+                        yield self._decode_v1(buffer, offset + _LENGTH.size)
+                    else:
+                        yield self._decode(buffer, offset + _LENGTH.size, end)
+                    offset = end
+
+                valid_end += offset
+                del buffer[:offset]
+
+        # Drop the incomplete record left by an interrupted write
+        if len(buffer) > 0 and repair and not self.read_only:
+            with open(self.path, "r+b") as log:
+                log.truncate(valid_end)
+
+    def append(self, block: Block):
+        """Writes a block, with its hash already set, at the end of the log.
+
+        The record is fsynced together with the next sync_every records, or
+        when sync or close are called.
+
+        Args:
+            block (Block): The block appended to the chain.
+
+        Raises:
+            ValueError: If the log is read only.
+        """
+        if self.read_only:
+            raise ValueError(f"{self.path} is opened read only")
+
+        if self._file is None:
+            self._file = open(self.path, "ab")
+
+        payload = self._encode(block, self.encoding)
+        self._offsets.append(self._file.tell())
+        self._file.write(_LENGTH.pack(len(payload)))
+        self._file.write(payload)
+
+        self._pending += 1
+        if self._pending >= self.sync_every:
+            self.sync()
+
+    def truncate(self, count: int):
+        """Removes the last records from the log.
+
+        Used when the server pops invalid blocks from the chain.
+
+        Args:
+            count (int): Number of records to remove.
+
+        Raises:
+            ValueError: If more records than the ones appended recently are
+            removed.
+        """
+        if count == 0:
+            return
+
+        if count > len(self._offsets):
+            raise ValueError("Can't truncate records that were not appended")
+
+        for _ in range(count - 1):
+            self._offsets.pop()
+        offset = self._offsets.pop()
+
+        self._file.flush()
+        self._file.truncate(offset)
+        self.sync()
+
+    def sync(self):
+        """Flushes the written records and fsyncs the log."""
+        if self._file is None:
+            return
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self):
+        """Syncs and closes the log."""
+        if self._file is None:
+            return
+
+        self.sync()
+        self._file.close()
+        self._file = None
+
+    @staticmethod
+    def _write_header(path: str, encoding: BlockEncoding):
+        """Creates an empty log file."""
+        with open(path, "wb") as log:
+            log.write(_FILE_HEADER.pack(MAGIC, FORMAT_VERSION))
+            log.write(_ENCODING.pack(encoding.value))
+
+    def _read_header(self, log: BinaryIO) -> int:
+        """Checks the header of the log file and reads the hash encoding.
+
+        Returns:
+            int: The format version of the log.
+        """
+        (version, self.encoding) = read_header(log)
+        return version
+
+    def _upgrade_v1(self):
+        """Rewrites a version 1 log in the current format.
+
+        The blocks keep their hashes, so the upgraded log still uses the JSON
+        encoding for hashing.
+        """
+        tmp_path = self.path + ".upgrade"
+        self._write_header(tmp_path, BlockEncoding.JSON)
+
+        with open(self.path, "rb") as old_log, open(tmp_path, "ab") as new_log:
+            self._read_header(old_log)
+            data = old_log.read()
+
+            offset = 0
+            while len(data) - offset >= _LENGTH.size:
+                (length,) = _LENGTH.unpack_from(data, offset)
+                end = offset + _LENGTH.size + length
+                if end > len(data):
+                    break  # Incomplete record from an interrupted write
+
+                block = self._decode_v1(data, offset + _LENGTH.size)
+                payload = self._encode(block, BlockEncoding.JSON)
+                new_log.write(_LENGTH.pack(len(payload)))
+                new_log.write(payload)
+                offset = end
+
+            new_log.flush()
+            os.fsync(new_log.fileno())
+
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def encode_record(
+        block: Block, encoding: BlockEncoding = BlockEncoding.BINARY
+    ) -> bytes:
+        """Encodes a block, with its hash, as a complete record of the log.
+
+        Args:
+            block (Block): The block, with its hash set.
+            encoding (BlockEncoding): Encoding used to hash the chain.
+        """
+        payload = ChainStore._encode(block, encoding)
+        return _LENGTH.pack(len(payload)) + payload
+
+    @staticmethod
+    def _encode(block: Block, encoding: BlockEncoding) -> bytes:
+        """Encodes a block as the payload of a record."""
+        return _HASH.pack(block.hash_b) + block.to_bytes(record_version(encoding))
+
+    @staticmethod
+    def _decode(buffer: bytearray, offset: int, end: int) -> Block:
+        """Decodes the payload of a record between offset and end."""
+        (hash_b,) = _HASH.unpack_from(buffer, offset)
+        (block, block_end) = decode_block(buffer, offset + _HASH.size)
+        if block_end != end:
+            raise ValueError("Corrupted record in chain log")
+
+        block.hash_b = hash_b
+        return block
+
+    @staticmethod
+    def _decode_v1(buffer: bytes, offset: int) -> Block:
+        """Decodes the payload of a version 1 record that starts at offset.
+
+        Raises:
+            ValueError: If the record is corrupted.
+        """
+        try:
+            return ChainStore._decode_v1_fields(buffer, offset)
+        except (struct.error, OverflowError) as e:
+            raise ValueError(f"Corrupted record in chain log: {e}") from None
+
+    @staticmethod
+    def _decode_v1_fields(buffer: bytes, offset: int) -> Block:
+        """Decodes the fields of a version 1 record, see _decode_v1."""
+        (kind, op_code, amount, hash_b, date_us, name_len) = (
+            _V1_RECORD_HEAD.unpack_from(buffer, offset)
+        )
+        name_start = offset + _V1_RECORD_HEAD.size
+        owner_name = buffer[name_start : name_start + name_len].decode("utf-8")
+        amount = units_from_float(amount)
+
+        if kind == AccCreationBlock.KIND:
+            date = EPOCH + datetime.timedelta(microseconds=date_us)
+            block = AccCreationBlock(owner_name, amount, date)
+        else:
+            block = Block(owner_name, amount, Operation.from_code(op_code))
+
+        block.hash_b = hash_b
+        return block
@@ -0,0 +1,175 @@
+"""Balance checkpoints of the blockchain.
+
+A checkpoint captures the state of the chain at a height: the hash of the
+block at the tip, the height and the balance of every client. It's bound to
+the chain by the tip hash, which covers every block before it, and to its own
+contents by a digest. A server that restarts from a checkpoint restores the
+balances and validates only the blocks after it, so startup time depends on
+the blocks appended since the last checkpoint, not on the age of the ledger.
+
+Checkpoints are kept in a sidecar file next to the chain log, replaced
+atomically with the latest one.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import hashlib
+import os
+import struct
+from typing import Dict, Optional, Sequence
+
+from models.block import Block
+from models.columnar_chain import hash_at
+
+CHECKPOINT_EVERY = 10000  # Blocks between checkpoints
+SUFFIX = ".ckpt"  # Appended to the chain log's path to name the sidecar file
+
+MAGIC = b"MBCK"
+FORMAT_VERSION = 2  # Version 1 (float balances) is ignored, and replaced
+
+_FILE_HEADER = struct.Struct("<4sB")  # magic, format version
+_HEAD = struct.Struct("<Q32sI")  # height, tip hash, number of balances
+_DIGEST = struct.Struct("<32s")
+_NAME_LEN = struct.Struct("<H")
+_BALANCE = struct.Struct("<q")  # micro-minicoins
+
+
+class Checkpoint:
+    """State of the blockchain at a height.
+
+    Attributes:
+        height (int): Number of blocks, from genesis, covered by the
+        checkpoint.
+        tip_hash (bytes): Hash of the last block covered, zeros for height 0.
+        balances (Dict[str, int]): Balance of each client at the height.
+        digest (bytes): SHA256 of the checkpoint's contents.
+    """
+
+    def __init__(self, height: int, tip_hash: bytes, balances: Dict[str, int]):
+        self.height = height
+        self.tip_hash = tip_hash
+        self.balances = balances
+        self.digest = hashlib.sha256(self._contents()).digest()
+
+    def is_valid(self) -> bool:
+        """Checks if the digest matches the contents."""
+        return self.digest == hashlib.sha256(self._contents()).digest()
+
+    def matches(self, block_chain: Sequence[Block]) -> bool:
+        """Checks if the checkpoint was taken from a prefix of the chain.
+
+        Args:
+            block_chain (Sequence[Block]): The blocks, from genesis.
+
+        Returns:
+            bool: True if the chain has the checkpoint's tip at its height.
+        """
+        if not self.is_valid() or self.height > len(block_chain):
+            return False
+        if self.height == 0:
+            return True
+        return hash_at(block_chain, self.height - 1) == self.tip_hash
+
+    def to_bytes(self) -> bytes:
+        """Encodes the checkpoint, followed by its digest."""
+        return self._contents() + _DIGEST.pack(self.digest)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "Checkpoint":
+        """Decodes a checkpoint encoded with to_bytes.
+
+        Raises:
+            ValueError: If the data is truncated or the digest doesn't match.
+        """
+        try:
+            (height, tip_hash, count) = _HEAD.unpack_from(data, 0)
+            offset = _HEAD.size
+
+            balances = {}
+            for _ in range(count):
+                (name_len,) = _NAME_LEN.unpack_from(data, offset)
+                offset += _NAME_LEN.size
+                name = data[offset : offset + name_len].decode("utf-8")
+                offset += name_len
+                (balances[name],) = _BALANCE.unpack_from(data, offset)
+                offset += _BALANCE.size
+
+            (digest,) = _DIGEST.unpack_from(data, offset)
+        except struct.error:
+            raise ValueError("Truncated checkpoint") from None
+
+        checkpoint = Checkpoint(height, tip_hash, balances)
+        if checkpoint.digest != digest:
+            raise ValueError("Checkpoint digest doesn't match its contents")
+        return checkpoint
+
+    def _contents(self) -> bytes:
+        """Encoding of the checkpoint without the digest.
+
+        Balances are sorted by name, so equal states have equal digests.
+        """
+        parts = [_HEAD.pack(self.height, self.tip_hash, len(self.balances))]
+        for name in sorted(self.balances):
+            name_b = name.encode("utf-8")
+            parts.append(_NAME_LEN.pack(len(name_b)))
+            parts.append(name_b)
+            parts.append(_BALANCE.pack(self.balances[name]))
+        return b"".join(parts)
+
+    def __repr__(self):
+        return (
+            f"Checkpoint height={self.height} tip={self.tip_hash.hex()[:3]} "
+            f"balances={len(self.balances)}"
+        )
+
+
+class CheckpointStore:
+    """Sidecar file with the latest checkpoint of a chain log.
+
+    Attributes:
+        path (str): Path of the sidecar file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[Checkpoint]:
+        """Reads the stored checkpoint.
+
+        Returns:
+            Optional[Checkpoint]: The checkpoint, None if there's no file or
+            its contents are damaged.
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        with open(self.path, "rb") as sidecar:
+            data = sidecar.read()
+
+        if len(data) < _FILE_HEADER.size:
+            return None
+        (magic, version) = _FILE_HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            return None
+
+        try:
+            return Checkpoint.from_bytes(data[_FILE_HEADER.size :])
+        except ValueError:
+            return None
+
+    def save(self, checkpoint: Checkpoint):
+        """Replaces the stored checkpoint, atomically.
+
+        Args:
+            checkpoint (Checkpoint): The new checkpoint. The blocks it covers
+            must already be synced to the chain log.
+        """
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as sidecar:
+            sidecar.write(_FILE_HEADER.pack(MAGIC, FORMAT_VERSION))
+            sidecar.write(checkpoint.to_bytes())
+            sidecar.flush()
+            os.fsync(sidecar.fileno())
+
+        os.replace(tmp_path, self.path)
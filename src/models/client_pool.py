@@ -0,0 +1,170 @@
+"""Connection pool of clients that serve many accounts.
+
+A MultiplexedConnection sends tagged requests ("@<request_id> <account>
+<command>", see models.multiplexer) for any number of accounts over a single
+socket, without waiting for the replies: each request returns a Future, set by
+a reader thread when the reply with its id arrives, in whatever order the
+server answers.
+
+A ConnectionPool spreads the accounts over a fixed number of such
+connections, always the same connection for the same account, so the
+requests of each account are still answered in order.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import itertools
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from models.network_node import NetworkNode
+from models.operation import Operation
+from models.multiplexer import TAG
+
+POOL_SIZE = 4  # Connections of a pool
+
+
+class MultiplexedConnection(NetworkNode):
+    """Connection carrying the requests of many accounts.
+
+    Thread safe: requests can be sent from any thread.
+
+    Attributes:
+        is_open (bool): False once the connection is closed, by either side.
+    """
+
+    def __init__(self, server_ip: str, server_port: int):
+        super().__init__()
+
+        self.socket.connect((server_ip, server_port))
+        self.is_open = True
+
+        self._request_ids = itertools.count()
+        self._pending: Dict[str, Future] = {}  # Requests waiting for replies
+        self._lock = threading.Lock()  # Protects is_open and _pending
+        self._send_lock = threading.Lock()  # Never held by the reader
+
+        self._reader = threading.Thread(
+            target=self._read_replies, daemon=True, name="MultiplexedReader"
+        )
+        self._reader.start()
+
+    def request(self, account: str, command: str) -> Future:
+        """Sends a command of an account, without waiting for the reply.
+
+        Args:
+            account (str): Name of the account, without spaces.
+            command (str): The command, e.g. "deposit 10" or "balance".
+
+        Returns:
+            Future: Set to the reply (str) when it arrives, or to a
+            ConnectionError if the connection is closed before.
+        """
+        future = Future()
+        with self._lock:
+            if not self.is_open:
+                raise ConnectionError("Connection closed")
+
+            request_id = str(next(self._request_ids))
+            self._pending[request_id] = future
+
+        try:
+            with self._send_lock:
+                self.send_str(self.socket, f"{TAG}{request_id} {account} {command}")
+        except OSError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise
+
+        return future
+
+    def call(self, account: str, command: str, timeout: Optional[float] = None) -> str:
+        """Sends a command of an account and waits for the reply."""
+        return self.request(account, command).result(timeout)
+
+    def close(self):
+        """Closes the connection, once every request sent was answered."""
+        with self._lock:
+            self.is_open = False
+
+        try:
+            with self._send_lock:
+                self.send_str(self.socket, Operation.QUIT.value)
+        except OSError:
+            pass  # Already closed by the server
+
+        # The server answers the requests in flight before closing
+        self._reader.join()
+        self.terminate()
+
+    def _read_replies(self):
+        """Sets the future of each reply, until the connection is closed."""
+        reader = self.frame_reader(self.socket)
+        try:
+            while True:
+                replies = reader.recv_messages()
+                if replies is None:
+                    break
+
+                for reply in replies:
+                    if not reply.startswith(TAG):
+                        continue  # Not a reply to a request, e.g. goodbye
+
+                    (request_id, _, text) = reply[len(TAG) :].partition(" ")
+                    with self._lock:
+                        future = self._pending.pop(request_id, None)
+                    if future is not None:
+                        future.set_result(text)
+        except OSError:
+            pass  # Connection closed
+
+        with self._lock:
+            self.is_open = False
+            pending = list(self._pending.values())
+            self._pending.clear()
+
+        for future in pending:
+            future.set_exception(ConnectionError("Connection closed"))
+
+
+class ConnectionPool:
+    """Fixed set of multiplexed connections shared by many accounts.
+
+    Attributes:
+        connections (List[MultiplexedConnection]): The connections.
+    """
+
+    def __init__(self, server_ip: str, server_port: int, size: int = POOL_SIZE):
+        self.connections: List[MultiplexedConnection] = []
+        try:
+            for _ in range(size):
+                self.connections.append(
+                    MultiplexedConnection(server_ip, server_port)
+                )
+        except OSError:
+            self.close()
+            raise
+
+    def connection_for(self, account: str) -> MultiplexedConnection:
+        """Gets the connection of an account, always the same in a process."""
+        return self.connections[hash(account) % len(self.connections)]
+
+    def request(self, account: str, command: str) -> Future:
+        """Sends a command of an account, see MultiplexedConnection.request."""
+        return self.connection_for(account).request(account, command)
+
+    def call(self, account: str, command: str, timeout: Optional[float] = None) -> str:
+        """Sends a command of an account and waits for the reply."""
+        return self.request(account, command).result(timeout)
+
+    def close(self):
+        for connection in self.connections:
+            connection.close()
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
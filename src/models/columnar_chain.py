@@ -0,0 +1,147 @@
+"""Columnar container for the blocks of the blockchain.
+
+Stores the fields of the blocks in typed arrays (amounts, operations, owner
+ids, hashes) instead of one Python object per block, so a chain with millions
+of blocks uses a few dozen bytes per block. Behaves like the list of blocks
+used by the server: blocks are materialized when they are read.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import sys
+from array import array
+from datetime import timedelta
+from typing import Dict, Iterable, Iterator, List, Sequence, Union
+
+from models.block import Block
+from models.acc_creation_block import AccCreationBlock, EPOCH
+from models.operation import Operation
+
+HASH_SIZE = 32  # Size of a SHA-256 digest
+
+
+def hash_at(block_chain: Sequence[Block], index: int) -> bytes:
+    """Gets the hash of a block of a chain, a list or a ColumnarChain.
+
+    Only materializes the block if the chain is a list of blocks, for the
+    code that needs nothing else from it.
+    """
+    if isinstance(block_chain, ColumnarChain):
+        return block_chain.hash_at(index)
+    return block_chain[index].hash_b
+
+
+class ColumnarChain:
+    """List-like chain of blocks stored column by column.
+
+    Supports len, indexing (also negative indexes and slices), iteration,
+    append, extend and pop of the last block, which is what Server, Hash and
+    Transaction use. Blocks read from it are copies, changing them does not
+    change the chain.
+
+    Attributes:
+        owners (List[str]): Name of each owner, indexed by the owner's id.
+    """
+
+    def __init__(self, blocks: Iterable[Block] = ()):
+        self.owners: List[str] = []
+
+        self._owner_ids: Dict[str, int] = {}
+        self._owner_col = array("I")
+        self._amounts = array("q")  # micro-minicoins
+        self._operations = bytearray()
+        self._kinds = bytearray()
+        self._hashes = bytearray()
+        self._dates: Dict[int, int] = {}  # Creation date (µs) of AccCreationBlocks
+
+        self.extend(blocks)
+
+    def append(self, block: Block):
+        """Stores a block, with its hash already set, at the end of the chain."""
+        if block.KIND not in (Block.KIND, AccCreationBlock.KIND):
+            raise TypeError("Only single transaction blocks can be stored")
+
+        if block.hash_b is None or len(block.hash_b) != HASH_SIZE:
+            raise ValueError("Block must have a SHA-256 hash to be stored")
+
+        owner_id = self._owner_ids.get(block.owner_name)
+        if owner_id is None:
+            owner_id = len(self.owners)
+            self.owners.append(sys.intern(block.owner_name))
+            self._owner_ids[block.owner_name] = owner_id
+
+        if isinstance(block, AccCreationBlock):
+            date_us = (block.date - EPOCH) // timedelta(microseconds=1)
+            self._dates[len(self._amounts)] = date_us
+
+        self._owner_col.append(owner_id)
+        self._amounts.append(block.amount)
+        self._operations.append(block.operation.code)
+        self._kinds.append(block.KIND)
+        self._hashes += block.hash_b
+
+    def extend(self, blocks: Iterable[Block]):
+        for block in blocks:
+            self.append(block)
+
+    def pop(self) -> Block:
+        """Removes and returns the last block of the chain."""
+        if len(self._amounts) == 0:
+            raise IndexError("pop from empty chain")
+
+        block = self[-1]
+        index = len(self._amounts) - 1
+
+        self._owner_col.pop()
+        self._amounts.pop()
+        del self._operations[-1]
+        del self._kinds[-1]
+        del self._hashes[-HASH_SIZE:]
+        self._dates.pop(index, None)
+
+        return block
+
+    def hash_at(self, index: int) -> bytes:
+        """Gets the hash of a block without materializing it."""
+        index = self._normalize(index)
+        start = index * HASH_SIZE
+        return bytes(self._hashes[start : start + HASH_SIZE])
+
+    def __len__(self) -> int:
+        return len(self._amounts)
+
+    def __iter__(self) -> Iterator[Block]:
+        for index in range(len(self._amounts)):
+            yield self._materialize(index)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Block, List[Block]]:
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+
+        return self._materialize(self._normalize(index))
+
+    def _normalize(self, index: int) -> int:
+        """Converts negative indexes and checks the bounds."""
+        if index < 0:
+            index += len(self._amounts)
+        if not 0 <= index < len(self._amounts):
+            raise IndexError("chain index out of range")
+        return index
+
+    def _materialize(self, index: int) -> Block:
+        """Builds the Block stored at a (non-negative) index."""
+        owner_name = self.owners[self._owner_col[index]]
+        amount = self._amounts[index]
+
+        if self._kinds[index] == AccCreationBlock.KIND:
+            date = EPOCH + timedelta(microseconds=self._dates[index])
+            block = AccCreationBlock(owner_name, amount, date)
+        else:
+            operation = Operation.from_code(self._operations[index])
+            block = Block(owner_name, amount, operation)
+
+        start = index * HASH_SIZE
+        block.hash_b = bytes(self._hashes[start : start + HASH_SIZE])
+        return block
+
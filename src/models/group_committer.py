@@ -0,0 +1,202 @@
+"""Group commit of the transactions of all clients.
+
+Client threads submit their deposits and withdrawals to a queue instead of
+executing them. A single committer thread drains the queue and executes all
+the pending transactions as one batch, under a single acquisition of the lock:
+they are validated and appended, their hashes are computed in one pass, the
+new blocks are validated once and the chain log is synced once. Only then is
+each client answered.
+
+With merkle batches, each batch is stored in a single BatchBlock instead of a
+block per transaction.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, List, Optional
+
+from models.operation import Operation
+from models.transaction_handler import Transaction
+from models.hash import Hash
+from models import metrics
+
+# Imports Server only during static type checking (not at runtime) to avoid
+# circular dependency.
+if TYPE_CHECKING:
+    from models.server import Server
+
+MAX_BATCH = 1024  # Most transactions committed together
+
+logger = logging.getLogger(__name__)
+
+
+class PendingTransaction:
+    """A transaction waiting to be committed.
+
+    Attributes:
+        client_name (str): The identification of the client.
+        amount (int): How many micro-minicoins are involved.
+        operation (Operation): DEPOSIT or WITHDRAW.
+        status (Optional[str]): Status message of the transaction, set when
+        it's committed.
+    """
+
+    def __init__(self, client_name: str, amount: int, operation: Operation):
+        self.client_name = client_name
+        self.amount = amount
+        self.operation = operation
+        self.status: Optional[str] = None
+
+        self._done = threading.Event()
+
+    def wait(self) -> str:
+        """Blocks until the transaction is committed.
+
+        Returns:
+            str: The status message of the transaction.
+        """
+        self._done.wait()
+        return self.status
+
+    def finish(self, status: str):
+        """Sets the status and wakes up the waiting client."""
+        self.status = status
+        self._done.set()
+
+
+class GroupCommitter:
+    """Executes the transactions of all clients in batches.
+
+    Attributes:
+        server (Server): The server with the blockchain.
+        lock (threading.Lock): Lock to protect the server's shared state.
+        max_batch (int): Most transactions executed in a batch.
+        merkle (bool): If each batch is stored in a single BatchBlock.
+    """
+
+    def __init__(
+        self,
+        server: Server,
+        lock: threading.Lock,
+        max_batch: int = MAX_BATCH,
+        merkle: bool = False,
+    ):
+        self.server = server
+        self.lock = lock
+        self.max_batch = max_batch
+        self.merkle = merkle
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="GroupCommitter"
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Commits the transactions already submitted and stops the thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def submit(
+        self, client_name: str, amount: int, operation: Operation
+    ) -> PendingTransaction:
+        """Queues a transaction to be committed in the next batch.
+
+        Returns:
+            PendingTransaction: Wait on it for the status of the transaction.
+        """
+        pending = PendingTransaction(client_name, amount, operation)
+        self._queue.put(pending)
+        return pending
+
+    def _run(self):
+        """Commits batches until stop is called."""
+        is_running = True
+        while is_running:
+            # Block for the first transaction, then take what else is queued
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in batch:
+                is_running = False
+                batch = [pending for pending in batch if pending is not None]
+
+            if len(batch) > 0:
+                self._commit(batch)
+
+    def _commit(self, batch: List[PendingTransaction]):
+        """Executes a batch of transactions and answers their clients.
+
+        If the batch fails before it's committed, the blocks it appended are
+        popped and every transaction fails. Once committed the transactions
+        are visible to readers, so they keep their statuses even if the sync
+        of the log fails.
+        """
+        server = self.server
+        statuses = ["Internal error"] * len(batch)
+        try:
+            waited = time.perf_counter()
+            with self.lock:
+                metrics.LOCK_WAIT.observe(time.perf_counter() - waited)
+                start_height = len(server.block_chain)
+                try:
+                    statuses = self._execute(batch, start_height)
+                    server.commit()
+                except Exception:
+                    statuses = ["Internal error"] * len(batch)
+                    server.truncate_chain(start_height)
+                    raise
+
+                if server.chain_store is not None:
+                    server.chain_store.sync()
+
+        except Exception as e:
+            logger.exception("Error committing transactions: %s", e)
+
+        for pending, status in zip(batch, statuses):
+            pending.finish(status)
+
+    def _execute(self, batch: List[PendingTransaction], start_height: int) -> List[str]:
+        """Appends the blocks of a batch and validates them.
+
+        Must be called with the lock held.
+
+        Returns:
+            List[str]: The status of each transaction.
+        """
+        server = self.server
+        transactions = [(p.client_name, p.amount, p.operation) for p in batch]
+        if self.merkle:
+            results = Transaction.execute_merkle_batch(server, transactions)
+        else:
+            results = Transaction.execute_batch(server, transactions)
+
+        statuses = [status for (_, status) in results]
+
+        if not Hash.validate_new_blocks(server):
+            # Pop invalid blocks after the verified prefix, and every
+            # transaction of the batch that was in them
+            server.truncate_chain(server.verified_height)
+
+            height = start_height
+            for i, (is_valid, _) in enumerate(results):
+                if is_valid:
+                    if height >= server.verified_height:
+                        statuses[i] = "Corrupted block's hash"
+                    if not self.merkle:
+                        height += 1
+
+        return statuses
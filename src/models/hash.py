@@ -2,7 +2,9 @@
 
 Computes and validates SHA-256 hashes for blocks in the blockchain. Each block's
 hash includes the previous block's hash (except genesis).
-Provides methods to validate individual blocks and the entire blockchain.
+Provides methods to validate individual blocks, the blocks appended after the
+verified prefix of the chain or the latest checkpoint, and the entire
+blockchain.
 Does not automatically correct invalid hashes - only reports them.
 
 Authors: Andre Grassi de Jesus, Ricardo Faria
@@ -12,9 +14,14 @@ Last Modified: Nov. 14 2025
 from __future__ import annotations
 
 import hashlib
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Optional
 
-from models.block import Block
+from models.block import Block, BlockEncoding
+from models.batch_block import BatchBlock
+from models.columnar_chain import hash_at
+from models.parallel_audit import ParallelAudit
+from models import metrics
 
 # Imports Server only during static type checking (not at runtime) to avoid
 # circular dependency.
@@ -38,7 +45,8 @@ class Hash:
         """Calculates the hash for the block using SHA256
 
         Previous block's hash is included in the computation, except for the
-        genesis block, in this case pass None as previous_block.
+        genesis block, in this case pass None as previous_block. The block is
+        encoded with the server's block_encoding.
 
         Args:
             server (Server): The server with the blockchain
@@ -49,13 +57,33 @@ class Hash:
         Returns:
             bytes: The computed hash of the block.
         """
-        payload = block.serialize()
+        last_hash = None
+        if previous_block is not None:
+            last_hash = previous_block.hash_b
+
+        return Hash.hash_block(block, last_hash, server.block_encoding)
+
+    @staticmethod
+    def hash_block(
+        block: Block, last_hash: Optional[bytes], encoding: BlockEncoding
+    ) -> bytes:
+        """Calculates the hash of a block, without a server.
+
+        Args:
+            block (Block): The block to compute the hash for
+            last_hash (Optional[bytes]): The hash of the previous block, None
+            for the genesis block.
+            encoding (BlockEncoding): The encoding used to hash the chain.
+
+        Returns:
+            bytes: The computed hash of the block.
+        """
+        payload = block.serialize(encoding)
 
         hash_obj = hashlib.sha256()
 
         # If it's not the genesis, use last hash
-        if previous_block is not None:
-            last_hash = previous_block.hash_b
+        if last_hash is not None:
             hash_obj.update(last_hash)
 
         hash_obj.update(payload)
@@ -68,7 +96,8 @@ class Hash:
     ) -> bool:
         """Validates the hash of a block.
 
-        Checks if the stored hash in the block matches the computed hash.
+        Checks if the stored hash in the block matches the computed hash, and
+        for a BatchBlock, if its Merkle root matches its transactions.
 
         Args:
             server (Server): The server with the blockchain
@@ -79,16 +108,86 @@ class Hash:
         Returns:
             bool: True if the hash is valid, False otherwise.
         """
+        last_hash = None
+        if previous_block is not None:
+            last_hash = previous_block.hash_b
+
+        return Hash._is_hash_valid(server, block, last_hash)
+
+    @staticmethod
+    def _is_hash_valid(
+        server: Server, block: Block, last_hash: Optional[bytes]
+    ) -> bool:
+        """Validates the hash of a block, given the previous block's hash."""
         # Validate current block's hash
-        is_hash_valid = block.hash_b == Hash.compute_hash(server, block, previous_block)
+        is_hash_valid = block.hash_b == Hash.hash_block(
+            block, last_hash, server.block_encoding
+        )
+
+        # The hash only covers the root of a batch, check its transactions too
+        if is_hash_valid and isinstance(block, BatchBlock):
+            is_hash_valid = block.has_valid_root()
+
         return is_hash_valid
 
+    @staticmethod
+    def validate_new_blocks(server: Server) -> bool:
+        """Validates only the blocks appended after the verified prefix.
+
+        The server keeps a watermark (server.verified_height) with the number
+        of blocks, counted from genesis, whose hashes were already checked.
+        Only the blocks after it are validated, each one against its verified
+        predecessor, so the cost depends on how many blocks were appended and
+        not on the size of the chain.
+
+        The watermark is advanced up to the first invalid block, so after a
+        failure server.block_chain[server.verified_height:] are the blocks
+        that must be popped.
+
+        Args:
+            server (Server): The server with the blockchain
+
+        Returns:
+            bool: True if all the new blocks are valid, False otherwise.
+        """
+        start = time.perf_counter()
+        block_chain = server.block_chain
+
+        # Blocks may have been popped since the last validation
+        height = min(server.verified_height, len(block_chain))
+        first = height
+
+        # Only the hash of the verified predecessor is needed
+        last_hash = None
+        if height > 0:
+            last_hash = hash_at(block_chain, height - 1)
+
+        is_valid = True
+        while height < len(block_chain):
+            curr_block = block_chain[height]
+            if not Hash._is_hash_valid(server, curr_block, last_hash):
+                is_valid = False
+                break
+
+            last_hash = curr_block.hash_b
+            height += 1
+
+        server.verified_height = height
+
+        metrics.BLOCKS_VALIDATED.inc(height - first)
+        metrics.VALIDATE_TIME.observe(time.perf_counter() - start)
+        return is_valid
+
     @staticmethod
     def validate_blockchain_hash(server: Server) -> bool:
         """Validates the entire blockchain's hashes.
 
-        Needs to be called after adding a new block to ensure the integrity
-        of the blockchain.
+        Full audit of the chain, rehashing every block from genesis. The
+        transaction path uses validate_new_blocks instead, this should be
+        called explicitly when the whole chain must be checked again.
+
+        Resets the server's verified prefix to the blocks that passed the
+        audit.
 
         Args:
             server (Server): The server with the blockchain
@@ -96,20 +195,55 @@ class Hash:
         Returns:
             bool: True if the entire blockchain is valid, False otherwise.
         """
-        if len(server.block_chain) > 0:
-            # Validate genesis block
-            is_genesis_valid = Hash.validate_block_hash(
-                server, server.block_chain[0], None
-            )
-
-            if not is_genesis_valid:
-                return False
-
-            # Validate all blocks
-            for index in range(1, len(server.block_chain)):
-                curr_block = server.block_chain[index]
-                prev_block = server.block_chain[index - 1]
-                if not Hash.validate_block_hash(server, curr_block, prev_block):
-                    return False
-
-        return True
+        server.verified_height = 0
+        return Hash.validate_new_blocks(server)
+
+    @staticmethod
+    def validate_blockchain_hash_parallel(
+        server: Server, workers: Optional[int] = None
+    ) -> bool:
+        """Validates the entire blockchain's hashes with a process pool.
+
+        Same result as validate_blockchain_hash, including the verified
+        prefix left in the server, but the blocks are checked by many
+        processes (see ParallelAudit).
+
+        Args:
+            server (Server): The server with the blockchain
+            workers (Optional[int]): Number of processes, default one per CPU.
+
+        Returns:
+            bool: True if the entire blockchain is valid, False otherwise.
+        """
+        first_invalid = ParallelAudit.audit_chain(
+            server.block_chain, server.block_encoding, workers
+        )
+
+        if first_invalid is None:
+            server.verified_height = len(server.block_chain)
+            return True
+
+        server.verified_height = first_invalid
+        return False
+
+    @staticmethod
+    def validate_since_checkpoint(server: Server) -> bool:
+        """Validates the blocks after the server's latest checkpoint.
+
+        The blocks covered by the checkpoint are trusted: its tip hash covers
+        all of them and it was only taken after they were validated. Falls
+        back to a full audit if the checkpoint doesn't match the chain.
+
+        Args:
+            server (Server): The server with the blockchain
+
+        Returns:
+            bool: True if the blocks after the checkpoint are valid, False
+            otherwise.
+        """
+        checkpoint = server.checkpoint
+        if checkpoint is None or not checkpoint.matches(server.block_chain):
+            return Hash.validate_blockchain_hash(server)
+
+        server.verified_height = checkpoint.height
+        return Hash.validate_new_blocks(server)
@@ -0,0 +1,119 @@
+"""Merkle tree utilities for batched blocks.
+
+Computes the Merkle root of the transactions of a BatchBlock, the inclusion
+proof of one of them and verifies such proofs. A proof has one hash per level
+of the tree, so it's O(log n) for a batch of n transactions, and verifying it
+does not need the rest of the batch nor the rest of the chain.
+
+Leaves and inner nodes are hashed with different prefixes, so a leaf can't be
+passed off as an inner node. A node without a sibling is promoted to the next
+level unchanged, instead of being paired with a copy of itself.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import hashlib
+from typing import List, Tuple
+
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+# Each step of a proof: (is the sibling on the left, sibling's hash)
+ProofStep = Tuple[bool, bytes]
+
+
+class MerkleTree:
+    """Merkle tree functions, with SHA256.
+
+    Attributes:
+        None
+    """
+
+    @staticmethod
+    def leaf_hash(data: bytes) -> bytes:
+        """Hash of a leaf, from the encoded transaction."""
+        return hashlib.sha256(_LEAF_PREFIX + data).digest()
+
+    @staticmethod
+    def node_hash(left: bytes, right: bytes) -> bytes:
+        """Hash of an inner node, from the hashes of its children."""
+        return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+    @staticmethod
+    def root(leaves: List[bytes]) -> bytes:
+        """Computes the Merkle root.
+
+        Args:
+            leaves (List[bytes]): The hashes of the leaves (leaf_hash), in
+            order. Can't be empty.
+
+        Returns:
+            bytes: The root of the tree.
+        """
+        if len(leaves) == 0:
+            raise ValueError("Can't compute the root of an empty tree")
+
+        level = leaves
+        while len(level) > 1:
+            level = MerkleTree._next_level(level)
+        return level[0]
+
+    @staticmethod
+    def proof(leaves: List[bytes], index: int) -> List[ProofStep]:
+        """Computes the inclusion proof of a leaf.
+
+        Args:
+            leaves (List[bytes]): The hashes of the leaves (leaf_hash), in
+            order.
+            index (int): The index of the leaf to prove.
+
+        Returns:
+            List[ProofStep]: The siblings from the leaf up to the root.
+        """
+        if not 0 <= index < len(leaves):
+            raise IndexError("leaf index out of range")
+
+        steps = []
+        level = leaves
+        while len(level) > 1:
+            sibling = index ^ 1
+            if sibling < len(level):
+                steps.append((sibling < index, level[sibling]))
+
+            level = MerkleTree._next_level(level)
+            index //= 2
+
+        return steps
+
+    @staticmethod
+    def verify(leaf: bytes, proof: List[ProofStep], root: bytes) -> bool:
+        """Checks that a leaf is included in the tree with the given root.
+
+        Args:
+            leaf (bytes): The hash of the leaf (leaf_hash).
+            proof (List[ProofStep]): The proof, from MerkleTree.proof.
+            root (bytes): The Merkle root.
+
+        Returns:
+            bool: True if the proof is valid, False otherwise.
+        """
+        node = leaf
+        for is_left, sibling in proof:
+            if is_left:
+                node = MerkleTree.node_hash(sibling, node)
+            else:
+                node = MerkleTree.node_hash(node, sibling)
+
+        return node == root
+
+    @staticmethod
+    def _next_level(level: List[bytes]) -> List[bytes]:
+        """Hashes the nodes of a level in pairs."""
+        next_level = [
+            MerkleTree.node_hash(level[i], level[i + 1])
+            for i in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2 == 1:
+            next_level.append(level[-1])  # Promoted without a sibling
+        return next_level
@@ -0,0 +1,263 @@
+"""Metrics of the blockchain server.
+
+Counters, gauges and histograms updated at the hot paths of the server
+(transactions, locks, hashing, connections and bytes on the wire), and
+rendered in the Prometheus text format by a small HTTP endpoint, served by its
+own thread on the admin port (--metrics-port).
+
+Updating a metric only takes an uncontended lock and a few additions, and
+rendering is only done when the endpoint is scraped, so the metrics are always
+collected, even when the endpoint is disabled.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import bisect
+import http.server
+import threading
+from typing import Callable, List, Optional, Sequence
+
+# Upper bounds (seconds) of the buckets of the duration histograms
+LATENCY_BUCKETS = (
+    0.00001,
+    0.00005,
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Counter:
+    """Value that only goes up.
+
+    Attributes:
+        name (str): Name of the metric.
+        description (str): Description of the metric.
+    """
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def samples(self) -> List[str]:
+        return [f"{self.name} {self._value}"]
+
+
+class Gauge:
+    """Value that goes up and down, or is read from a function when rendered.
+
+    Attributes:
+        name (str): Name of the metric.
+        description (str): Description of the metric.
+    """
+
+    TYPE = "gauge"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._value = 0
+        self._function: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self._value -= amount
+
+    def set_function(self, function: Callable[[], float]):
+        """Reads the value from function, only when the metrics are rendered."""
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            return self._function()
+        return self._value
+
+    def samples(self) -> List[str]:
+        return [f"{self.name} {self.value}"]
+
+
+class Histogram:
+    """Distribution of observed values, in cumulative buckets.
+
+    Attributes:
+        name (str): Name of the metric.
+        description (str): Description of the metric.
+        buckets (Sequence[float]): Upper bounds of the buckets, increasing.
+    """
+
+    TYPE = "histogram"
+
+    def __init__(
+        self, name: str, description: str, buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # Last one is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            samples.append(f'{self.name}_bucket{{le="{bound}"}} {cumulative}')
+        cumulative += counts[-1]
+        samples.append(f'{self.name}_bucket{{le="+Inf"}} {cumulative}')
+        samples.append(f"{self.name}_sum {total}")
+        samples.append(f"{self.name}_count {cumulative}")
+        return samples
+
+
+class MetricsRegistry:
+    """Set of metrics rendered together.
+
+    Attributes:
+        None
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self._register(Counter(name, description))
+
+    def gauge(self, name: str, description: str) -> Gauge:
+        return self._register(Gauge(name, description))
+
+    def histogram(
+        self, name: str, description: str, buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, description, buckets))
+
+    def render(self) -> str:
+        """Renders every metric in the Prometheus text format."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+
+REGISTRY = MetricsRegistry()
+
+TRANSACTIONS_ACCEPTED = REGISTRY.counter(
+    "minichain_transactions_accepted_total", "Deposits and withdraws accepted."
+)
+TRANSACTIONS_REJECTED = REGISTRY.counter(
+    "minichain_transactions_rejected_total", "Deposits and withdraws rejected."
+)
+LOCK_WAIT = REGISTRY.histogram(
+    "minichain_lock_wait_seconds", "Time waiting for the server's lock."
+)
+HASH_TIME = REGISTRY.histogram(
+    "minichain_hash_seconds", "Time hashing each new block with the tip."
+)
+VALIDATE_TIME = REGISTRY.histogram(
+    "minichain_validate_seconds", "Time validating the newly appended blocks."
+)
+BLOCKS_VALIDATED = REGISTRY.counter(
+    "minichain_blocks_validated_total", "Blocks whose hash was validated."
+)
+REQUEST_LATENCY = REGISTRY.histogram(
+    "minichain_request_seconds", "Time from receiving a message to replying to it."
+)
+ACTIVE_CONNECTIONS = REGISTRY.gauge(
+    "minichain_active_connections", "Open client connections."
+)
+CHAIN_LENGTH = REGISTRY.gauge("minichain_chain_length", "Blocks in the chain.")
+BYTES_RECEIVED = REGISTRY.counter(
+    "minichain_received_bytes_total", "Bytes of the messages received from clients."
+)
+BYTES_SENT = REGISTRY.counter(
+    "minichain_sent_bytes_total", "Bytes of the replies sent to clients."
+)
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    """Answers GET /metrics with the rendered registry."""
+
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes are not logged
+
+
+def serve_metrics(
+    port: int, host: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY
+) -> http.server.ThreadingHTTPServer:
+    """Serves the metrics at http://host:port/metrics, in a daemon thread.
+
+    Returns:
+        http.server.ThreadingHTTPServer: The endpoint, call shutdown to stop
+        it.
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    endpoint = http.server.ThreadingHTTPServer((host, port), handler)
+    endpoint.daemon_threads = True
+
+    thread = threading.Thread(
+        target=endpoint.serve_forever, daemon=True, name="MetricsEndpoint"
+    )
+    thread.start()
+    return endpoint
@@ -0,0 +1,190 @@
+"""Multiplexed requests of many accounts over a single connection.
+
+Besides "name <x>" followed by that client's commands, a connection accepts
+tagged requests, each with its own account and request id:
+
+    @<request_id> <account> <command>
+
+and each one is answered with the same id, "@<request_id> <reply>". A
+gateway serving many accounts can then send all of them over a few
+connections instead of one connection per account.
+
+The requests of each account are answered in order, but the requests of
+different accounts run concurrently on a shared pool of worker threads, so
+their replies can arrive in any order: the client matches them by id. The
+replies to the requests of an account queued together are sent together.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+
+from models.network_node import ReplyWriter
+from models.operation import Operation
+from models import metrics
+
+# Imports Server only during static type checking (not at runtime) to avoid
+# circular dependency.
+if TYPE_CHECKING:
+    from models.server import Server, ClientSession
+
+TAG = "@"  # First character of a tagged request
+MUX_WORKERS = 32  # Threads answering the tagged requests of all connections
+# Commands bound to the connection, not allowed in a tagged request
+UNTAGGABLE = (Operation.NAME, Operation.QUIT)
+
+logger = logging.getLogger(__name__)
+
+
+class Multiplexer:
+    """Answers the tagged requests received by one connection.
+
+    Attributes:
+        server (Server): The server with the blockchain.
+        lock (threading.Lock): Lock to protect the server's shared state.
+        writer (Optional[ReplyWriter]): Writer of the connection, shared
+        with the replies to its untagged messages. Only needed by submit.
+        executor (Optional[Executor]): Runs the requests concurrently. If
+        None, each request is answered before submit returns.
+    """
+
+    def __init__(
+        self,
+        server: Server,
+        lock: threading.Lock,
+        writer: Optional[ReplyWriter] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.server = server
+        self.lock = lock
+        self.writer = writer
+        self.executor = executor
+
+        self._sessions: Dict[str, ClientSession] = {}
+        # Requests of each account waiting for its running request, only
+        # while one is running
+        self._queues: Dict[str, Deque[Tuple[str, str, float]]] = {}
+        self._in_flight = 0
+        self._idle = threading.Condition()
+
+    @staticmethod
+    def is_tagged(message: str) -> bool:
+        return message.startswith(TAG)
+
+    def handle(self, message: str) -> str:
+        """Answers a tagged request.
+
+        Args:
+            message (str): The request, "@<request_id> <account> <command>".
+
+        Returns:
+            str: The reply, "@<request_id> <reply>".
+        """
+        parts = message[len(TAG) :].split(maxsplit=2)
+        if len(parts) < 3:
+            tag = parts[0] if len(parts) > 0 else ""
+            return f"{TAG}{tag} Malformed request: @<id> <account> <command>"
+
+        (tag, account, command) = parts
+        return f"{TAG}{tag} {self._answer(account, command)}"
+
+    def submit(self, message: str, received_at: float):
+        """Answers a tagged request, concurrently if there's an executor.
+
+        The reply is sent when it's ready. Requests of the same account are
+        answered in the order they were submitted.
+
+        Args:
+            message (str): The request, "@<request_id> <account> <command>".
+            received_at (float): When it was received (time.perf_counter).
+        """
+        parts = message[len(TAG) :].split(maxsplit=2)
+        if self.executor is None or len(parts) < 3:
+            metrics.BYTES_SENT.inc(self.writer.send(self.handle(message)))
+            metrics.REQUEST_LATENCY.observe(time.perf_counter() - received_at)
+            return
+
+        (tag, account, command) = parts
+        with self._idle:
+            self._in_flight += 1
+
+            queue = self._queues.get(account)
+            if queue is not None:
+                # Runs after the account's running request
+                queue.append((tag, command, received_at))
+                return
+
+            self._queues[account] = deque([(tag, command, received_at)])
+
+        self.executor.submit(self._run, account)
+
+    def close(self):
+        """Waits for the requests in flight, then releases their accounts."""
+        with self._idle:
+            self._idle.wait_for(lambda: self._in_flight == 0)
+
+        for session in self._sessions.values():
+            self.server.close_session(session)
+        self._sessions.clear()
+
+    def _run(self, account: str):
+        """Answers the queued requests of an account, in order.
+
+        The replies are queued in the writer, and sent once the account has
+        no more queued requests.
+        """
+        unsent: List[float] = []  # When the queued replies were received
+        while True:
+            with self._idle:
+                queue = self._queues[account]
+                if len(queue) == 0:
+                    del self._queues[account]
+                    return
+                (tag, command, received_at) = queue.popleft()
+                is_last = len(queue) == 0
+
+            try:
+                reply = self._answer(account, command)
+            except Exception as e:
+                logger.exception("Error answering %s: %s", account, e)
+                reply = "Internal error"
+
+            try:
+                metrics.BYTES_SENT.inc(self.writer.write(f"{TAG}{tag} {reply}"))
+                unsent.append(received_at)
+                if is_last:
+                    # Before the request counts as done, so close finds it sent
+                    metrics.BYTES_SENT.inc(self.writer.flush())
+                    sent_at = time.perf_counter()
+                    for received_at in unsent:
+                        metrics.REQUEST_LATENCY.observe(sent_at - received_at)
+                    unsent = []
+            except OSError:
+                unsent = []  # Connection closed, the replies are lost
+
+            with self._idle:
+                self._in_flight -= 1
+                if self._in_flight == 0:
+                    self._idle.notify_all()
+
+    def _answer(self, account: str, command: str) -> str:
+        """Processes the command of an account, as if sent after its name."""
+        commands = self.server.parse_commands(command)
+        if any(operation in UNTAGGABLE for (operation, _) in commands):
+            return "Not allowed in a tagged request"
+
+        session = self._sessions.get(account)
+        if session is None:
+            session = self.server.open_session(account)
+            self._sessions[account] = session
+
+        reply = self.server.handle_commands(session, commands, self.lock)
+        return reply if reply is not None else "ok"
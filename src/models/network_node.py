@@ -1,19 +1,305 @@
 """Base class for network nodes in the blockchain system.
 
 Provides common TCP socket functionality for both server and client nodes,
-including message sending/receiving with newline delimiters, message parsing,
-and network utilities. Serves as the foundation for Server and Client classes.
+including message sending/receiving with newline delimiters, a buffered reader
+that splits the received bytes in complete messages, a writer that coalesces
+the replies to a connection into a single scatter/gather send, message
+parsing through a table of the commands, and network utilities. Serves as
+the foundation for Server and Client classes.
 
 Authors: Andre Grassi de Jesus, Ricardo Faria
-Last Modified: Nov. 14 2025
+Last Modified: Oct. 18 2026
 """
 
 import socket
-from typing import Optional
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
 
 from models.operation import Operation
+from models.amount import parse_amount
 
 BUFFER_SIZE = 1024
+MAX_FRAME_SIZE = 16 * 1024  # Longest message accepted, without the delimiter
+DELIMITER = b"\n"
+FLUSH_SIZE = 64 * 1024  # Queued bytes that make a ReplyWriter send them
+MAX_BUFFERS = 1024  # Buffers of a single sendmsg (IOV_MAX on Linux)
+
+COMMAND_SEPARATOR = ";"  # Separates the commands of a single message
+GOODBYE_MESSAGE = "Server shutting down connection."  # Last message, never a reply
+
+Frame = TypeVar("Frame")
+Command = Tuple[Optional[Operation], Any]  # (action, data) of a message
+INVALID: Command = (None, None)  # Parsed from any malformed message
+
+
+class FrameTooLargeError(ValueError):
+    """Raised when a message is longer than the maximum frame size."""
+
+
+class FrameReader:
+    """Reads newline-delimited messages (frames) from a connection.
+
+    A single recv may return part of a message, or many messages. The bytes
+    are received into a buffer allocated once, and only complete frames are
+    returned, the rest stays buffered until the next recv. Since frames are
+    only cut at the delimiter, a multi-byte UTF-8 character is never split.
+
+    Attributes:
+        connection (socket): The connection to read from.
+        max_frame_size (int): Longest frame accepted.
+        received (int): Bytes received by the last recv.
+    """
+
+    def __init__(
+        self,
+        connection: socket.socket,
+        buffer_size: int = BUFFER_SIZE,
+        max_frame_size: int = MAX_FRAME_SIZE,
+    ):
+        self.connection = connection
+        self.max_frame_size = max_frame_size
+
+        self._recv_size = buffer_size
+        # Room for a whole frame, its delimiter and the next recv
+        self._buffer = bytearray(max_frame_size + 1 + buffer_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0  # Start of the first incomplete frame
+        self._end = 0  # End of the received bytes
+        self.received = 0
+
+    def recv_frames(self) -> Optional[List[bytes]]:
+        """Receives from the connection and returns the complete frames.
+
+        Blocks like recv, and raises the same exceptions (e.g. on timeout).
+
+        Returns:
+            Optional[List[bytes]]: The frames, without the delimiter. Can be
+            empty if no frame was completed. None if the connection was
+            closed.
+
+        Raises:
+            FrameTooLargeError: If a frame is longer than max_frame_size.
+        """
+        return self._recv(bytes)
+
+    def recv_messages(self) -> Optional[List[str]]:
+        """Like recv_frames, but returns the frames decoded as UTF-8.
+
+        Each message is decoded straight from the receive buffer, without
+        copying its frame to a bytes object first. Invalid UTF-8 is replaced.
+        """
+        return self._recv(_decode)
+
+    def _recv(self, convert: Callable[[memoryview], Frame]) -> Optional[List[Frame]]:
+        """Receives and returns the complete frames, converted by convert."""
+        if len(self._buffer) - self._end < self._recv_size:
+            # Move the incomplete frame to the start, to free the tail
+            pending = self._end - self._start
+            self._view[:pending] = self._view[self._start : self._end]
+            self._start = 0
+            self._end = pending
+
+        received = self.connection.recv_into(self._view[self._end :])
+        self.received = received
+        if received == 0:
+            return None
+
+        scan = self._end
+        self._end += received
+
+        frames = []
+        while True:
+            delimiter = self._buffer.find(b"\n", scan, self._end)
+            if delimiter == -1:
+                break
+            if delimiter - self._start > self.max_frame_size:
+                raise FrameTooLargeError(
+                    f"Message longer than {self.max_frame_size} bytes"
+                )
+
+            frames.append(convert(self._view[self._start : delimiter]))
+            self._start = delimiter + 1
+            scan = self._start
+
+        if self._start == self._end:
+            self._start = self._end = 0  # Everything consumed
+
+        if self._end - self._start > self.max_frame_size:
+            raise FrameTooLargeError(
+                f"Message longer than {self.max_frame_size} bytes"
+            )
+
+        return frames
+
+
+def _decode(frame: memoryview) -> str:
+    return str(frame, "utf-8", "replace")
+
+
+def append_message(buffers: List[bytes], message: str) -> int:
+    """Appends a message and its delimiter to buffers for send_buffers.
+
+    Returns:
+        int: Their size in bytes.
+    """
+    data = message.encode("utf-8")
+    if len(data) > 0:  # Empty buffers are not sent
+        buffers.append(data)
+    buffers.append(DELIMITER)  # Shared, not concatenated to each message
+    return len(data) + len(DELIMITER)
+
+
+def send_buffers(
+    connection: socket.socket, buffers: Sequence[Union[bytes, memoryview]]
+) -> int:
+    """Sends all the buffers, in order, with scatter/gather I/O.
+
+    Like sendall of the buffers joined, but without joining them: each
+    sendmsg takes up to MAX_BUFFERS of them, so a few hundred replies cost a
+    single syscall. Empty buffers are not allowed.
+
+    Returns:
+        int: The number of bytes sent.
+    """
+    if not hasattr(connection, "sendmsg"):
+        # No scatter/gather I/O on this platform
+        data = b"".join(buffers)
+        connection.sendall(data)
+        return len(data)
+
+    buffers = list(buffers)
+    total = 0
+    index = 0
+    while index < len(buffers):
+        sent = connection.sendmsg(buffers[index : index + MAX_BUFFERS])
+        total += sent
+
+        # Skip the buffers sent whole, keep the rest of a partially sent one
+        while sent > 0:
+            size = len(buffers[index])
+            if sent < size:
+                buffers[index] = memoryview(buffers[index])[sent:]
+                break
+            sent -= size
+            index += 1
+
+    return total
+
+
+class ReplyWriter:
+    """Coalesces the replies to a connection into a single send.
+
+    Replies are queued, already encoded, as they are produced, and flush
+    sends all the queued ones with send_buffers. A server answering the
+    messages received by one recv then makes a single send syscall, however
+    many messages there were. Thread safe: replies may be written by other
+    threads, each one is sent whole and in the order it was written.
+
+    Attributes:
+        connection (socket): The connection to write to.
+        flush_size (int): Queued bytes that make write flush them.
+    """
+
+    def __init__(self, connection: socket.socket, flush_size: int = FLUSH_SIZE):
+        self.connection = connection
+        self.flush_size = flush_size
+
+        self._buffers: List[bytes] = []
+        self._queued = 0  # Bytes in _buffers
+        self._lock = threading.Lock()
+
+    def write(self, message: str) -> int:
+        """Queues a message, followed by the delimiter.
+
+        Returns:
+            int: Bytes sent, if the queue reached flush_size and was flushed,
+            0 otherwise.
+        """
+        with self._lock:
+            self._queued += append_message(self._buffers, message)
+
+            if self._queued < self.flush_size:
+                return 0
+            return self._flush()
+
+    def write_bytes(self, data: bytes) -> int:
+        """Queues data as is, e.g. a frame of the binary protocol.
+
+        Returns:
+            int: Bytes sent, like write.
+        """
+        with self._lock:
+            if len(data) > 0:
+                self._buffers.append(data)
+                self._queued += len(data)
+
+            if self._queued < self.flush_size:
+                return 0
+            return self._flush()
+
+    def flush(self) -> int:
+        """Sends the queued data.
+
+        Returns:
+            int: The number of bytes sent.
+        """
+        with self._lock:
+            return self._flush()
+
+    def send(self, message: str) -> int:
+        """Queues a message and sends it, with the data queued before it.
+
+        Returns:
+            int: The number of bytes sent.
+        """
+        with self._lock:
+            append_message(self._buffers, message)
+            return self._flush()
+
+    def _flush(self) -> int:
+        """Sends the queued data. Needs the lock."""
+        if len(self._buffers) == 0:
+            return 0
+
+        (buffers, self._buffers, self._queued) = (self._buffers, [], 0)
+        return send_buffers(self.connection, buffers)
+
+
+def _no_argument(argument: Optional[str]) -> None:
+    if argument is not None:
+        raise ValueError("Unexpected argument")
+    return None
+
+
+def _required(argument: Optional[str]) -> str:
+    if argument is None:
+        raise ValueError("Missing argument")
+    return argument
+
+
+def _amount(argument: Optional[str]) -> int:
+    return parse_amount(_required(argument))
+
+
+def _page(argument: Optional[str]) -> int:
+    return 1 if argument is None else int(argument)
+
+
+def _transaction(argument: Optional[str]) -> Optional[int]:
+    return None if argument is None else int(argument)
+
+
+# Parser of the argument of each command, which raises ValueError if invalid
+COMMANDS: Dict[str, Tuple[Operation, Callable[[Optional[str]], Any]]] = {
+    Operation.QUIT.value: (Operation.QUIT, _no_argument),
+    Operation.NAME.value: (Operation.NAME, _required),
+    Operation.DEPOSIT.value: (Operation.DEPOSIT, _amount),
+    Operation.WITHDRAW.value: (Operation.WITHDRAW, _amount),
+    Operation.PROOF.value: (Operation.PROOF, _transaction),
+    Operation.BALANCE.value: (Operation.BALANCE, _no_argument),
+    Operation.HISTORY.value: (Operation.HISTORY, _page),
+    Operation.TIP.value: (Operation.TIP, _no_argument),
+}
 
 
 class NetworkNode:
@@ -24,15 +310,34 @@ class NetworkNode:
     Attributes:
         socket (socket): The socket, using TCP/IP and Internet.
         buffer_size (int): Default value is 1024.
+        max_frame_size (int): Longest message accepted from a connection.
     """
 
-    def __init__(self, buffer_size: Optional[int] = BUFFER_SIZE):
+    def __init__(
+        self,
+        buffer_size: Optional[int] = BUFFER_SIZE,
+        max_frame_size: Optional[int] = MAX_FRAME_SIZE,
+    ):
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.buffer_size = buffer_size
+        self.max_frame_size = max_frame_size
+
+    def frame_reader(self, connection: socket.socket) -> FrameReader:
+        """Creates a reader of the messages received from a connection."""
+        return FrameReader(connection, self.buffer_size, self.max_frame_size)
+
+    def send_str(self, connection: socket.socket, message: str) -> int:
+        """Sends a message, returns the number of bytes sent."""
+        buffers = []
+        append_message(buffers, message)
+        return send_buffers(connection, buffers)
 
-    def send_str(self, connection: socket.socket, message: str):
-        message += "\n"  # Used as delimiter
-        connection.sendall(message.encode("utf-8"))
+    def send_strs(self, connection: socket.socket, messages: List[str]) -> int:
+        """Sends many messages with a single send, returns the bytes sent."""
+        buffers = []
+        for message in messages:
+            append_message(buffers, message)
+        return send_buffers(connection, buffers)
 
     def send_bytes(self, connection: socket.socket, message: bytes):
         message += b"\n"  # Used as delimiter
@@ -56,59 +361,60 @@ class NetworkNode:
         except OSError:
             pass
 
-    def parse_message(self, message: str):
+    def parse_message(self, message: str) -> Command:
         """Retrieves the info from the message.
 
+        The command is looked up in COMMANDS, and its argument converted by
+        the parser registered for it, so the message is split once and no
+        command is compared with any other.
+
         Args:
             message (str): The message, that can be:
                 1. q: to close communication
                 2. name <client_name>: to inform the client's name to server
-                3. deposit <amount>: to deposit money
+                3. deposit <amount>: to deposit money, in minicoins with up
+                to 6 decimal places
                 4. withdraw <amount>: to withdraw money
+                5. proof [<n>]: inclusion proof of the client's n-th
+                transaction (default: the latest)
+                6. balance: the client's committed balance
+                7. history [<page>]: a page of the client's transactions,
+                newest first (default: the first page)
+                8. tip: height and hash of the last committed block
 
         Returns:
-            (action, data)
-
+            (action, data), or INVALID if the message is malformed: an
+            unknown command, a missing, extra or invalid argument.
         """
-        parts = message.strip().split()
-
-        # Check if message has incorrect structure
-        if len(parts) < 1 or len(parts) > 2:
-            return (None, None)
-
-        action = parts[0].lower()
-
-        # Check if the action is recognizable
-        if action not in (
-            Operation.DEPOSIT.value,
-            Operation.WITHDRAW.value,
-            Operation.NAME.value,
-            Operation.QUIT.value,
-        ):
-            return (None, None)
-
-        if action == Operation.QUIT.value:
-            return (Operation.QUIT, 0)
+        parts = message.split()
+        if len(parts) == 0 or len(parts) > 2:
+            return INVALID
 
-        elif action == Operation.NAME.value:
-            name = parts[1]
-            return (Operation.NAME, name)
+        action = parts[0]
+        entry = COMMANDS.get(action) or COMMANDS.get(action.lower())
+        if entry is None:
+            return INVALID
 
-        amount_s = parts[1]
-
-        # Try to convert string amount to float
+        (operation, parse_argument) = entry
         try:
-            amount = float(amount_s)
+            return (operation, parse_argument(parts[1] if len(parts) > 1 else None))
         except ValueError:
-            return None
+            return INVALID
+
+    def parse_commands(self, message: str) -> List[Command]:
+        """Retrieves the info of every command of a message.
 
-        # Return correct operation according to action
-        if action == "deposit":
-            return (Operation.DEPOSIT, amount)
-        elif action == "withdraw":
-            return (Operation.WITHDRAW, amount)
+        A message may carry many commands separated by COMMAND_SEPARATOR,
+        e.g. "deposit 10; withdraw 2.5; balance".
 
-        raise RuntimeError("Unknown error while parsing message")
+        Returns:
+            List[(action, data)]: Each command parsed by parse_message, in
+            order.
+        """
+        return [
+            self.parse_message(command)
+            for command in message.split(COMMAND_SEPARATOR)
+        ]
 
     def _get_own_ip(self) -> str:
         """Gets the local IP address of the node.
@@ -1,8 +1,11 @@
 """Operation enumeration for blockchain transactions.
 
 Defines the types of operations clients can perform: DEPOSIT (add minicoins),
-WITHDRAW (remove minicoins), NAME (register client identity), and QUIT
-(close connection). Used for message parsing and transaction validation.
+WITHDRAW (remove minicoins), NAME (register client identity), PROOF (request
+the inclusion proof of a batched transaction), the read-only queries BALANCE,
+HISTORY and TIP, and QUIT (close connection). Used for message parsing and
+transaction validation. Each operation also has a numeric code, used in the
+binary encodings.
 
 Authors: Andre Grassi de Jesus, Ricardo Faria
 Last Modified: Nov. 14 2025
@@ -18,3 +21,43 @@ class Operation(Enum):
     WITHDRAW = "withdraw"
     QUIT = "q"
     NAME = "name"  # Operation that informs the server of the client's name
+    PROOF = "proof"  # Inclusion proof of a transaction of the client
+    BALANCE = "balance"  # Committed balance of the client
+    HISTORY = "history"  # Page of the client's committed transactions
+    TIP = "tip"  # Height and hash of the last committed block
+
+    @property
+    def is_query(self) -> bool:
+        """If the operation only reads the committed state of the chain."""
+        return self in (Operation.BALANCE, Operation.HISTORY, Operation.TIP)
+
+    @property
+    def code(self) -> int:
+        """Numeric code of the operation, used in binary encodings."""
+        return _CODES[self]
+
+    @staticmethod
+    def from_code(code: int) -> "Operation":
+        """Gets the operation with the numeric code.
+
+        Raises:
+            ValueError: If there's no operation with the code.
+        """
+        try:
+            return _OPERATIONS[code]
+        except KeyError:
+            raise ValueError(f"Unknown operation code: {code}") from None
+
+
+# Codes are stored in persisted chains, so they must never change
+_CODES = {
+    Operation.DEPOSIT: 0,
+    Operation.WITHDRAW: 1,
+    Operation.QUIT: 2,
+    Operation.NAME: 3,
+    Operation.PROOF: 4,
+    Operation.BALANCE: 5,
+    Operation.HISTORY: 6,
+    Operation.TIP: 7,
+}
+_OPERATIONS = {code: operation for operation, code in _CODES.items()}
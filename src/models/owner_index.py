@@ -0,0 +1,132 @@
+"""Per-owner index of the blocks in the blockchain.
+
+Maps each owner to the positions of their blocks in the chain, their first
+deposit (the AccCreationBlock) and the date their account was created. Answers
+whether a client is new, the history of a client and when their account was
+created without walking the whole blockchain. Kept consistent by the server
+as blocks are appended to or popped from the chain.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from models.block import Block
+from models.acc_creation_block import AccCreationBlock
+
+
+class OwnerRecord:
+    """Blocks of a single owner in the blockchain.
+
+    Attributes:
+        positions (List[int]): Indexes, in the chain, of the owner's blocks,
+        in increasing order. A batched block appears once per transaction of
+        the owner in it.
+        first_deposit (Optional[int]): Index of the owner's AccCreationBlock,
+        None if the owner has no account yet.
+        creation_date (Optional[datetime]): The date (UTC) that the owner's
+        account was created, None if the owner has no account yet.
+    """
+
+    def __init__(self):
+        self.positions: List[int] = []
+        self.first_deposit: Optional[int] = None
+        self.creation_date: Optional[datetime] = None
+
+
+class OwnerIndex:
+    """Index of the blocks of each owner of the blockchain.
+
+    Must be kept consistent with the chain: add every appended block and
+    remove every popped block, in the same order.
+
+    Attributes:
+        records (Dict[str, OwnerRecord]): The blocks of each owner, indexed
+        by the owner's name.
+    """
+
+    def __init__(self):
+        self.records: Dict[str, OwnerRecord] = {}
+
+    def is_new_account(self, owner_name: str) -> bool:
+        """Checks if the owner has no blocks in the chain yet."""
+        record = self.records.get(owner_name)
+        return record is None or len(record.positions) == 0
+
+    def history(self, owner_name: str) -> List[int]:
+        """Gets the indexes, in the chain, of the owner's blocks.
+
+        Args:
+            owner_name (str): The name of the owner.
+
+        Returns:
+            List[int]: Copy of the indexes of the owner's blocks, in order.
+        """
+        record = self.records.get(owner_name)
+        if record is None:
+            return []
+        return list(record.positions)
+
+    def creation_date(self, owner_name: str) -> Optional[datetime]:
+        """Gets the date (UTC) that the owner's account was created.
+
+        Returns:
+            Optional[datetime]: The date, None if the owner has no account.
+        """
+        record = self.records.get(owner_name)
+        if record is None:
+            return None
+        return record.creation_date
+
+    def add(self, block: Block, position: int):
+        """Indexes a block appended to the chain.
+
+        Args:
+            block (Block): The block appended to the chain.
+            position (int): The index of the block in the chain.
+        """
+        for entry in block.entries():
+            record = self.records.get(entry.owner_name)
+            if record is None:
+                record = OwnerRecord()
+                self.records[entry.owner_name] = record
+
+            record.positions.append(position)
+
+            if isinstance(entry, AccCreationBlock) and record.first_deposit is None:
+                record.first_deposit = position
+                record.creation_date = entry.date
+
+    def remove(self, block: Block, position: int):
+        """Removes a block popped from the chain from the index.
+
+        The block must be the last indexed block of its owners.
+
+        Args:
+            block (Block): The block popped from the chain.
+            position (int): The index the block had in the chain.
+        """
+        for entry in reversed(block.entries()):
+            record = self.records[entry.owner_name]
+            record.positions.pop()
+
+            if record.first_deposit == position and isinstance(
+                entry, AccCreationBlock
+            ):
+                record.first_deposit = None
+                record.creation_date = None
+
+            if len(record.positions) == 0:
+                del self.records[entry.owner_name]
+
+    def rebuild(self, block_chain: Iterable[Block]):
+        """Recomputes the index from the blocks of a chain.
+
+        Args:
+            block_chain (Iterable[Block]): The blocks, from genesis.
+        """
+        self.records = {}
+        for position, block in enumerate(block_chain):
+            self.add(block, position)
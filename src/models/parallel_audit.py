@@ -0,0 +1,252 @@
+"""Parallel full audit of the blockchain's hashes.
+
+The hash of a block depends only on its own encoding and on the stored hash
+of its predecessor, which is known without validating the predecessor first.
+So the blocks can be checked independently: the chain is split in chunks and
+each chunk is audited by a process of a pool.
+
+The blocks are laid out once in shared memory, in the records format of the
+chain log (ChainStore), and the workers hash them in place. A chain log is
+read straight into the shared memory, without decoding it. Blocks of binary
+chains are hashed from their stored encoding, without decoding either.
+
+Reports the first invalid block exactly as Hash.validate_blockchain_hash does.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple
+
+from models.block import Block, BlockEncoding, record_version
+from models.batch_block import BatchBlock
+from models.block_codec import decode_block
+from models.chain_store import ChainStore, read_header, record_at
+
+CHUNK_SIZE = 16384  # Blocks audited by a worker at a time
+
+# (index of the first block, offset of the predecessor's record or -1 for the
+# genesis, offset of the first record, number of blocks)
+AuditTask = Tuple[int, int, int, int]
+
+# State of each worker process, set by _init_worker
+_shared: Optional[shared_memory.SharedMemory] = None
+_encoding: Optional[BlockEncoding] = None
+
+
+class ParallelAudit:
+    """Audits the hashes of the whole blockchain with a process pool.
+
+    Attributes:
+        None
+    """
+
+    @staticmethod
+    def audit_chain(
+        block_chain: Sequence[Block],
+        encoding: BlockEncoding,
+        workers: Optional[int] = None,
+    ) -> Optional[int]:
+        """Audits the blocks of a chain in memory.
+
+        Args:
+            block_chain (Sequence[Block]): The blocks, from genesis, with
+            their hashes.
+            encoding (BlockEncoding): Encoding used to hash the chain.
+            workers (Optional[int]): Number of processes, default one per CPU.
+
+        Returns:
+            Optional[int]: Index of the first invalid block, None if all the
+            blocks are valid.
+        """
+        records = b"".join(
+            ChainStore.encode_record(block, encoding) for block in block_chain
+        )
+        size = len(records)
+
+        shared = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            shared.buf[:size] = records
+            del records
+
+            (_, first_invalid) = ParallelAudit._audit_shared(
+                shared, size, encoding, workers
+            )
+            return first_invalid
+        finally:
+            shared.close()
+            shared.unlink()
+
+    @staticmethod
+    def audit_log(
+        path: str, workers: Optional[int] = None
+    ) -> Tuple[int, Optional[int]]:
+        """Audits a persisted chain, without loading it.
+
+        The file is only read. An incomplete record at the end, left by an
+        interrupted write, is not audited.
+
+        Args:
+            path (str): Path of the chain log (ChainStore).
+            workers (Optional[int]): Number of processes, default one per CPU.
+
+        Returns:
+            The number of complete blocks in the log and the index of the
+            first invalid block, None if all are valid: (int, Optional[int])
+
+        Raises:
+            ValueError: If the file is not a chain log of the current version.
+        """
+        with open(path, "rb") as log:
+            (version, encoding) = read_header(log)
+            if version == 1:
+                raise ValueError(
+                    "Old chain log version, start the server once to upgrade it"
+                )
+
+            size = os.fstat(log.fileno()).st_size - log.tell()
+            shared = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            try:
+                log.readinto(shared.buf[:size])
+                return ParallelAudit._audit_shared(shared, size, encoding, workers)
+            finally:
+                shared.close()
+                shared.unlink()
+
+    @staticmethod
+    def _audit_shared(
+        shared: shared_memory.SharedMemory,
+        size: int,
+        encoding: BlockEncoding,
+        workers: Optional[int],
+    ) -> Tuple[int, Optional[int]]:
+        """Audits the records in the first size bytes of shared.
+
+        Returns:
+            The number of complete records and the index of the first invalid
+            block: (int, Optional[int])
+        """
+        buffer = shared.buf[:size]
+        try:
+            tasks = ParallelAudit._split(buffer)
+        finally:
+            buffer.release()
+
+        count = sum(task[3] for task in tasks)
+        if count == 0:
+            return (0, None)
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shared.name, encoding),
+        ) as pool:
+            # In chain order, so the first invalid one found is the first one
+            for first_invalid in pool.map(_audit_chunk, tasks):
+                if first_invalid is not None:
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    return (count, first_invalid)
+
+        return (count, None)
+
+    @staticmethod
+    def _split(buffer: memoryview) -> List[AuditTask]:
+        """Splits the complete records of buffer in chunks of CHUNK_SIZE."""
+        tasks = []
+        index = 0
+        prev_offset = -1
+        offset = 0
+        chunk_start = (0, -1, 0)
+        while True:
+            (hash_b, _, end) = record_at(buffer, offset)
+            if hash_b is None:
+                break
+
+            index += 1
+            prev_offset = offset
+            offset = end
+
+            if index - chunk_start[0] == CHUNK_SIZE:
+                tasks.append(chunk_start + (CHUNK_SIZE,))
+                chunk_start = (index, prev_offset, offset)
+
+        if index > chunk_start[0]:
+            tasks.append(chunk_start + (index - chunk_start[0],))
+
+        return tasks
+
+
+def _init_worker(name: str, encoding: BlockEncoding):
+    """Attaches a worker process to the shared records."""
+    global _shared, _encoding
+    _shared = shared_memory.SharedMemory(name=name)
+    _encoding = encoding
+
+
+def _audit_chunk(task: AuditTask) -> Optional[int]:
+    """Audits a chunk of blocks in a worker process.
+
+    Returns:
+        Optional[int]: Index of the first invalid block of the chunk, None if
+        all of them are valid.
+    """
+    (first_index, prev_offset, offset, count) = task
+    buffer = _shared.buf
+
+    prev_hash = None
+    if prev_offset >= 0:
+        (prev_hash, _, _) = record_at(buffer, prev_offset)
+
+    for index in range(first_index, first_index + count):
+        (hash_b, start, end) = record_at(buffer, offset)
+
+        payload = _hash_payload(buffer, start, end)
+        if payload is None:
+            return index
+
+        hash_obj = hashlib.sha256()
+        if prev_hash is not None:
+            hash_obj.update(prev_hash)
+        hash_obj.update(payload)
+
+        if hash_obj.digest() != hash_b:
+            return index
+
+        prev_hash = hash_b
+        offset = end
+
+    return None
+
+
+def _hash_payload(buffer: memoryview, start: int, end: int) -> Optional[bytes]:
+    """Gets the encoding that goes into the hash of the block in [start, end).
+
+    Returns:
+        Optional[bytes]: The encoding, None if the block can't be decoded or
+        is a batch whose Merkle root doesn't match its transactions.
+    """
+    if end - start < 2:
+        return None  # Not even the version and kind of a block
+
+    (version, kind) = (buffer[start], buffer[start + 1])
+    if (
+        _encoding != BlockEncoding.JSON
+        and version == record_version(_encoding)
+        and kind != BatchBlock.KIND
+    ):
+        # Hashed as stored
+        return buffer[start:end]
+
+    try:
+        (block, block_end) = decode_block(buffer, start)
+    except ValueError:
+        return None  # Corrupted record, invalid like a wrong hash
+    if block_end != end:
+        return None
+    if isinstance(block, BatchBlock) and not block.has_valid_root():
+        return None
+    return block.serialize(_encoding)
@@ -0,0 +1,73 @@
+"""Read-only view of the committed state of the blockchain.
+
+The server publishes a new view after every commit, while it holds the write
+lock, and readers (balance, history and tip queries) use the latest published
+view without taking the lock. A view is never modified after it's published,
+so a reader always sees the state of a single commit.
+
+Balances are copy-on-write: a view shares the balances of the previous one
+and only keeps a small dict with the balances changed since. The changes are
+folded into a new copy of the shared balances once there are about sqrt(n) of
+them, so publishing a view costs O(sqrt(n)) for n accounts, amortized.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import math
+from typing import Dict, Optional
+
+FOLD_MIN = 1024  # Changed balances always kept apart from the shared ones
+
+
+class ReadView:
+    """Committed state of the blockchain, immutable once published.
+
+    Attributes:
+        height (int): Number of committed blocks.
+        tip_hash (Optional[bytes]): Hash of the last committed block, None
+        if the chain is empty.
+    """
+
+    def __init__(
+        self,
+        height: int,
+        tip_hash: Optional[bytes],
+        balances: Dict[str, int],
+        changes: Optional[Dict[str, int]] = None,
+    ):
+        self.height = height
+        self.tip_hash = tip_hash
+
+        self._balances = balances  # Shared with other views, never modified
+        self._changes = changes if changes is not None else {}
+
+    def balance(self, client_name: str) -> int:
+        """Gets the committed balance of a client, 0 if they have no blocks."""
+        balance = self._changes.get(client_name)
+        if balance is None:
+            balance = self._balances.get(client_name, 0)
+        return balance
+
+    def advance(
+        self, height: int, tip_hash: Optional[bytes], changes: Dict[str, int]
+    ) -> "ReadView":
+        """Creates the view of a later commit.
+
+        Args:
+            height (int): Number of committed blocks.
+            tip_hash (Optional[bytes]): Hash of the last committed block.
+            changes (Dict[str, int]): Balances changed since this view.
+
+        Returns:
+            ReadView: The new view, this one is not modified.
+        """
+        all_changes = dict(self._changes)
+        all_changes.update(changes)
+
+        if len(all_changes) <= max(FOLD_MIN, math.isqrt(len(self._balances))):
+            return ReadView(height, tip_hash, self._balances, all_changes)
+
+        balances = dict(self._balances)
+        balances.update(all_changes)
+        return ReadView(height, tip_hash, balances)
@@ -10,15 +10,71 @@ Authors: Andre Grassi de Jesus, Ricardo Faria
 Last Modified: Nov. 14 2025
 """
 
+import bisect
+import logging
+import math
 import socket
-from typing import List
+import time
+from concurrent.futures import Executor
+from typing import List, Optional, Set, Tuple
 import threading
 
-from models.network_node import NetworkNode
+from models.network_node import (
+    NetworkNode,
+    FrameReader,
+    FrameTooLargeError,
+    ReplyWriter,
+    Command,
+    COMMAND_SEPARATOR,
+    GOODBYE_MESSAGE,
+)
 from models.operation import Operation
 from models.transaction_handler import Transaction
-from models.block import Block
+from models.block import Block, BlockEncoding
+from models.amount import format_amount
+from models.batch_block import BatchBlock
 from models.hash import Hash
+from models.balance_ledger import BalanceLedger
+from models.owner_index import OwnerIndex
+from models.chain_store import ChainStore
+from models.columnar_chain import ColumnarChain, hash_at
+from models.group_committer import GroupCommitter
+from models.checkpoint import Checkpoint, CheckpointStore, CHECKPOINT_EVERY, SUFFIX
+from models.read_view import ReadView
+from models.account_locks import AccountLocks
+from models.account_registry import AccountRegistry
+from models.multiplexer import Multiplexer
+from models.wire_protocol import (
+    WireProtocol,
+    LengthPrefixedReader,
+    Status,
+    HELLO,
+    MAGIC,
+    LENGTH,
+    BALANCE_PAYLOAD,
+    TIP_PAYLOAD,
+)
+from models import metrics
+
+HISTORY_PAGE = 10  # Transactions in each page of a history query
+
+logger = logging.getLogger(__name__)
+
+
+class ClientSession:
+    """State of the connection with a single client.
+
+    Attributes:
+        client_name (Optional[str]): Name sent by the client, None until the
+        client sends it.
+        is_open (bool): False after the client asks to quit.
+        accounts (Set[str]): Accounts of the client's binary requests.
+    """
+
+    def __init__(self):
+        self.client_name: Optional[str] = None
+        self.is_open = True
+        self.accounts: Set[str] = set()
 
 
 class Server(NetworkNode):
@@ -31,21 +87,636 @@ class Server(NetworkNode):
         ip (str): IP address of the server
         port (int): Port that the server is running
         block_chain (List[Block]): List of the blocks that constitutes the
-        blockchain
-        client_ids (List[str]): List of names of clients that sent messages
+        blockchain. A ColumnarChain if the server is columnar
+        accounts (AccountRegistry): Accounts of the clients that sent their
+        names.
+        verified_height (int): Number of blocks, from genesis, whose hashes
+        were already validated. Only the blocks after it need to be checked.
+        ledger (BalanceLedger): Current balance of each client, kept
+        consistent with block_chain.
+        owner_index (OwnerIndex): Positions of each owner's blocks in
+        block_chain and the creation date of their accounts.
+        chain_store (Optional[ChainStore]): Persistent log of the blocks, or
+        None to keep the blockchain only in memory.
+        block_encoding (BlockEncoding): Encoding of the blocks used for
+        hashing. Chains persisted with a legacy encoding (JSON or
+        BINARY_FLOAT) keep it.
+        columnar (bool): If the blocks are stored in a ColumnarChain, which
+        uses much less memory than a list of Block objects.
+        committer (Optional[GroupCommitter]): If set, deposits and withdraws
+        are committed in batches by it, instead of one by one by each
+        client's thread.
+        checkpoint_every (int): Blocks between checkpoints, 0 disables them.
+        checkpoint_store (Optional[CheckpointStore]): Sidecar file of
+        chain_store with the latest checkpoint, None without chain_store.
+        checkpoint (Optional[Checkpoint]): Latest checkpoint of the validated
+        chain.
+        read_view (ReadView): Committed state of the chain, that queries read
+        without taking the lock. Replaced, never modified, by commit.
+        account_locks (AccountLocks): Serialize the transactions of each
+        client while they are validated, outside of the server's lock.
+        mux_executor (Optional[Executor]): Runs the tagged requests of all
+        connections concurrently. If None, they are answered in order.
     """
 
-    def __init__(self, port: int):
+    def __init__(
+        self,
+        port: int,
+        chain_store: Optional[ChainStore] = None,
+        columnar: bool = False,
+        checkpoint_every: int = CHECKPOINT_EVERY,
+    ):
         super().__init__()
 
         self.ip = self._get_own_ip()
         self.port = port
-        self.block_chain: List[Block] = []
-        self.client_ids: List[str] = []
+        self.columnar = columnar
+        self.block_chain: List[Block] = self._new_chain()
+        self.accounts = AccountRegistry()
+        self.verified_height = 0
+        self.ledger = BalanceLedger()
+        self.owner_index = OwnerIndex()
+        self.chain_store = chain_store
+
+        self.committer: Optional[GroupCommitter] = None
+        self.mux_executor: Optional[Executor] = None
+
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_store: Optional[CheckpointStore] = None
+        if chain_store is not None:
+            self.checkpoint_store = CheckpointStore(chain_store.path + SUFFIX)
+        self.checkpoint: Optional[Checkpoint] = None
+        # Taken when a multiple of checkpoint_every is reached, saved once
+        # their blocks are validated
+        self._staged_checkpoints: List[Checkpoint] = []
+
+        self.read_view = ReadView(0, None, {})
+        self.account_locks = AccountLocks()
+
+        self.block_encoding = BlockEncoding.BINARY
+        if chain_store is not None:
+            self.block_encoding = chain_store.encoding
 
     def bind_socket(self):
+        # Allow restarting on the same port while old connections linger
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.socket.bind((self.ip, self.port))
 
+    def append_block(self, block: Block):
+        """Appends a block, with its hash already set, to the blockchain.
+
+        Keeps the indexes of the blockchain consistent with the new block. If
+        the checkpoint of the new height can't be staged, the block is
+        reverted before the error is raised, leaving the blockchain as it was.
+
+        Args:
+            block (Block): The block to append.
+        """
+        self.block_chain.append(block)
+        self.ledger.apply(block)
+        self.owner_index.add(block, len(self.block_chain) - 1)
+
+        height = len(self.block_chain)
+        if self.checkpoint_every > 0 and height % self.checkpoint_every == 0:
+            try:
+                checkpoint = Checkpoint(
+                    height, block.hash_b, dict(self.ledger.balances)
+                )
+            except Exception:
+                self._pop_block()
+                raise
+            self._staged_checkpoints.append(checkpoint)
+
+    def truncate_chain(self, height: int):
+        """Pops the blocks after the given height from the blockchain.
+
+        Used to discard invalid blocks, or the blocks of a failed batch,
+        reverting them from the indexes of the blockchain, last block first.
+        The verified prefix never extends past the kept blocks, so the blocks
+        appended later at those heights are validated again.
+
+        Args:
+            height (int): Number of blocks, from genesis, that are kept.
+        """
+        if self.chain_store is not None and len(self.block_chain) > height:
+            self.chain_store.truncate(len(self.block_chain) - height)
+
+        while len(self.block_chain) > height:
+            self._pop_block()
+        self.verified_height = min(self.verified_height, height)
+
+        self._staged_checkpoints = [
+            checkpoint
+            for checkpoint in self._staged_checkpoints
+            if checkpoint.height <= height
+        ]
+        if self.checkpoint is not None and self.checkpoint.height > height:
+            self.checkpoint = None
+
+    def _pop_block(self):
+        """Pops the last block, reverting it from the indexes of the chain."""
+        block = self.block_chain.pop()
+        self.ledger.revert(block)
+        self.owner_index.remove(block, len(self.block_chain))
+
+    def commit(self):
+        """Publishes the validated blocks to readers.
+
+        Must be called, with the lock held, after the new blocks are
+        validated and the invalid ones popped. Saves the checkpoints of the
+        new blocks and publishes a new read view.
+        """
+        self.save_checkpoints()
+
+        view = self.read_view
+        height = len(self.block_chain)
+        tip_hash = hash_at(self.block_chain, -1) if height > 0 else None
+
+        if height < view.height:
+            # Committed blocks were popped, start over
+            self.read_view = ReadView(height, tip_hash, dict(self.ledger.balances))
+        elif height > view.height:
+            changes = {
+                entry.owner_name: self.ledger.balance(entry.owner_name)
+                for block in self.block_chain[view.height : height]
+                for entry in block.entries()
+            }
+            self.read_view = view.advance(height, tip_hash, changes)
+
+    def save_checkpoints(self):
+        """Keeps the latest staged checkpoint whose blocks are validated.
+
+        Must be called after the new blocks are validated. The checkpoint is
+        persisted after the chain log is synced, so it never covers blocks
+        that could be lost.
+        """
+        validated = [
+            checkpoint
+            for checkpoint in self._staged_checkpoints
+            if checkpoint.height <= self.verified_height
+        ]
+        if len(validated) == 0:
+            return
+
+        self._staged_checkpoints = self._staged_checkpoints[len(validated) :]
+        self.checkpoint = validated[-1]
+
+        if self.chain_store is not None:
+            self.chain_store.sync()
+            self.checkpoint_store.save(self.checkpoint)
+
+        logger.debug("%s saved", self.checkpoint)
+
+    def rebuild_state(self):
+        """Rebuilds the indexes of the blockchain from block_chain.
+
+        Must be called after block_chain is replaced, e.g. when the server
+        starts with an existing chain.
+        """
+        self.ledger.rebuild(self.block_chain)
+        self.owner_index.rebuild(self.block_chain)
+
+    def _new_chain(self) -> List[Block]:
+        """Creates an empty chain of the server's kind."""
+        if self.columnar:
+            return ColumnarChain()
+        return []
+
+    def load_chain(self):
+        """Loads the blockchain persisted in chain_store.
+
+        Rebuilds block_chain and its indexes from the log and validates the
+        stored hashes. If the log has a checkpoint that matches it, the
+        balances are restored from it and only the blocks after it are
+        validated.
+
+        Raises:
+            ValueError: If a stored block has an invalid hash.
+        """
+        if self.chain_store is None:
+            return
+
+        self.block_chain = self._new_chain()
+        self.block_chain.extend(self.chain_store.load())
+        self.verified_height = 0
+        self._staged_checkpoints = []
+
+        checkpoint = None
+        if self.checkpoint_store is not None:
+            checkpoint = self.checkpoint_store.load()
+
+        if checkpoint is not None and checkpoint.matches(self.block_chain):
+            self.checkpoint = checkpoint
+            self.ledger.restore(
+                checkpoint.balances, self.block_chain[checkpoint.height :]
+            )
+            self.owner_index.rebuild(self.block_chain)
+        else:
+            if checkpoint is not None:
+                logger.warning("Ignoring checkpoint that doesn't match the chain")
+            self.checkpoint = None
+            self.rebuild_state()
+
+        if not Hash.validate_since_checkpoint(self):
+            raise ValueError(
+                f"Persisted blockchain has an invalid hash at block "
+                f"{self.verified_height}"
+            )
+        if self.block_encoding != BlockEncoding.BINARY:
+            logger.info(
+                "Chain hashed with the legacy %s encoding, "
+                "convert it with chain_tool.py migrate",
+                self.block_encoding.name,
+            )
+
+        self.read_view = ReadView(0, None, {})
+        self.commit()
+
+    def open_session(self, client_name: str) -> ClientSession:
+        """Creates the session of a client, as if it had sent its name."""
+        session = ClientSession()
+        session.client_name = client_name
+        self.accounts.connect(client_name)
+        return session
+
+    def close_session(self, session: ClientSession):
+        """Releases the accounts of a client whose connection is closing."""
+        if session.client_name is not None:
+            self.accounts.disconnect(session.client_name)
+        for client_name in session.accounts:
+            self.accounts.disconnect(client_name)
+        session.accounts.clear()
+
+    def handle_message(
+        self, session: ClientSession, message: str, lock: threading.Lock
+    ) -> Optional[str]:
+        """Processes one message received from a client.
+
+        Shared by the thread per client and the asyncio engines, only the I/O
+        differs between them.
+
+        Args:
+            session (ClientSession): State of the client's connection.
+            message (str): The message, without the delimiter. May carry
+            many commands, see NetworkNode.parse_commands.
+            lock (threading.Lock): Lock to protect shared state.
+
+        Returns:
+            Optional[str]: The reply to send to the client, or None if there's
+            no reply.
+        """
+        logger.debug(
+            "Received from %s: %s", session.client_name or "unknown client", message
+        )
+
+        reply = self.handle_commands(session, self.parse_commands(message), lock)
+
+        if reply is not None:
+            logger.debug("Sending to %s: %s", session.client_name, reply)
+
+        return reply
+
+    def handle_commands(
+        self, session: ClientSession, commands: List[Command], lock: threading.Lock
+    ) -> Optional[str]:
+        """Processes the parsed commands of one message, in order.
+
+        Stops at q. The replies are joined into a single one, separated by
+        COMMAND_SEPARATOR, so a message gets at most one reply however many
+        commands it carries.
+
+        Returns:
+            Optional[str]: The reply, or None if no command has a reply.
+        """
+        if len(commands) == 1:
+            (operation, op_data) = commands[0]
+            return self.handle_command(session, operation, op_data, lock)
+
+        replies = []
+        for operation, op_data in commands:
+            reply = self.handle_command(session, operation, op_data, lock)
+            if reply is not None:
+                replies.append(reply)
+            if not session.is_open:
+                break
+
+        return f"{COMMAND_SEPARATOR} ".join(replies) if len(replies) > 0 else None
+
+    def handle_command(
+        self,
+        session: ClientSession,
+        operation: Optional[Operation],
+        op_data,
+        lock: threading.Lock,
+    ) -> Optional[str]:
+        """Processes one command, as parsed by NetworkNode.parse_message.
+
+        Returns:
+            Optional[str]: The reply, or None if there's no reply.
+        """
+        client_name = session.client_name
+
+        if operation is None:
+            return "Unknow operation."
+        if operation == Operation.QUIT:
+            session.is_open = False
+            return None
+
+        # Cannot proceed until name is registered
+        if client_name is None:
+            if operation != Operation.NAME:
+                return "First, send your name: name <your_name>"
+            session.client_name = op_data
+            self.accounts.connect(op_data)
+            return None
+
+        if operation.is_query:
+            # Served from the committed state, never waits for writers
+            return self.query(client_name, operation, op_data)
+        if operation == Operation.PROOF:
+            with lock:
+                return self.inclusion_proof(client_name, op_data)
+        if operation == Operation.DEPOSIT or operation == Operation.WITHDRAW:
+            return self.transact(client_name, op_data, operation, lock)
+
+        # A second name: the connection's account can't change
+        return "Name already sent"
+
+    def handle_request(
+        self, session: ClientSession, frame: bytes, lock: threading.Lock
+    ) -> Optional[bytes]:
+        """Processes one request of the binary protocol.
+
+        The binary counterpart of handle_message: the request is decoded
+        from fixed-width fields, and answered with a status code and a packed
+        payload, see models.wire_protocol.
+
+        Args:
+            session (ClientSession): State of the client's connection.
+            frame (bytes): The request, without its length prefix.
+            lock (threading.Lock): Lock to protect shared state.
+
+        Returns:
+            Optional[bytes]: The response, with its length prefix, or None if
+            there's no response.
+        """
+        try:
+            (operation, request_id, amount, argument, client_name) = (
+                WireProtocol.decode_request(frame)
+            )
+        except ValueError as e:
+            return WireProtocol.encode_response(0, Status.MALFORMED, str(e).encode())
+
+        if operation == Operation.QUIT:
+            session.is_open = False
+            return None
+        if client_name == "":
+            return WireProtocol.encode_response(
+                request_id, Status.MALFORMED, b"Missing account"
+            )
+
+        if client_name not in session.accounts:
+            self.accounts.connect(client_name)
+            session.accounts.add(client_name)
+
+        status = Status.OK
+        payload = b""
+        if operation == Operation.BALANCE:
+            payload = BALANCE_PAYLOAD.pack(self.read_view.balance(client_name))
+        elif operation == Operation.TIP:
+            view = self.read_view
+            payload = TIP_PAYLOAD.pack(view.height, view.tip_hash or bytes(32))
+        elif operation == Operation.HISTORY:
+            history = self.history_page(client_name, argument, self.read_view)
+            if history is None:
+                (status, payload) = (Status.NOT_FOUND, b"No such page")
+            else:
+                (pages, entries) = history
+                payload = WireProtocol.encode_history(
+                    argument,
+                    pages,
+                    [(h, entry.operation, entry.amount) for (h, entry) in entries],
+                )
+        elif operation == Operation.PROOF:
+            with lock:
+                reply = self.inclusion_proof(client_name, argument)
+            if not reply.startswith(Operation.PROOF.value):
+                status = WireProtocol.status_of(reply)
+            payload = reply.encode("utf-8")
+        elif operation == Operation.DEPOSIT or operation == Operation.WITHDRAW:
+            reply = self.transact(client_name, amount, operation, lock)
+            status = WireProtocol.status_of(reply)
+            if status != Status.OK:
+                payload = reply.encode("utf-8")
+        else:
+            # Every request carries its account, there's no name to send
+            (status, payload) = (Status.NOT_ALLOWED, b"Not a binary operation")
+
+        return WireProtocol.encode_response(request_id, status, payload)
+
+    def transact(
+        self,
+        client_name: str,
+        amount: int,
+        operation: Operation,
+        lock: threading.Lock,
+    ) -> str:
+        """Executes and commits a deposit or withdraw of a client.
+
+        Args:
+            client_name (str): The identification of the client.
+            amount (int): How many micro-minicoins are involved.
+            operation (Operation): DEPOSIT or WITHDRAW.
+            lock (threading.Lock): Lock to protect shared state.
+
+        If the transaction fails before it's committed, its block is popped
+        and it fails with "Internal error".
+
+        Returns:
+            str: The status of the transaction, "ok" if it was committed.
+        """
+        if self.committer is not None:
+            # Committed with the transactions of other clients
+            return self.committer.submit(client_name, amount, operation).wait()
+
+        # Only the client's own transactions wait for the validation
+        with self.account_locks.lock_for(client_name):
+            (is_transaction_valid, status, new_block) = (
+                Transaction.prepare_transaction(self, client_name, amount, operation)
+            )
+
+            if is_transaction_valid:
+                # Short critical section: link to the tip and commit
+                waited = time.perf_counter()
+                with lock:
+                    metrics.LOCK_WAIT.observe(time.perf_counter() - waited)
+                    start_height = len(self.block_chain)
+                    try:
+                        Transaction.link_block(self, new_block)
+
+                        if not Hash.validate_new_blocks(self):
+                            # Pop invalid blocks after the verified prefix
+                            self.truncate_chain(self.verified_height)
+                            status = "Corrupted block's hash"
+
+                        self.commit()
+                    except Exception as e:
+                        logger.exception("Error committing transaction: %s", e)
+                        self.truncate_chain(start_height)
+                        status = "Internal error"
+
+        return status
+
+    def inclusion_proof(self, client_name: str, n: Optional[int] = None) -> str:
+        """Builds the inclusion proof of a transaction of a client.
+
+        The proof is sent in a single line:
+        proof <height> <entry> <leaf> <root> <block_hash> <L|R><sibling>,...
+        where entry is the index of the transaction in the batch at height,
+        and each step tells if the sibling is on the left or on the right.
+        Verify it with MerkleTree.verify.
+
+        Args:
+            client_name (str): The identification of the client.
+            n (Optional[int]): Index of the transaction in the client's
+            history, negative counts from the end. None for the latest.
+
+        Returns:
+            str: The proof, or why there's no proof.
+        """
+        history = self.owner_index.history(client_name)
+        if n is None:
+            n = -1
+        if not -len(history) <= n < len(history):
+            return "No such transaction"
+
+        (height, entry_index) = self._locate_entry(
+            client_name, history, n % len(history)
+        )
+        block = self.block_chain[height]
+        if not isinstance(block, BatchBlock):
+            return f"No inclusion proof, block {height} is not batched"
+
+        (leaf, proof) = block.inclusion_proof(entry_index)
+        steps = ",".join(
+            ("L" if is_left else "R") + sibling.hex() for is_left, sibling in proof
+        )
+
+        return (
+            f"proof {height} {entry_index} {leaf.hex()} "
+            f"{block.merkle_root.hex()} {block.hash_b.hex()} {steps}"
+        ).rstrip()
+
+    def query(self, client_name: str, operation: Operation, page: int = 1) -> str:
+        """Answers a read-only query from the latest read view.
+
+        Doesn't need the lock: the view is immutable, and the blocks and
+        positions of the owner index it covers are never modified.
+
+        Args:
+            client_name (str): The identification of the client.
+            operation (Operation): BALANCE, HISTORY or TIP.
+            page (int): The page of a HISTORY query, from 1.
+
+        Returns:
+            str: The reply, in a single line:
+                balance <amount>
+                history <page>/<pages> <height>:<operation>:<amount> ...
+                tip <height> <hash, or - for an empty chain>
+        """
+        view = self.read_view
+
+        if operation == Operation.BALANCE:
+            return f"balance {format_amount(view.balance(client_name))}"
+
+        if operation == Operation.TIP:
+            tip_hex = view.tip_hash.hex() if view.tip_hash is not None else "-"
+            return f"tip {view.height} {tip_hex}"
+
+        history = self.history_page(client_name, page, view)
+        if history is None:
+            return "No such page"
+
+        (pages, entries) = history
+        items = [
+            f"{height}:{entry.operation.value}:{format_amount(entry.amount)}"
+            for (height, entry) in entries
+        ]
+        return " ".join([f"history {page}/{pages}"] + items)
+
+    def history_page(
+        self, client_name: str, page: int, view: ReadView
+    ) -> Optional[Tuple[int, List[Tuple[int, Block]]]]:
+        """Gets a page of the committed transactions of a client.
+
+        Args:
+            client_name (str): The identification of the client.
+            page (int): The page, from 1, newest transactions first.
+            view (ReadView): The committed state to read.
+
+        Returns:
+            The number of pages, and the height and entry of each transaction
+            in the page: (int, List[(int, Block)]). None if there's no such
+            page.
+        """
+        record = self.owner_index.records.get(client_name)
+        positions = record.positions if record is not None else []
+        # Only the transactions in committed blocks
+        count = bisect.bisect_left(positions, view.height)
+
+        pages = max(1, math.ceil(count / HISTORY_PAGE))
+        if not 1 <= page <= pages:
+            return None
+
+        # Newest first
+        end = count - (page - 1) * HISTORY_PAGE
+        start = max(0, end - HISTORY_PAGE)
+
+        entries = []
+        for n in range(end - 1, start - 1, -1):
+            (height, entry_index) = self._locate_entry(client_name, positions, n)
+            entries.append((height, self.block_chain[height].entries()[entry_index]))
+
+        return (pages, entries)
+
+    def _locate_entry(
+        self, client_name: str, positions: List[int], n: int
+    ) -> Tuple[int, int]:
+        """Finds the n-th transaction of a client in the chain.
+
+        Args:
+            client_name (str): The identification of the client.
+            positions (List[int]): The client's positions in the owner index.
+            n (int): Index of the transaction in positions.
+
+        Returns:
+            The height of its block and its index in the block's entries:
+            (int, int)
+        """
+        height = positions[n]
+        block = self.block_chain[height]
+        if not isinstance(block, BatchBlock):
+            return (height, 0)
+
+        # The client's transactions in the block before this one
+        occurrence = n - bisect.bisect_left(positions, height)
+        entries = [
+            i
+            for i, entry in enumerate(block.entries())
+            if entry.owner_name == client_name
+        ]
+        return (height, entries[occurrence])
+
+    def dump_chain(self):
+        """Logs every block of the blockchain.
+
+        Only done on demand (e.g. on a signal), it's linear in the chain's
+        length. The blocks are formatted by the logging listener.
+        """
+        logger.info("Blockchain (%d blocks):", len(self.block_chain))
+        for i, block in enumerate(self.block_chain):
+            logger.info("\t%d: %s", i, block)
+
     # Executed in an new thread
     def answer_client(
         self, connection: socket, lock: threading.Lock, shutdown_event: threading.Event
@@ -58,96 +729,204 @@ class Server(NetworkNode):
             shutdown_event (threading.Event): Event to signal shutdown.
         """
         # Keep the connection alive, exchanging messages, until it's closed
-        is_open = True
-        client_name = None
-        while is_open and not shutdown_event.is_set():
+        session = ClientSession()
+        reader = self.frame_reader(connection)
+        # Shared with the executor's threads, that reply to tagged requests
+        writer = ReplyWriter(connection)
+        mux = Multiplexer(self, lock, writer, self.mux_executor)
+
+        metrics.ACTIVE_CONNECTIONS.inc()
+        is_binary = None
+        try:
+            is_binary = self._negotiate(connection, shutdown_event)
+            if is_binary:
+                self._exchange_requests(
+                    connection, writer, session, lock, shutdown_event
+                )
+            elif is_binary is not None:
+                self._exchange_messages(
+                    connection, reader, writer, session, lock, shutdown_event, mux
+                )
+            mux.close()  # Answer every tagged request before goodbye
+        finally:
+            self.close_session(session)
+            metrics.ACTIVE_CONNECTIONS.dec()
+
+        logger.info("Closing connection with client %s", session.client_name)
+        if is_binary is False:
+            try:
+                writer.send(GOODBYE_MESSAGE)
+            except OSError:
+                pass  # Client already closed the connection
+        try:
+            connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # Client already closed the connection
+
+        connection.close()
+
+    def _negotiate(
+        self, connection: socket, shutdown_event: threading.Event
+    ) -> Optional[bool]:
+        """Finds out the protocol of a new connection from its first bytes.
+
+        Returns:
+            Optional[bool]: True if the client completed the handshake of the
+            binary protocol, False if it speaks the text protocol, None if
+            the connection must be closed.
+        """
+        while not shutdown_event.is_set():
+            connection.settimeout(1.0)
+            try:
+                first = connection.recv(1, socket.MSG_PEEK)
+            except TimeoutError:
+                continue
+            except OSError:
+                return None
+
+            if first != MAGIC[:1]:
+                # Also when the connection was closed, the text path ends it
+                return False
+
+            hello = b""
+            try:
+                while len(hello) < len(HELLO):
+                    received = connection.recv(len(HELLO) - len(hello))
+                    if received == b"":
+                        return None
+                    hello += received
+
+                (is_accepted, answer) = WireProtocol.answer_hello(hello)
+                connection.sendall(answer)
+            except OSError:
+                return None
+
+            return True if is_accepted else None
+
+        return False  # Shutting down, the text path says goodbye
+
+    def _exchange_requests(
+        self,
+        connection: socket,
+        writer: ReplyWriter,
+        session: ClientSession,
+        lock: threading.Lock,
+        shutdown_event: threading.Event,
+    ):
+        """Answers the binary requests of a client until it quits.
+
+        The responses to the requests received together are sent together,
+        with a single send.
+        """
+        reader = LengthPrefixedReader(
+            connection, self.buffer_size, self.max_frame_size
+        )
+        while session.is_open and not shutdown_event.is_set():
+            connection.settimeout(1.0)
+
+            try:
+                frames = reader.recv_frames()
+            except TimeoutError:
+                continue
+            except ValueError as e:
+                logger.warning("Closing binary connection: %s", e)
+                break
+            except OSError:
+                break
+
+            if frames is None:
+                break  # Connection was closed
+
+            received_at = time.perf_counter()
+            metrics.BYTES_RECEIVED.inc(
+                sum(LENGTH.size + len(frame) for frame in frames)
+            )
+
+            answered = 0
+            try:
+                for frame in frames:
+                    if not session.is_open:
+                        break  # Ignore requests after quitting
+
+                    response = self.handle_request(session, frame, lock)
+                    if response is not None:
+                        metrics.BYTES_SENT.inc(writer.write_bytes(response))
+                        answered += 1
+
+                metrics.BYTES_SENT.inc(writer.flush())
+            except OSError:
+                break
+
+            elapsed = time.perf_counter() - received_at
+            for _ in range(answered):
+                metrics.REQUEST_LATENCY.observe(elapsed)
+
+    def _exchange_messages(
+        self,
+        connection: socket,
+        reader: FrameReader,
+        writer: ReplyWriter,
+        session: ClientSession,
+        lock: threading.Lock,
+        shutdown_event: threading.Event,
+        mux: Multiplexer,
+    ):
+        """Answers the messages of a client until the session is closed.
+
+        The replies to the messages received together are sent together,
+        with a single send, once all of them are answered.
+        """
+        while session.is_open and not shutdown_event.is_set():
 
             # Set short timeout to check shutdown_event periodically
             connection.settimeout(1.0)
 
             try:
-                messages_bytes = connection.recv(self.buffer_size)
+                messages = reader.recv_messages()
             except TimeoutError:
                 # Timeout to check shutdown_event
                 continue
+            except FrameTooLargeError as e:
+                logger.warning("Sending to %s: %s", session.client_name, e)
+                try:
+                    writer.send(str(e))
+                except OSError:
+                    pass  # Client already closed the connection
+                break
             except OSError:
                 # Connection error
                 break
 
-            if not messages_bytes:
+            if messages is None:
                 break  # Connection was closed
 
-            messages = messages_bytes.decode()
-            for message in messages.split("\n"):
-                if message.strip() == "":
-                    continue  # Ignore empty messages
-
-                print("\n", end="")
-
-                if client_name is not None:
-                    print(f"Received from {client_name}: {message}")
-                else:
-                    print(f"Received from unknown client: {message}")
-
-                (operation, op_data) = self.parse_message(message)
-
-                if operation is None:
-                    print("Sending: Unknow operation.")
-                    self.send_str(connection, "Unknow operation.")
-                elif operation == Operation.QUIT:
-                    is_open = False
-                # Cannot proceed until name is registered
-                elif client_name is None:
-                    if operation == Operation.NAME:
-                        if op_data is not None:
-                            client_name = op_data
-                            if op_data not in self.client_ids:
-                                self.client_ids.append(client_name)
-                        else:
-                            print("Sending: First, send your name: name <your_name>")
-                            self.send_str(
-                                connection, "First, send your name: name <your_name>"
-                            )
-                    else:
-                        print("Sending: First, send your name: name <your_name>")
-                        self.send_str(
-                            connection, "First, send your name: name <your_name>"
-                        )
-
-                # Money operations
-                elif operation == Operation.DEPOSIT or operation == Operation.WITHDRAW:
-                    with lock:
-                        (is_transaction_valid, status) = (
-                            Transaction.execute_transaction(
-                                self, client_name, op_data, operation
-                            )
-                        )
-
-                        is_blockchain_valid = False
-                        if is_transaction_valid:
-                            is_blockchain_valid = Hash.validate_blockchain_hash(self)
-
-                            if not is_blockchain_valid:
-                                self.block_chain.pop()  # Pop last invalid block
-                                status = "Corrupted block's hash"
-
-                        print("Sending:", status)
-                        self.send_str(connection, status)
-                else:
-                    raise RuntimeError("Unknown error")
-
-                print("Blockchain:")
-                if len(self.block_chain) > 0:
-                    for i, block in enumerate(self.block_chain):
-                        print(f"\t{i}: {block}")
-                else:
-                    print("\tempty")
-
-        print("Closing connection with client " + client_name)
-        self.send_str(connection, "Server shutting down connection.")
-        try:
-            connection.shutdown(socket.SHUT_RDWR)
-        except OSError:
-            pass  # Client already closed the connection
+            received_at = time.perf_counter()
+            metrics.BYTES_RECEIVED.inc(reader.received)
 
-        connection.close()
+            answered = 0
+            try:
+                for message in messages:
+                    if not session.is_open:
+                        break  # Ignore messages after quitting
+
+                    if message.strip() == "":
+                        continue  # Ignore empty messages
+
+                    if Multiplexer.is_tagged(message):
+                        # Answered on its own, maybe after the next messages
+                        mux.submit(message, received_at)
+                        continue
+
+                    reply = self.handle_message(session, message, lock)
+                    if reply is not None:
+                        metrics.BYTES_SENT.inc(writer.write(reply))
+                    answered += 1
+
+                metrics.BYTES_SENT.inc(writer.flush())
+            except OSError:
+                break  # Connection error
+
+            # Includes the time waiting for the other messages of the recv
+            elapsed = time.perf_counter() - received_at
+            for _ in range(answered):
+                metrics.REQUEST_LATENCY.observe(elapsed)
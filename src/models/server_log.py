@@ -0,0 +1,64 @@
+"""Logging setup for the blockchain server.
+
+The server logs through the standard logging module, with levels, instead of
+printing. Records are put in a queue by the threads that log them and written
+by a single listener thread, so a slow terminal or file does not slow down the
+transactions. The records are formatted by the listener too, so the repr of
+the objects passed as arguments (e.g. blocks) is only computed if the record
+is actually written, and out of the client's thread.
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(threadName)s] %(message)s"
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves the formatting to the listener.
+
+    The default QueueHandler formats the message before queueing it, in the
+    thread that logged it. The server only passes immutable values or blocks
+    already in the chain as arguments, so the record can be queued as is.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(
+    level: str = "INFO", log_file: Optional[str] = None
+) -> logging.handlers.QueueListener:
+    """Sends the records of the root logger to a queue and starts its listener.
+
+    Args:
+        level (str): Lowest level logged, one of LOG_LEVELS.
+        log_file (Optional[str]): File to write the log to, stdout if None.
+
+    Returns:
+        logging.handlers.QueueListener: The started listener, must be stopped
+        on shutdown to write the remaining records.
+    """
+    if log_file is not None:
+        output = logging.FileHandler(log_file, encoding="utf-8")
+    else:
+        output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, output)
+
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.addHandler(LazyQueueHandler(log_queue))
+    root.setLevel(level)
+
+    listener.start()
+    return listener
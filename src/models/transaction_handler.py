@@ -12,12 +12,17 @@ Last Modified: Nov. 14 2025
 from __future__ import annotations
 
 import datetime
-from typing import TYPE_CHECKING, Tuple
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-from models.block import Block
+from models.block import Block, record_version
 from models.acc_creation_block import AccCreationBlock
+from models.batch_block import BatchBlock
 from models.operation import Operation
 from models.hash import Hash
+from models.columnar_chain import hash_at
+from models.amount import MAX_UNITS
+from models import metrics
 
 # Imports Server only during static type checking (not at runtime) to avoid
 # circular dependency.
@@ -37,7 +42,7 @@ class Transaction:
 
     @staticmethod
     def execute_transaction(
-        server: Server, client_name: str, amount: float, operation: Operation
+        server: Server, client_name: str, amount: int, operation: Operation
     ) -> Tuple[bool, str]:
         """Processes the transaction (deposit or withdraw) of a client.
 
@@ -47,7 +52,7 @@ class Transaction:
         Args:
             server (Server): The server with the blockchain
             client_name (str): The identification of the client, can't be empty.
-            amount (float): How many minicoins are being deposited, must be
+            amount (int): How many micro-minicoins are being deposited, must be
             greater than 0.
 
         Returns:
@@ -55,31 +60,253 @@ class Transaction:
             (bool, str)
 
         """
+        (is_valid, status, new_block) = Transaction.prepare_transaction(
+            server, client_name, amount, operation
+        )
+
+        if is_valid:
+            Transaction.link_block(server, new_block)
+
+        return (is_valid, status)
+
+    @staticmethod
+    def prepare_transaction(
+        server: Server, client_name: str, amount: int, operation: Operation
+    ) -> Tuple[bool, str, Optional[Block]]:
+        """Validates a transaction and creates its block, without linking it.
+
+        Only reads the state of the client's own account, so it doesn't need
+        the server's lock, as long as the transactions of each client are
+        serialized (see Server.account_locks) until they are linked.
+
+        Args:
+            server (Server): The server with the blockchain
+            client_name (str): The identification of the client, can't be empty.
+            amount (int): How many micro-minicoins are involved, must be greater
+            than 0.
+            operation (Operation): DEPOSIT or WITHDRAW.
+
+        Returns:
+            Bool indicating if the validation was ok, a status message and the
+            new block, without hash, if it's valid: (bool, str, Optional[Block])
+        """
         (is_valid, status) = Transaction._validate(
             server, client_name, amount, operation
         )
+        Transaction._count_results([(is_valid, status)])
 
         if not is_valid:
-            return (False, status)
+            return (False, status, None)
 
-        if operation == Operation.DEPOSIT:
-            new_block = Transaction._create_deposit_block(server, client_name, amount)
-        else:
-            new_block = Transaction._create_withdraw_block(server, client_name, amount)
+        new_block = Transaction._create_block(server, client_name, amount, operation)
+        return (True, status, new_block)
+
+    @staticmethod
+    def link_block(server: Server, new_block: Block) -> Block:
+        """Hashes a prepared block with the tip of the chain and appends it.
+
+        Must be called with the server's lock held: it's the only part of a
+        transaction that depends on the rest of the chain.
+
+        Args:
+            server (Server): The server with the blockchain.
+            new_block (Block): Block from prepare_transaction.
+
+        Returns:
+            Block: The new block, with its hash.
+        """
+        return Transaction._link(server, new_block, Transaction._tip_hash(server))
+
+    @staticmethod
+    def execute_batch(
+        server: Server, transactions: List[Tuple[str, int, Operation]]
+    ) -> List[Tuple[bool, str]]:
+        """Processes many transactions, in order, in a single pass.
+
+        Each transaction is validated against the state left by the previous
+        ones, and the hashes of the new blocks are chained as they are
+        created, without reading the chain again. A transaction that fails
+        does not stop the others.
+
+        Args:
+            server (Server): The server with the blockchain
+            transactions (List[Tuple[str, int, Operation]]): The client's
+            name, amount and operation of each transaction.
+
+        Returns:
+            For each transaction, a bool indicating if the validation was ok
+            and a status message: List[(bool, str)]
+        """
+        last_hash = Transaction._tip_hash(server)
+
+        results = []
+        for client_name, amount, operation in transactions:
+            try:
+                (is_valid, status) = Transaction._validate(
+                    server, client_name, amount, operation
+                )
+            except ValueError as e:
+                # Fatal for this transaction only
+                (is_valid, status) = (False, str(e))
+
+            if is_valid:
+                last_hash = Transaction._append_block(
+                    server, client_name, amount, operation, last_hash
+                ).hash_b
+
+            results.append((is_valid, status))
+
+        Transaction._count_results(results)
+        return results
+
+    @staticmethod
+    def execute_merkle_batch(
+        server: Server, transactions: List[Tuple[str, int, Operation]]
+    ) -> List[Tuple[bool, str]]:
+        """Processes many transactions, in order, into a single BatchBlock.
 
+        Each transaction is validated against the state left by the previous
+        ones, as in execute_batch, but the valid ones are stored together in
+        one block, under their Merkle root. No block is appended if none of
+        the transactions is valid.
+
+        Args:
+            server (Server): The server with the blockchain
+            transactions (List[Tuple[str, int, Operation]]): The client's
+            name, amount and operation of each transaction.
+
+        Returns:
+            For each transaction, a bool indicating if the validation was ok
+            and a status message: List[(bool, str)]
+        """
+        # Balances of the clients with valid transactions earlier in the batch
+        pending: Dict[str, int] = {}
+        entries = []
+
+        results = []
+        for client_name, amount, operation in transactions:
+            try:
+                (is_valid, status) = Transaction._validate(
+                    server, client_name, amount, operation, pending
+                )
+            except ValueError as e:
+                # Fatal for this transaction only
+                (is_valid, status) = (False, str(e))
+
+            if is_valid:
+                entries.append(
+                    Transaction._create_block(
+                        server, client_name, amount, operation, pending
+                    )
+                )
+
+                balance = Transaction._current_balance(server, client_name, pending)
+                if operation == Operation.DEPOSIT:
+                    pending[client_name] = balance + amount
+                else:
+                    pending[client_name] = balance - amount
+
+            results.append((is_valid, status))
+
+        Transaction._count_results(results)
+
+        if len(entries) > 0:
+            # In the version the chain stores, its leaves depend on it
+            new_block = BatchBlock(entries, record_version(server.block_encoding))
+            new_block.hash_b = Transaction._hash(
+                server, new_block, Transaction._tip_hash(server)
+            )
+
+            server.append_block(new_block)
+
+            if server.chain_store is not None:
+                server.chain_store.append(new_block)
+
+        return results
+
+    @staticmethod
+    def _append_block(
+        server: Server,
+        client_name: str,
+        amount: int,
+        operation: Operation,
+        last_hash: Optional[bytes],
+    ) -> Block:
+        """Creates the block of a validated transaction and appends it.
+
+        Args:
+            server (Server): The server with the blockchain.
+            client_name (str): The identification of the client.
+            amount (int): How many micro-minicoins are involved.
+            operation (Operation): DEPOSIT or WITHDRAW.
+            last_hash (Optional[bytes]): Hash of the last block of the chain,
+            or None if the new block is the genesis.
+
+        Returns:
+            Block: The new block, with its hash.
+        """
+        new_block = Transaction._create_block(server, client_name, amount, operation)
+        return Transaction._link(server, new_block, last_hash)
+
+    @staticmethod
+    def _link(server: Server, new_block: Block, last_hash: Optional[bytes]) -> Block:
+        """Hashes a block with the previous one and appends it to the chain."""
         # Add hash to the new block
-        prev_block = None
-        # Check if it's the genesis block
-        if len(server.block_chain) > 0:
-            prev_block = server.block_chain[-1]
-        new_block.hash_b = Hash.compute_hash(server, new_block, prev_block)
+        new_block.hash_b = Transaction._hash(server, new_block, last_hash)
 
-        server.block_chain.append(new_block)
+        server.append_block(new_block)
 
-        return (True, "ok")
+        if server.chain_store is not None:
+            server.chain_store.append(new_block)
+
+        return new_block
 
     @staticmethod
-    def _create_deposit_block(server: Server, client_name: str, amount: float) -> Block:
+    def _hash(server: Server, new_block: Block, last_hash: Optional[bytes]) -> bytes:
+        """Computes the hash of a new block, timing it in the metrics."""
+        start = time.perf_counter()
+        hash_b = Hash.hash_block(new_block, last_hash, server.block_encoding)
+        metrics.HASH_TIME.observe(time.perf_counter() - start)
+        return hash_b
+
+    @staticmethod
+    def _tip_hash(server: Server) -> Optional[bytes]:
+        """Hash of the last block of the chain, None if the chain is empty."""
+        if len(server.block_chain) == 0:
+            return None
+        return hash_at(server.block_chain, -1)
+
+    @staticmethod
+    def _count_results(results: List[Tuple[bool, str]]):
+        """Counts the accepted and rejected transactions in the metrics."""
+        accepted = sum(1 for (is_valid, _) in results if is_valid)
+        if accepted > 0:
+            metrics.TRANSACTIONS_ACCEPTED.inc(accepted)
+        if accepted < len(results):
+            metrics.TRANSACTIONS_REJECTED.inc(len(results) - accepted)
+
+    @staticmethod
+    def _create_block(
+        server: Server,
+        client_name: str,
+        amount: int,
+        operation: Operation,
+        pending: Optional[Dict[str, int]] = None,
+    ) -> Block:
+        """Creates the block of a deposit or withdraw, without its hash."""
+        if operation == Operation.DEPOSIT:
+            return Transaction._create_deposit_block(
+                server, client_name, amount, pending
+            )
+        return Transaction._create_withdraw_block(server, client_name, amount)
+
+    @staticmethod
+    def _create_deposit_block(
+        server: Server,
+        client_name: str,
+        amount: int,
+        pending: Optional[Dict[str, int]] = None,
+    ) -> Block:
         """Create the deposit block of a client.
 
         Does not calculate the hash, because it depends on the previous block.
@@ -87,23 +314,22 @@ class Transaction:
         Args:
             server (Server): The server with the blockchain.
             client_name (str): The identification of the client, can't be empty.
-            amount (float): How many minicoins are being deposited, must be
+            amount (int): How many micro-minicoins are being deposited, must be
             greater than 0.
+            pending (Optional[Dict[str, int]]): Balances of the clients with
+            transactions earlier in the same batch, not in the chain yet.
 
         Returns:
             New block instantiated.
             If it's the first deposit of the client, returns AccCreationBlock.
 
         """
-
-        # Check if this client has not deposited yet
-        is_new_client = True
-        for block in server.block_chain:
-            if block.owner_name == client_name:
-                is_new_client = False
-
         # Special block for first deposit of the client
-        if is_new_client:
+        is_new_account = server.owner_index.is_new_account(client_name)
+        if pending is not None and client_name in pending:
+            is_new_account = False
+
+        if is_new_account:
             creation_time = datetime.datetime.now(datetime.timezone.utc)
             new_block = AccCreationBlock(client_name, amount, creation_time)
 
@@ -115,7 +341,7 @@ class Transaction:
 
     @staticmethod
     def _create_withdraw_block(
-        server: Server, client_name: str, amount: float
+        server: Server, client_name: str, amount: int
     ) -> Block:
         """Create the withdraw block of a client.
 
@@ -124,7 +350,7 @@ class Transaction:
         Args:
             server (Server): The server with the blockchain.
             client_name (str): The identification of the client, can't be empty.
-            amount (float): How many minicoins are being withdrawn, must be
+            amount (int): How many micro-minicoins are being withdrawn, must be
             greater than 0.
 
         Returns:
@@ -137,7 +363,11 @@ class Transaction:
 
     @staticmethod
     def _validate(
-        server: Server, client_name: str, amount: float, operation: Operation
+        server: Server,
+        client_name: str,
+        amount: int,
+        operation: Operation,
+        pending: Optional[Dict[str, int]] = None,
     ) -> Tuple[bool, str]:
         """
         Can only validate transactions, which means that this method only
@@ -151,12 +381,12 @@ class Transaction:
             (bool, str)
 
         Raises:
-            ValueError: If client_name does not exist in server.client_ids
+            ValueError: If client_name is not registered in server.accounts
             ValueError: If client_name is None
             ValueError: If operation is not DEPOSIT or WITHDRAW
         """
         # Fatal error
-        if not (client_name in server.client_ids):
+        if client_name not in server.accounts:
             raise ValueError("Can't execute transaction from an inexisting account")
 
         # Fatal error
@@ -172,22 +402,29 @@ class Transaction:
 
         if (
             operation == Operation.WITHDRAW
-            and Transaction._current_balance(server, client_name) < amount
+            and Transaction._current_balance(server, client_name, pending) < amount
         ):
             return (False, "Can't withdraw more money than the current balance amount")
 
+        # Balances are stored in int64 fields (checkpoints, binary replies)
+        if (
+            operation == Operation.DEPOSIT
+            and Transaction._current_balance(server, client_name, pending)
+            > MAX_UNITS - amount
+        ):
+            return (False, "Can't deposit more money than the largest balance amount")
+
         return (True, "ok")
 
     @staticmethod
-    def _current_balance(server: Server, client_name: str) -> float:
-        """Calculates the current balance of a client."""
-        balance = 0
-        for block in server.block_chain:
-            if block.owner_name == client_name:
-                # Check operation type
-                if block.operation == Operation.DEPOSIT:
-                    balance += block.amount
-                elif block.operation == Operation.WITHDRAW:
-                    balance -= block.amount
-
-        return balance
+    def _current_balance(
+        server: Server, client_name: str, pending: Optional[Dict[str, int]] = None
+    ) -> int:
+        """Gets the current balance of a client from the server's ledger.
+
+        A balance in pending (transactions earlier in the same batch, not in
+        the chain yet) takes precedence over the ledger's.
+        """
+        if pending is not None and client_name in pending:
+            return pending[client_name]
+        return server.ledger.balance(client_name)
@@ -0,0 +1,257 @@
+"""Binary wire protocol, negotiated on the same port as the text protocol.
+
+A client chooses the binary protocol by sending HELLO (a NUL byte, that never
+starts a text message, "MBW" and the protocol version) as the first bytes of
+the connection. The server answers HELLO with the version it will speak, or
+version 0 if it doesn't support the requested one, then closes.
+
+After the handshake every message is a frame: a little-endian uint32 with the
+length of the rest, then the fields, all fixed width except the trailing
+name or payload.
+
+Request: operation code (Operation.code), request id, amount (int64, in
+micro-minicoins, see models.amount), argument (int64: page of HISTORY, index
+of the transaction of PROOF, -1 for the latest), then the account's name.
+Every request carries its account, so one connection serves many accounts.
+QUIT closes the connection and has no response.
+
+Response: request id, status code (Status), then the payload:
+    BALANCE: the balance (int64, micro-minicoins)
+    TIP: the height (uint64) and the hash of the tip (32 bytes, zeros if the
+    chain is empty)
+    HISTORY: the page and the number of pages (uint32 each), then the height
+    (uint64), operation code (uint8) and amount (int64) of each transaction
+    PROOF: the proof, in the text format of Server.inclusion_proof
+    Other statuses than OK: the message of the text protocol, UTF-8
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import struct
+from enum import IntEnum
+from typing import List, Optional, Tuple
+
+from models.operation import Operation
+
+MAGIC = b"\x00MBW"  # Starts the handshake, NUL never starts a text message
+VERSION = 2  # Version 1 had float64 amounts
+HELLO = MAGIC + bytes([VERSION])
+
+LENGTH = struct.Struct("<I")  # Prefix of every frame
+REQUEST = struct.Struct("<BQqq")  # Operation, request id, amount, argument
+RESPONSE = struct.Struct("<QH")  # Request id, status
+
+BALANCE_PAYLOAD = struct.Struct("<q")
+TIP_PAYLOAD = struct.Struct("<Q32s")
+HISTORY_HEAD = struct.Struct("<II")  # Page, pages
+HISTORY_ITEM = struct.Struct("<QBq")  # Height, operation, amount
+
+LATEST = -1  # Argument of PROOF for the latest transaction
+
+
+class Status(IntEnum):
+    """Numeric status of a response."""
+
+    OK = 0
+    INVALID_AMOUNT = 1
+    INSUFFICIENT_FUNDS = 2
+    CORRUPTED_BLOCK = 3
+    NOT_FOUND = 4  # No such page or transaction
+    NOT_ALLOWED = 5  # Operation not supported by the binary protocol
+    MALFORMED = 6  # Frame that can't be decoded
+    INTERNAL_ERROR = 7
+    ERROR = 8  # Any other error, described in the payload
+
+
+# Statuses of the replies of the text protocol
+_STATUSES = {
+    "ok": Status.OK,
+    "Can't operate <= 0 minicoins": Status.INVALID_AMOUNT,
+    "Can't withdraw more money than the current balance amount": (
+        Status.INSUFFICIENT_FUNDS
+    ),
+    "Can't deposit more money than the largest balance amount": (
+        Status.INVALID_AMOUNT
+    ),
+    "Corrupted block's hash": Status.CORRUPTED_BLOCK,
+    "No such page": Status.NOT_FOUND,
+    "No such transaction": Status.NOT_FOUND,
+    "Internal error": Status.INTERNAL_ERROR,
+}
+
+
+class WireProtocol:
+    """Encodes and decodes the frames of the binary protocol.
+
+    Attributes:
+        None
+    """
+
+    @staticmethod
+    def answer_hello(hello: bytes) -> Tuple[bool, bytes]:
+        """Answers the handshake of a client.
+
+        Returns:
+            If the binary protocol was accepted and the answer to send:
+            (bool, bytes)
+        """
+        if hello == HELLO:
+            return (True, HELLO)
+        return (False, MAGIC + bytes([0]))
+
+    @staticmethod
+    def encode_request(
+        operation: Operation,
+        request_id: int,
+        client_name: str,
+        amount: int = 0,
+        argument: int = 0,
+    ) -> bytes:
+        """Encodes a request, with its length prefix."""
+        body = (
+            REQUEST.pack(operation.code, request_id, amount, argument)
+            + client_name.encode("utf-8")
+        )
+        return LENGTH.pack(len(body)) + body
+
+    @staticmethod
+    def decode_request(frame: bytes) -> Tuple[Operation, int, int, int, str]:
+        """Decodes a request, without its length prefix.
+
+        Returns:
+            The operation, request id, amount, argument and account's name:
+            (Operation, int, int, int, str)
+
+        Raises:
+            ValueError: If the frame is not a valid request.
+        """
+        if len(frame) < REQUEST.size:
+            raise ValueError("Request too short")
+
+        (code, request_id, amount, argument) = REQUEST.unpack_from(frame)
+        client_name = bytes(frame[REQUEST.size :]).decode("utf-8")
+        return (Operation.from_code(code), request_id, amount, argument, client_name)
+
+    @staticmethod
+    def encode_response(request_id: int, status: Status, payload: bytes = b"") -> bytes:
+        """Encodes a response, with its length prefix."""
+        return (
+            LENGTH.pack(RESPONSE.size + len(payload))
+            + RESPONSE.pack(request_id, status)
+            + payload
+        )
+
+    @staticmethod
+    def decode_response(frame: bytes) -> Tuple[int, Status, bytes]:
+        """Decodes a response, without its length prefix.
+
+        Returns:
+            The request id, status and payload: (int, Status, bytes)
+
+        Raises:
+            ValueError: If the frame is not a valid response.
+        """
+        if len(frame) < RESPONSE.size:
+            raise ValueError("Response too short")
+
+        (request_id, status) = RESPONSE.unpack_from(frame)
+        return (request_id, Status(status), bytes(frame[RESPONSE.size :]))
+
+    @staticmethod
+    def status_of(reply: str) -> Status:
+        """Gets the status of a reply of the text protocol."""
+        return _STATUSES.get(reply, Status.ERROR)
+
+    @staticmethod
+    def encode_history(
+        page: int, pages: int, items: List[Tuple[int, Operation, int]]
+    ) -> bytes:
+        """Encodes the payload of a HISTORY response."""
+        return HISTORY_HEAD.pack(page, pages) + b"".join(
+            HISTORY_ITEM.pack(height, operation.code, amount)
+            for (height, operation, amount) in items
+        )
+
+    @staticmethod
+    def decode_history(
+        payload: bytes,
+    ) -> Tuple[int, int, List[Tuple[int, Operation, int]]]:
+        """Decodes the payload of a HISTORY response.
+
+        Returns:
+            The page, the number of pages and the height, operation and amount
+            of each transaction: (int, int, List[(int, Operation, int)])
+        """
+        (page, pages) = HISTORY_HEAD.unpack_from(payload)
+        items = [
+            (height, Operation.from_code(code), amount)
+            for (height, code, amount) in HISTORY_ITEM.iter_unpack(
+                payload[HISTORY_HEAD.size :]
+            )
+        ]
+        return (page, pages, items)
+
+
+class LengthPrefixedReader:
+    """Reads length-prefixed frames from a connection.
+
+    Like FrameReader, the bytes are received into a buffer allocated once and
+    only complete frames are returned.
+
+    Attributes:
+        connection (socket): The connection to read from.
+        max_frame_size (int): Longest frame accepted, without its prefix.
+    """
+
+    def __init__(self, connection, buffer_size: int, max_frame_size: int):
+        self.connection = connection
+        self.max_frame_size = max_frame_size
+
+        self._recv_size = buffer_size
+        # Room for a whole frame, its prefix and the next recv
+        self._buffer = bytearray(LENGTH.size + max_frame_size + buffer_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0  # Start of the first incomplete frame
+        self._end = 0  # End of the received bytes
+
+    def recv_frames(self) -> Optional[List[bytes]]:
+        """Receives from the connection and returns the complete frames.
+
+        Returns:
+            Optional[List[bytes]]: The frames, without their prefixes. Can be
+            empty if no frame was completed. None if the connection was
+            closed.
+
+        Raises:
+            ValueError: If a frame is longer than max_frame_size.
+        """
+        if len(self._buffer) - self._end < self._recv_size:
+            # Move the incomplete frame to the start, to free the tail
+            pending = self._end - self._start
+            self._view[:pending] = self._view[self._start : self._end]
+            self._start = 0
+            self._end = pending
+
+        received = self.connection.recv_into(self._view[self._end :])
+        if received == 0:
+            return None
+        self._end += received
+
+        frames = []
+        while self._end - self._start >= LENGTH.size:
+            (length,) = LENGTH.unpack_from(self._buffer, self._start)
+            if length > self.max_frame_size:
+                raise ValueError(f"Frame longer than {self.max_frame_size} bytes")
+
+            frame_end = self._start + LENGTH.size + length
+            if frame_end > self._end:
+                break
+
+            frames.append(bytes(self._view[self._start + LENGTH.size : frame_end]))
+            self._start = frame_end
+
+        if self._start == self._end:
+            self._start = self._end = 0  # Everything consumed
+
+        return frames
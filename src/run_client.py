@@ -12,7 +12,11 @@ Last Modified: Nov. 14 2025
 
 import argparse
 import sys
+import time
+from collections import deque
+from typing import Callable, List, Optional
 from models.client import Client
+from models.network_node import FrameReader, GOODBYE_MESSAGE
 from models.operation import Operation
 import signal
 import socket
@@ -25,7 +29,8 @@ def input_thread(input_queue: Queue, shutdown_event: threading.Event):
     """Thread to read user input without blocking main loop."""
 
     __builtins__.print(
-        "Usage:\n\t- deposit <amount>\n\t- withdraw <amount>\n\t- q to quit\n"
+        "Usage:\n\t- deposit <amount>\n\t- withdraw <amount>\n\t- balance"
+        "\n\t- history [page]\n\t- tip\n\t- proof [n]\n\t- q to quit\n"
     )
 
     while not shutdown_event.is_set():
@@ -39,7 +44,101 @@ def input_thread(input_queue: Queue, shutdown_event: threading.Event):
             break
 
 
-def main(client_name: str, server_ip: str, server_port: int, client_input=sys.stdin):
+def pipeline(
+    client: Client,
+    connection: socket.socket,
+    reader: FrameReader,
+    commands: List[str],
+    window: int,
+    shutdown_event: threading.Event,
+    print: Callable = print,
+):
+    """Streams the commands without waiting for each reply.
+
+    Up to window commands are waiting for their replies (in flight) at a
+    time. The server answers the commands of a connection in order, so each
+    reply is matched with the oldest command in flight. Blank messages and q
+    get no reply, every other command gets exactly one (name too, the client's
+    name was sent when connecting), and the goodbye of the server isn't the
+    reply of any command. Stops after q, once every
+    reply arrived, and reports the throughput.
+
+    Args:
+        client (Client): The connected client.
+        connection (socket): The connection with the server.
+        reader (FrameReader): Reader of the connection.
+        commands (List[str]): The commands, in order.
+        window (int): Most commands in flight, at least 1.
+        shutdown_event (threading.Event): Stops the client when set.
+        print (Callable): Function to print with.
+    """
+    in_flight = deque()  # Commands sent whose reply didn't arrive yet
+    next_command = 0
+    is_quitting = False
+    answered = 0
+
+    start = time.perf_counter()
+    while not shutdown_event.is_set():
+        batch = []
+        while (
+            not is_quitting
+            and next_command < len(commands)
+            and len(in_flight) < window
+        ):
+            message = commands[next_command]
+            next_command += 1
+            if message.strip() == "":
+                continue  # Ignored by the server, never answered
+            batch.append(message)
+
+            # Messages that can't be parsed are answered too, and so is name,
+            # since the client's name was already sent. A message with many
+            # commands gets a single reply, unless it starts with q
+            actions = [action for (action, _) in client.parse_commands(message)]
+            if Operation.QUIT in actions:
+                is_quitting = True
+            if actions[0] != Operation.QUIT:
+                in_flight.append(message)
+
+        if len(batch) > 0:
+            client.send_strs(connection, batch)
+
+        if (is_quitting or next_command == len(commands)) and len(in_flight) == 0:
+            break
+
+        try:
+            replies = reader.recv_messages()
+        except socket.timeout:
+            continue
+
+        if replies is None:
+            print("Connection closed with", len(in_flight), "commands in flight")
+            break
+
+        for recv_message in replies:
+            if recv_message == GOODBYE_MESSAGE:
+                print(f"Received: {recv_message}")  # Sent when closing
+            elif len(in_flight) > 0:
+                print(f"{in_flight.popleft()} -> {recv_message}")
+                answered += 1
+            else:
+                print(f"Received: {recv_message}")
+
+    elapsed = time.perf_counter() - start
+    throughput = answered / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Pipelined {next_command} commands, {answered} replies in "
+        f"{elapsed:.3f}s ({throughput:.0f} replies/s, window {window})"
+    )
+
+
+def main(
+    client_name: str,
+    server_ip: str,
+    server_port: int,
+    client_input=sys.stdin,
+    window: Optional[int] = None,
+):
     # Override print to add client name prefix
     def print(*args, **kwargs):
         __builtins__.print(f"[{client_name}]", *args, **kwargs)
@@ -54,6 +153,7 @@ def main(client_name: str, server_ip: str, server_port: int, client_input=sys.st
 
     # Set socket timeout to keep checking for shutdown_event
     connection.settimeout(1.0)
+    reader = client.frame_reader(connection)
 
     # Send name to server
     client.send_str(connection, "name " + client_name)
@@ -83,6 +183,19 @@ def main(client_name: str, server_ip: str, server_port: int, client_input=sys.st
         # Signals can only be registered in main thread
         print("Warning: Signal handlers not registered (not in main thread)")
 
+    if window is not None:
+        pipeline(
+            client,
+            connection,
+            reader,
+            list(client_input),
+            window,
+            shutdown_event,
+            print,
+        )
+        client.terminate()
+        return
+
     if client_input == sys.stdin:
         # Start input thread
         input_thread_obj = threading.Thread(
@@ -98,13 +211,13 @@ def main(client_name: str, server_ip: str, server_port: int, client_input=sys.st
             try:
                 message = input_queue.get_nowait()
 
-                (action, _) = client.parse_message(message)
+                actions = [action for (action, _) in client.parse_commands(message)]
 
                 print("Sending:", message)
 
                 client.send_str(connection, message)
 
-                if action is not None and action == Operation.QUIT.value:
+                if Operation.QUIT in actions:
                     print("Quitting.")
                     shutdown_event.set()
 
@@ -115,14 +228,13 @@ def main(client_name: str, server_ip: str, server_port: int, client_input=sys.st
             # Attention: the client will ALWAYS wait for a server response here and
             # won't proceed without receiving something.
             try:
-                recv_message_b = connection.recv(client.buffer_size)
+                replies = reader.recv_messages()
 
-                if not recv_message_b:
+                if replies is None:
                     break  # Connection was closed, Break immediately
 
-                recv_message = recv_message_b.decode()
-
-                print(f"Received: {recv_message}")
+                for recv_message in replies:
+                    print(f"Received: {recv_message}")
 
             except socket.timeout:
                 continue  # Normal execution
@@ -160,11 +272,31 @@ if __name__ == "__main__":
         help="File with operations to execute (default: stdin).",
     )
 
+    parser.add_argument(
+        "--pipeline",
+        type=int,
+        default=None,
+        metavar="WINDOW",
+        help="Stream the --input commands, with up to WINDOW of them waiting "
+        "for a reply, and report the throughput (default: one at a time).",
+    )
+
     args = parser.parse_args()
 
+    if args.pipeline is not None and args.input is None:
+        parser.error("--pipeline requires --input")
+    if args.pipeline is not None and args.pipeline < 1:
+        parser.error("--pipeline must be at least 1")
+
     if args.input:
         client_input = args.input.read().strip().split("\n")
     else:
         client_input = sys.stdin
 
-    main(args.client_name, args.server_ip, args.server_port, client_input)
+    main(
+        args.client_name,
+        args.server_ip,
+        args.server_port,
+        client_input,
+        args.pipeline,
+    )
@@ -4,56 +4,143 @@
 Creates a TCP server that listens for client connections, processes
 client operations and blockchain transactions (deposits/withdrawals),
 and manages the blockchain state. Supports graceful shutdown via signal
-handlers and multi-threaded client handling.
+handlers, and either multi-threaded or asyncio client handling.
 
 Authors: Andre Grassi de Jesus, Ricardo Faria
 Last Modified: Nov. 14 2025
 """
 
 import argparse
+import asyncio
+import logging
+import resource
 import threading
 import signal
 import sys
 import socket
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 from models.server import Server
 from models.operation import Operation
+from models.chain_store import ChainStore
+from models.async_server import AsyncServer
+from models.group_committer import GroupCommitter
+from models.multiplexer import MUX_WORKERS
+from models.checkpoint import CHECKPOINT_EVERY
+from models.server_log import setup_logging, LOG_LEVELS
+from models import metrics
 
 
-def main(server_port: int):
-    server = Server(server_port)
+ENGINES = ("threads", "asyncio")
+DUMP_SIGNAL = signal.SIGUSR1  # Logs the whole blockchain
+ASYNC_BACKLOG = 4096  # Pending connections, the asyncio engine holds many
 
-    print(f"Server IP: {server.ip}")
+logger = logging.getLogger(__name__)
+
+
+def main(
+    server_port: int,
+    chain_file: Optional[str] = None,
+    columnar: bool = False,
+    engine: str = "threads",
+    group_commit: bool = False,
+    host: Optional[str] = None,
+    merkle_batches: bool = False,
+    checkpoint_every: int = CHECKPOINT_EVERY,
+    metrics_port: Optional[int] = None,
+):
+    chain_store = None
+    if chain_file is not None:
+        chain_store = ChainStore(chain_file)
+
+    server = Server(server_port, chain_store, columnar, checkpoint_every)
+    if host is not None:
+        server.ip = host
+
+    if chain_store is not None:
+        server.load_chain()
+        logger.info("Loaded %d blocks from %s", len(server.block_chain), chain_file)
+
+    logger.info("Server IP: %s", server.ip)
 
     server.bind_socket()
+
+    metrics.CHAIN_LENGTH.set_function(lambda: len(server.block_chain))
+    metrics_endpoint = None
+    if metrics_port is not None:
+        metrics_endpoint = metrics.serve_metrics(metrics_port)
+        logger.info("Metrics at http://127.0.0.1:%d/metrics", metrics_port)
+
+    try:
+        if engine == "asyncio":
+            serve_asyncio(server)
+        else:
+            serve_threads(server, group_commit, merkle_batches)
+
+    finally:
+        # Final cleanup
+        if metrics_endpoint is not None:
+            metrics_endpoint.shutdown()
+
+        server.terminate()
+
+        if chain_store is not None:
+            chain_store.close()
+
+        logger.info("Server stopped")
+
+
+def serve_threads(
+    server: Server, group_commit: bool = False, merkle_batches: bool = False
+):
+    """Answers each client in its own thread until a shutdown signal.
+
+    With group_commit, the transactions of all clients are committed in
+    batches by a single committer thread. With merkle_batches too, each batch
+    is stored in a single BatchBlock.
+    """
     server.socket.listen(5)
 
     # Set timeout on listening socket to check shutdown_event periodically
     server.socket.settimeout(1.0)
 
-    print(f"Server listening on {server.ip}:{server_port}")
+    logger.info("Server listening on %s:%d", server.ip, server.port)
 
     # Shared state
     lock = threading.Lock()
     shutdown_event = threading.Event()
     active_threads = []
 
+    if group_commit:
+        server.committer = GroupCommitter(server, lock, merkle=merkle_batches)
+        server.committer.start()
+
+    # Answers the tagged requests of all connections
+    server.mux_executor = ThreadPoolExecutor(MUX_WORKERS, thread_name_prefix="Mux")
+
     def signal_handler(signum, frame):
         """Handle shutdown signals gracefully."""
         sig_name = signal.Signals(signum).name
-        print(f"\n{sig_name} received, shutting down...")
+        logger.info("%s received, shutting down...", sig_name)
 
         # Signal all threads to stop
         shutdown_event.set()
 
+    def dump_handler(signum, frame):
+        """Dump the blockchain on demand."""
+        with lock:
+            server.dump_chain()
+
     # Register signal handlers
     try:
         signal.signal(signal.SIGINT, signal_handler)  # Ctrl + C
         signal.signal(signal.SIGTERM, signal_handler)  # Terminate signal
         signal.signal(signal.SIGHUP, signal_handler)  # Hangup signal
+        signal.signal(DUMP_SIGNAL, dump_handler)
     except ValueError:
         # Signals can only be registered in main thread
-        print("Warning: Signal handlers not registered (not in main thread)")
+        logger.warning("Signal handlers not registered (not in main thread)")
 
     # Main accept loop
     try:
@@ -65,7 +152,7 @@ def main(server_port: int):
                     connection.close()
                     break
 
-                print(f"Accepted connection from {client_address}")
+                logger.info("Accepted connection from %s", client_address)
 
                 # Create non-daemon thread
                 thread = threading.Thread(
@@ -92,18 +179,61 @@ def main(server_port: int):
                 raise
 
     finally:
-        print("Waiting for client threads to finish...")
+        logger.info("Waiting for client threads to finish...")
 
         # Wait for all threads to finish (with timeout)
         for thread in active_threads:
             thread.join(timeout=5.0)  # wait max 5s per thread
             if thread.is_alive():
-                print(f"Warning: {thread.name} did not finish in time")
+                logger.warning("%s did not finish in time", thread.name)
 
-        # Final cleanup
-        server.terminate()
+        server.mux_executor.shutdown()
+
+        if server.committer is not None:
+            server.committer.stop()
+
+
+def serve_asyncio(server: Server):
+    """Answers all clients in an asyncio event loop until a shutdown signal."""
+    _raise_open_files_limit()
+
+    server.socket.listen(ASYNC_BACKLOG)
+
+    logger.info("Server listening on %s:%d (asyncio)", server.ip, server.port)
+
+    async def run():
+        shutdown_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def signal_handler(signum):
+            """Handle shutdown signals gracefully."""
+            sig_name = signal.Signals(signum).name
+            logger.info("%s received, shutting down...", sig_name)
+
+            shutdown_event.set()
+
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            loop.add_signal_handler(signum, signal_handler, signum)
 
-        print("Server stopped")
+        # The event loop is the only writer, no lock needed
+        loop.add_signal_handler(DUMP_SIGNAL, server.dump_chain)
+
+        await AsyncServer(server).serve(shutdown_event)
+
+    asyncio.run(run())
+
+
+def _raise_open_files_limit():
+    """Raises the soft limit of open files to the hard limit.
+
+    Each client is an open socket, the default soft limit (often 1024) is too
+    low to hold thousands of connections.
+    """
+    try:
+        (_, hard) = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    except (ValueError, OSError) as e:
+        logger.warning("Couldn't raise the open files limit: %s", e)
 
 
 if __name__ == "__main__":
@@ -113,13 +243,96 @@ if __name__ == "__main__":
         type=int,
         help="The port to run the server on",
     )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default=None,
+        help="Address to listen on (default: the machine's own IP).",
+    )
+    parser.add_argument(
+        "--chain-file",
+        type=str,
+        default=None,
+        help="Log file to persist the blockchain (default: memory only).",
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Store the blockchain in compact arrays instead of Block objects.",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="threads",
+        help="Serve clients with a thread each or with asyncio (default: threads).",
+    )
+    parser.add_argument(
+        "--group-commit",
+        action="store_true",
+        help="Commit the transactions of all clients in batches (threads only).",
+    )
+    parser.add_argument(
+        "--merkle-batches",
+        action="store_true",
+        help="Store each committed batch in a single block under a Merkle root "
+        "(requires --group-commit).",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=CHECKPOINT_EVERY,
+        help="Blocks between balance checkpoints, that make restarts validate "
+        f"only the newer blocks; 0 disables them (default: {CHECKPOINT_EVERY}).",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Local port of the Prometheus text endpoint, /metrics on "
+        "127.0.0.1 (default: disabled).",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=LOG_LEVELS,
+        default="INFO",
+        help="Lowest level logged, DEBUG logs every message (default: INFO).",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        default=None,
+        help="File to write the log to (default: stdout).",
+    )
 
     print("Starting Mini Blockchain Server...")
 
     args = parser.parse_args()
 
+    if args.group_commit and args.engine != "threads":
+        parser.error("--group-commit is only supported by the threads engine")
+    if args.merkle_batches and not args.group_commit:
+        parser.error("--merkle-batches requires --group-commit")
+    if args.merkle_batches and args.columnar:
+        parser.error("--merkle-batches can't be used with --columnar")
+
+    log_listener = setup_logging(args.log_level, args.log_file)
+    logger.info("Send %s to dump the blockchain", DUMP_SIGNAL.name)
+
     try:
-        main(args.server_port)
+        main(
+            args.server_port,
+            args.chain_file,
+            args.columnar,
+            args.engine,
+            args.group_commit,
+            args.host,
+            args.merkle_batches,
+            args.checkpoint_every,
+            args.metrics_port,
+        )
     except Exception as e:
-        print(f"Fatal error: {e}", file=sys.stderr)
+        logger.critical("Fatal error: %s", e)
+        log_listener.stop()
         sys.exit(1)
+
+    log_listener.stop()
@@ -0,0 +1,83 @@
+"""Benchmark of the JSON and binary encodings of blocks.
+
+Times, for a chain of synthetic blocks, the encoding of every block, the
+hashing of the whole chain (what Hash.validate_blockchain_hash does) and the
+size of the encoded chain, with each encoding.
+
+Usage:
+    python3 bench_encoding.py [--blocks N] [--repeat R]
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import argparse
+import datetime
+import time
+
+from models.server import Server
+from models.block import Block, BlockEncoding
+from models.acc_creation_block import AccCreationBlock
+from models.amount import parse_amount
+from models.operation import Operation
+from models.hash import Hash
+
+
+def build_chain(server: Server, n_blocks: int):
+    """Fills the server's chain with n_blocks hashed blocks."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    server.block_chain = []
+    prev_block = None
+    for i in range(n_blocks):
+        owner_name = f"client_{i % 100}"
+        if i < 100:
+            block = AccCreationBlock(owner_name, parse_amount("100"), now)
+        elif i % 3 == 0:
+            block = Block(owner_name, parse_amount("1.5"), Operation.WITHDRAW)
+        else:
+            block = Block(owner_name, parse_amount("2.25"), Operation.DEPOSIT)
+
+        block.hash_b = Hash.compute_hash(server, block, prev_block)
+        server.block_chain.append(block)
+        prev_block = block
+
+
+def best_time(function, repeat: int) -> float:
+    """Best wall time, in seconds, of repeat calls to function."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n_blocks: int, repeat: int):
+    server = Server(0)
+    server.terminate()  # Only the chain is used
+
+    print(f"{n_blocks} blocks, best of {repeat}")
+    print(f"{'encoding':<10}{'encode (s)':>12}{'audit (s)':>12}{'bytes':>12}")
+
+    for encoding in BlockEncoding:
+        server.block_encoding = encoding
+        build_chain(server, n_blocks)
+
+        encode_time = best_time(
+            lambda: [block.serialize(encoding) for block in server.block_chain],
+            repeat,
+        )
+        audit_time = best_time(lambda: Hash.validate_blockchain_hash(server), repeat)
+        size = sum(len(block.serialize(encoding)) for block in server.block_chain)
+
+        print(f"{encoding.name:<10}{encode_time:>12.4f}{audit_time:>12.4f}{size:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blocks", type=int, default=100000, help="Chain length")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per timing")
+
+    args = parser.parse_args()
+
+    main(args.blocks, args.repeat)
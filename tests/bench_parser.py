@@ -0,0 +1,145 @@
+"""Benchmark of the parsing of the text protocol's commands.
+
+Times the parsing of a mix of valid and malformed messages with the parser
+that compared the command with each operation in turn (reproduced below as
+legacy_parse_message) and with the table of NetworkNode.parse_message, and
+the parsing of the same commands sent as messages of many commands each.
+
+Usage:
+    python3 bench_parser.py [--messages N] [--batch B] [--repeat R]
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import argparse
+import time
+
+from models.amount import parse_amount
+from models.network_node import NetworkNode, COMMAND_SEPARATOR
+from models.operation import Operation
+
+MESSAGES = [
+    "deposit 10",
+    "withdraw 2.5",
+    "balance",
+    "history 2",
+    "tip",
+    "proof",
+    "deposit 0.000001",
+    "withdraw abc",  # Malformed
+    "unknown command",  # Malformed
+    "name",  # Malformed
+]
+
+
+def legacy_parse_message(message: str):
+    """The parser before the table of commands, with its fixes for errors."""
+    parts = message.strip().split()
+
+    if len(parts) < 1 or len(parts) > 2:
+        return (None, None)
+
+    action = parts[0].lower()
+
+    if action not in (
+        Operation.DEPOSIT.value,
+        Operation.WITHDRAW.value,
+        Operation.NAME.value,
+        Operation.QUIT.value,
+        Operation.PROOF.value,
+        Operation.BALANCE.value,
+        Operation.HISTORY.value,
+        Operation.TIP.value,
+    ):
+        return (None, None)
+
+    if action == Operation.QUIT.value:
+        return (Operation.QUIT, 0)
+
+    elif action == Operation.NAME.value:
+        if len(parts) < 2:
+            return (None, None)
+        return (Operation.NAME, parts[1])
+
+    elif action in (Operation.BALANCE.value, Operation.TIP.value):
+        if len(parts) > 1:
+            return (None, None)
+        return (Operation(action), None)
+
+    elif action == Operation.HISTORY.value:
+        if len(parts) == 1:
+            return (Operation.HISTORY, 1)
+        try:
+            return (Operation.HISTORY, int(parts[1]))
+        except ValueError:
+            return (None, None)
+
+    elif action == Operation.PROOF.value:
+        if len(parts) == 1:
+            return (Operation.PROOF, None)
+        try:
+            return (Operation.PROOF, int(parts[1]))
+        except ValueError:
+            return (None, None)
+
+    if len(parts) < 2:
+        return (None, None)
+    try:
+        amount = parse_amount(parts[1])
+    except ValueError:
+        return (None, None)
+
+    if action == "deposit":
+        return (Operation.DEPOSIT, amount)
+    return (Operation.WITHDRAW, amount)
+
+
+def best_time(function, repeat: int) -> float:
+    """Best wall time, in seconds, of repeat calls to function."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n_messages: int, batch: int, repeat: int):
+    node = NetworkNode()
+    node.terminate()  # Only the parser is used
+
+    messages = [MESSAGES[i % len(MESSAGES)] for i in range(n_messages)]
+    batches = [
+        f"{COMMAND_SEPARATOR} ".join(messages[i : i + batch])
+        for i in range(0, n_messages, batch)
+    ]
+
+    for message in MESSAGES:
+        assert node.parse_message(message)[0] == legacy_parse_message(message)[0]
+
+    timings = [
+        ("legacy", lambda: [legacy_parse_message(m) for m in messages]),
+        ("table", lambda: [node.parse_message(m) for m in messages]),
+        (f"batch/{batch}", lambda: [node.parse_commands(m) for m in batches]),
+    ]
+
+    print(f"{n_messages} commands, best of {repeat}")
+    print(f"{'parser':<12}{'total (s)':>12}{'us/command':>12}")
+
+    for name, function in timings:
+        elapsed = best_time(function, repeat)
+        print(f"{name:<12}{elapsed:>12.4f}{elapsed / n_messages * 1e6:>12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--messages", type=int, default=200000, help="Commands to parse"
+    )
+    parser.add_argument("--batch", type=int, default=10, help="Commands per message")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per timing")
+
+    args = parser.parse_args()
+
+    main(args.messages, args.batch, args.repeat)
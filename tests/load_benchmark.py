@@ -0,0 +1,437 @@
+"""Load generator and throughput benchmark for the blockchain server.
+
+Starts the server (src/run_server.py) on localhost and drives N concurrent
+clients against it, each replaying the operations of the files in inputs/.
+Every client sends one operation and waits for its reply before sending the
+next one, so the latency of each operation is measured. Runs a sweep over
+client counts and initial chain lengths (the chain is prefilled offline and
+loaded with --chain-file) and reports, for each run, transactions per second,
+p50/p99 latency and how much the chain grew. The results are written as JSON,
+so runs of different commits can be compared.
+
+Usage (from tests/):
+    python3 load_benchmark.py --clients 1,4,16 --chain-lengths 0,100000
+    python3 load_benchmark.py --client-mode process --server-args="--engine asyncio"
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import os
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from models.server import Server
+from models.chain_store import ChainStore
+from models.network_node import FrameReader
+from models.operation import Operation
+from models.transaction_handler import Transaction
+from models.hash import Hash
+from models.amount import UNITS_PER_MINICOIN
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+RUN_SERVER = os.path.join(TESTS_DIR, "..", "src", "run_server.py")
+DEFAULT_INPUTS = os.path.join(TESTS_DIR, "inputs", "*.txt")
+
+HOST = "127.0.0.1"
+SERVER_START_TIMEOUT = 30.0  # Seconds, loading a long chain takes a while
+
+
+def read_operations(paths: List[str]) -> List[List[str]]:
+    """Reads the operations of each input file, without the quit command."""
+    mixes = []
+    for path in paths:
+        with open(path, encoding="utf-8") as input_file:
+            operations = [
+                line.strip()
+                for line in input_file
+                if line.strip() and line.strip() != Operation.QUIT.value
+            ]
+        if operations:
+            mixes.append(operations)
+    return mixes
+
+
+def run_client(
+    port: int,
+    client_name: str,
+    operations: List[str],
+    repeat: int,
+    barrier: Optional[threading.Barrier] = None,
+) -> Dict:
+    """Replays the operations repeat times, one at a time, as a client.
+
+    If a barrier is given, waits on it after connecting, so all the clients
+    start sending together.
+
+    Returns:
+        Dict: The latency of each operation (in seconds), how many were
+        accepted ("ok") and rejected by the server, and when (time.monotonic)
+        the client started and finished sending them.
+    """
+    connection = socket.create_connection((HOST, port))
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    reader = FrameReader(connection)
+    replies: List[bytes] = []
+
+    def next_reply() -> str:
+        while not replies:
+            frames = reader.recv_frames()
+            if frames is None:
+                raise ConnectionError("Server closed the connection")
+            replies.extend(frames)
+        return replies.pop(0).decode("utf-8")
+
+    connection.sendall(f"name {client_name}\n".encode("utf-8"))
+
+    if barrier is not None:
+        barrier.wait()
+
+    latencies = []
+    accepted = 0
+    rejected = 0
+    started = time.monotonic()
+    for _ in range(repeat):
+        for operation in operations:
+            start = time.perf_counter()
+            connection.sendall(f"{operation}\n".encode("utf-8"))
+            reply = next_reply()
+            latencies.append(time.perf_counter() - start)
+
+            if reply == "ok":
+                accepted += 1
+            else:
+                rejected += 1
+    finished = time.monotonic()
+
+    connection.sendall(f"{Operation.QUIT.value}\n".encode("utf-8"))
+    next_reply()  # Goodbye message
+    connection.close()
+
+    return {
+        "latencies": latencies,
+        "accepted": accepted,
+        "rejected": rejected,
+        "started": started,
+        "finished": finished,
+    }
+
+
+def chain_height(port: int) -> int:
+    """Number of committed blocks of the server's chain, from a tip query."""
+    connection = socket.create_connection((HOST, port))
+    reader = FrameReader(connection)
+    try:
+        connection.sendall(
+            f"name benchmark_probe\n{Operation.TIP.value}\n".encode("utf-8")
+        )
+        frames = reader.recv_frames()
+        if not frames:
+            raise ConnectionError("Server closed the connection")
+        connection.sendall(f"{Operation.QUIT.value}\n".encode("utf-8"))
+    finally:
+        connection.close()
+
+    # "tip <height> <hash>"
+    return int(frames[0].decode("utf-8").split()[1])
+
+
+def run_clients(
+    port: int, n_clients: int, mixes: List[List[str]], repeat: int, mode: str
+) -> List[Dict]:
+    """Runs n_clients concurrent clients, as threads or as processes.
+
+    Client i replays the operation mix i % len(mixes).
+    """
+    results: List[Dict] = [None] * n_clients
+
+    if mode == "thread":
+        barrier = threading.Barrier(n_clients)
+
+        def worker(i: int):
+            results[i] = run_client(
+                port, f"bench_{i}", mixes[i % len(mixes)], repeat, barrier
+            )
+
+        threads = [
+            threading.Thread(target=worker, args=(i,)) for i in range(n_clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    else:
+        procs = []
+        for i in range(n_clients):
+            spec = json.dumps(
+                {
+                    "port": port,
+                    "name": f"bench_{i}",
+                    "operations": mixes[i % len(mixes)],
+                    "repeat": repeat,
+                }
+            )
+            procs.append(
+                subprocess.Popen(
+                    [sys.executable, __file__, "--worker", spec],
+                    stdout=subprocess.PIPE,
+                )
+            )
+        for i, proc in enumerate(procs):
+            (out, _) = proc.communicate()
+            results[i] = json.loads(out)
+
+    return results
+
+
+def prefill_chain(path: str, n_blocks: int):
+    """Writes a chain log with n_blocks deposits, without a running server."""
+    server = Server(0, ChainStore(path))
+    server.terminate()  # Only the chain is used
+
+    for i in range(n_blocks):
+        client_name = f"prefill_{i % 1000}"
+        server.accounts.register(client_name)
+        Transaction.execute_transaction(
+            server, client_name, UNITS_PER_MINICOIN, Operation.DEPOSIT
+        )
+
+    # Leave the checkpoints a running server would have saved
+    Hash.validate_new_blocks(server)
+    server.commit()
+    server.chain_store.close()
+
+
+def start_server(port: int, chain_file: str, server_args: List[str], log):
+    """Starts the server and waits until it accepts connections."""
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            RUN_SERVER,
+            str(port),
+            "--host",
+            HOST,
+            "--chain-file",
+            chain_file,
+        ]
+        + server_args,
+        stdout=log,
+        stderr=log,
+    )
+
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("Server exited before accepting connections")
+        try:
+            socket.create_connection((HOST, port)).close()
+            return proc
+        except ConnectionRefusedError:
+            time.sleep(0.05)
+
+    proc.kill()
+    raise RuntimeError("Server did not start in time")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def run_benchmark(
+    port: int,
+    n_clients: int,
+    chain_length: int,
+    mixes: List[List[str]],
+    repeat: int,
+    mode: str,
+    server_args: List[str],
+    log,
+) -> Dict:
+    """Starts a server with a prefilled chain, loads it and measures."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chain_file = os.path.join(tmp_dir, "chain.log")
+        prefill_chain(chain_file, chain_length)
+
+        server_proc = start_server(port, chain_file, server_args, log)
+        try:
+            initial_height = chain_height(port)
+            results = run_clients(port, n_clients, mixes, repeat, mode)
+            final_height = chain_height(port)
+        finally:
+            server_proc.send_signal(signal.SIGINT)
+            server_proc.wait()
+
+    latencies = sorted(lat for result in results for lat in result["latencies"])
+    # Only while clients were sending, without connecting and process startup
+    duration = max(result["finished"] for result in results) - min(
+        result["started"] for result in results
+    )
+    accepted = sum(result["accepted"] for result in results)
+    rejected = sum(result["rejected"] for result in results)
+
+    return {
+        "clients": n_clients,
+        "chain_length": chain_length,
+        "operations": len(latencies),
+        "accepted": accepted,
+        "rejected": rejected,
+        "duration_s": duration,
+        "tps": len(latencies) / duration if duration > 0 else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        # Measured: a batch of transactions may be a single block
+        "chain_growth": final_height - initial_height,
+        "final_chain_length": final_height,
+    }
+
+
+def git_commit() -> str:
+    """Commit of the code being benchmarked, if it's a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=TESTS_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(args):
+    paths = sorted(glob.glob(args.inputs))
+    mixes = read_operations(paths)
+    if not mixes:
+        raise ValueError(f"No operations found in {args.inputs}")
+
+    server_args = shlex.split(args.server_args)
+
+    runs = []
+    print(
+        f"{'clients':>8}{'chain':>10}{'ops':>8}{'tps':>10}"
+        f"{'p50 ms':>9}{'p99 ms':>9}{'growth':>8}"
+    )
+    with open(args.server_log, "w", encoding="utf-8") as log:
+        for chain_length in args.chain_lengths:
+            for n_clients in args.clients:
+                run = run_benchmark(
+                    args.port,
+                    n_clients,
+                    chain_length,
+                    mixes,
+                    args.repeat,
+                    args.client_mode,
+                    server_args,
+                    log,
+                )
+                runs.append(run)
+                print(
+                    f"{run['clients']:>8}{run['chain_length']:>10}"
+                    f"{run['operations']:>8}{run['tps']:>10.1f}"
+                    f"{run['p50_ms']:>9.3f}{run['p99_ms']:>9.3f}"
+                    f"{run['chain_growth']:>8}"
+                )
+
+    report = {
+        "commit": git_commit(),
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "config": {
+            "inputs": [os.path.basename(path) for path in paths],
+            "repeat": args.repeat,
+            "client_mode": args.client_mode,
+            "server_args": server_args,
+        },
+        "runs": runs,
+    }
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+
+    print(f"Results written to {args.output}")
+
+
+def int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8080, help="Server port")
+    parser.add_argument(
+        "--clients",
+        type=int_list,
+        default=[1, 4, 16],
+        help="Comma separated numbers of concurrent clients (default: 1,4,16).",
+    )
+    parser.add_argument(
+        "--chain-lengths",
+        type=int_list,
+        default=[0],
+        help="Comma separated initial chain lengths (default: 0).",
+    )
+    parser.add_argument(
+        "--inputs",
+        type=str,
+        default=DEFAULT_INPUTS,
+        help="Glob of the files with the operation mixes (default: inputs/*).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=100,
+        help="Times each client replays its operation mix (default: 100).",
+    )
+    parser.add_argument(
+        "--client-mode",
+        choices=("thread", "process"),
+        default="thread",
+        help="Run clients as threads of this process or as processes.",
+    )
+    parser.add_argument(
+        "--server-args",
+        type=str,
+        default="",
+        help='Extra arguments for run_server.py, e.g. "--engine asyncio".',
+    )
+    parser.add_argument(
+        "--server-log",
+        type=str,
+        default="server.log",
+        help="File for the output of the server (default: server.log).",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="benchmark.json",
+        help="JSON file for the results (default: benchmark.json).",
+    )
+    parser.add_argument("--worker", type=str, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        # Client process started by run_clients
+        spec = json.loads(args.worker)
+        result = run_client(
+            spec["port"], spec["name"], spec["operations"], spec["repeat"]
+        )
+        json.dump(result, sys.stdout)
+    else:
+        main(args)
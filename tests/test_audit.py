@@ -0,0 +1,82 @@
+"""Tests of the offline audits of a chain log.
+
+Usage (from the repository's root):
+    PYTHONPATH=src python3 -m unittest discover tests
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import os
+import struct
+import tempfile
+import threading
+import unittest
+
+from audit_chain import audit_sequential
+from models.server import Server
+from models.chain_store import ChainStore, record_at
+from models.block import BlockEncoding, BLOCK_HEAD
+from models.operation import Operation
+from models.parallel_audit import ParallelAudit
+from models.amount import UNITS_PER_MINICOIN
+
+HEADER_SIZE = 6  # Magic, format version and encoding of the log
+NAME_LEN = struct.Struct("<H")
+NAME_LEN_OFFSET = 4 + 32 + BLOCK_HEAD.size - NAME_LEN.size  # In a record
+
+
+class CorruptRecordTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.chain_file = os.path.join(self.tmp_dir.name, "chain.log")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_chain(self, encoding: BlockEncoding, blocks: int):
+        server = Server(0, ChainStore(self.chain_file, encoding=encoding))
+        server.terminate()  # Only the chain is used
+        server.accounts.register("alice")
+        lock = threading.Lock()
+        for _ in range(blocks):
+            server.transact("alice", UNITS_PER_MINICOIN, Operation.DEPOSIT, lock)
+        server.chain_store.close()
+
+    def set_name_len(self, index: int, name_len: int):
+        """Overwrites the name length of the index-th record."""
+        with open(self.chain_file, "r+b") as log:
+            data = log.read()
+            offset = HEADER_SIZE
+            for _ in range(index):
+                (_, _, offset) = record_at(data, offset)
+            log.seek(offset + NAME_LEN_OFFSET)
+            log.write(NAME_LEN.pack(name_len))
+
+    def audits(self):
+        return (
+            audit_sequential(self.chain_file),
+            ParallelAudit.audit_log(self.chain_file, workers=2),
+        )
+
+    def test_valid_chain(self):
+        for encoding in (BlockEncoding.JSON, BlockEncoding.BINARY):
+            with self.subTest(encoding=encoding.name):
+                self.write_chain(encoding, 5)
+                self.assertEqual(self.audits(), ((5, None), (5, None)))
+                os.remove(self.chain_file)
+
+    def test_undecodable_record(self):
+        cases = [(0, 0xFFFF), (2, 0xFFFF), (2, 1)]
+        for encoding in (BlockEncoding.JSON, BlockEncoding.BINARY):
+            for index, name_len in cases:
+                with self.subTest(encoding=encoding.name, index=index, len=name_len):
+                    self.write_chain(encoding, 5)
+                    self.set_name_len(index, name_len)
+
+                    self.assertEqual(self.audits(), ((5, index), (5, index)))
+                    os.remove(self.chain_file)
+
+
+if __name__ == "__main__":
+    unittest.main()
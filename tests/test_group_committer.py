@@ -0,0 +1,76 @@
+"""Tests of the group commit of transactions.
+
+Usage (from the repository's root):
+    PYTHONPATH=src python3 -m unittest discover tests
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from models.server import Server
+from models.chain_store import ChainStore
+from models.group_committer import GroupCommitter, PendingTransaction
+from models.operation import Operation
+from models.transaction_handler import Transaction
+from models.amount import UNITS_PER_MINICOIN
+
+
+class GroupCommitterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        chain_store = ChainStore(os.path.join(self.tmp_dir.name, "chain.log"))
+        self.server = Server(0, chain_store, checkpoint_every=2)
+        self.server.terminate()  # Only the chain is used
+        self.server.accounts.register("alice")
+        self.committer = GroupCommitter(self.server, threading.Lock())
+
+    def tearDown(self):
+        self.server.chain_store.close()
+        self.tmp_dir.cleanup()
+
+    def deposit(self) -> str:
+        pending = PendingTransaction("alice", UNITS_PER_MINICOIN, Operation.DEPOSIT)
+        self.committer._commit([pending])
+        return pending.status
+
+    def test_failed_commit_is_rolled_back(self):
+        self.assertEqual(self.deposit(), "ok")
+
+        # Fails saving the checkpoint of height 2, after the validation
+        with mock.patch.object(
+            self.server.checkpoint_store, "save", side_effect=OSError("disk")
+        ), self.assertLogs("models.group_committer", "ERROR"):
+            self.assertEqual(self.deposit(), "Internal error")
+
+        self.assertEqual(len(self.server.block_chain), 1)
+        self.assertEqual(self.server.verified_height, 1)
+        self.assertEqual(self.server.ledger.balances["alice"], UNITS_PER_MINICOIN)
+
+    def test_block_after_failed_commit_is_validated(self):
+        self.deposit()
+        with mock.patch.object(
+            self.server.checkpoint_store, "save", side_effect=OSError("disk")
+        ), self.assertLogs("models.group_committer", "ERROR"):
+            self.deposit()
+
+        link = Transaction._link
+
+        def link_corrupted(server, new_block, last_hash):
+            block = link(server, new_block, last_hash)
+            block.hash_b = bytes(32)
+            return block
+
+        with mock.patch.object(Transaction, "_link", side_effect=link_corrupted):
+            self.assertEqual(self.deposit(), "Corrupted block's hash")
+
+        self.assertEqual(len(self.server.block_chain), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
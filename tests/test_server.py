@@ -0,0 +1,82 @@
+"""Tests of the blockchain state kept by the server.
+
+Usage (from the repository's root):
+    PYTHONPATH=src python3 -m unittest discover tests
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import os
+import struct
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from models.server import Server
+from models.chain_store import ChainStore
+from models.block import Block
+from models.operation import Operation
+from models.transaction_handler import Transaction
+from models.amount import UNITS_PER_MINICOIN
+
+
+class FailedAppendTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.chain_file = os.path.join(self.tmp_dir.name, "chain.log")
+        self.server = Server(0, ChainStore(self.chain_file), checkpoint_every=2)
+        self.server.terminate()  # Only the chain is used
+        self.server.accounts.register("alice")
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.server.chain_store.close()
+        self.tmp_dir.cleanup()
+
+    def deposit(self) -> str:
+        return self.server.transact(
+            "alice", UNITS_PER_MINICOIN, Operation.DEPOSIT, self.lock
+        )
+
+    def stored_blocks(self) -> int:
+        self.server.chain_store.sync()
+        return sum(1 for _ in ChainStore(self.chain_file, read_only=True).load())
+
+    def test_append_block_reverted_if_checkpoint_fails(self):
+        self.assertEqual(self.deposit(), "ok")
+        block = Block("alice", UNITS_PER_MINICOIN, Operation.DEPOSIT)
+        block.hash_b = bytes(32)
+
+        with mock.patch("models.server.Checkpoint", side_effect=struct.error):
+            with self.assertRaises(struct.error):
+                self.server.append_block(block)
+
+        self.assertEqual(len(self.server.block_chain), 1)
+        self.assertEqual(self.server.ledger.balances["alice"], UNITS_PER_MINICOIN)
+        self.assertEqual(len(self.server.owner_index.history("alice")), 1)
+
+    def test_failed_transaction_is_rolled_back(self):
+        self.assertEqual(self.deposit(), "ok")
+
+        with mock.patch.object(
+            Transaction, "_link", side_effect=OSError("disk")
+        ), self.assertLogs("models.server", "ERROR"):
+            self.assertEqual(self.deposit(), "Internal error")
+        with mock.patch.object(
+            self.server.checkpoint_store, "save", side_effect=OSError("disk")
+        ), self.assertLogs("models.server", "ERROR"):
+            self.assertEqual(self.deposit(), "Internal error")
+
+        self.assertEqual(len(self.server.block_chain), 1)
+        self.assertEqual(self.stored_blocks(), 1)
+        self.assertEqual(self.server.ledger.balances["alice"], UNITS_PER_MINICOIN)
+
+        self.assertEqual(self.deposit(), "ok")
+        self.assertEqual(self.stored_blocks(), 2)
+        self.assertEqual(self.server.verified_height, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
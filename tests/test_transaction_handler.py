@@ -0,0 +1,70 @@
+"""Tests of the validation and execution of transactions.
+
+Usage (from the repository's root):
+    PYTHONPATH=src python3 -m unittest discover tests
+
+Authors: Andre Grassi de Jesus, Ricardo Faria
+Last Modified: Oct. 18 2026
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+
+from models.server import Server
+from models.chain_store import ChainStore
+from models.operation import Operation
+from models.transaction_handler import Transaction
+from models.wire_protocol import WireProtocol, Status
+from models.amount import MAX_UNITS
+
+OVERFLOW = "Can't deposit more money than the largest balance amount"
+
+
+class BalanceLimitTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.chain_file = os.path.join(self.tmp_dir.name, "chain.log")
+        # A checkpoint of every block packs every balance as an int64
+        self.server = Server(0, ChainStore(self.chain_file), checkpoint_every=1)
+        self.server.terminate()  # Only the chain is used
+        self.server.accounts.register("alice")
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.server.chain_store.close()
+        self.tmp_dir.cleanup()
+
+    def deposit(self, amount: int) -> str:
+        return self.server.transact("alice", amount, Operation.DEPOSIT, self.lock)
+
+    def test_deposit_past_largest_balance_is_rejected(self):
+        self.assertEqual(self.deposit(MAX_UNITS), "ok")
+        self.assertEqual(self.deposit(MAX_UNITS), OVERFLOW)
+        self.assertEqual(self.deposit(1), OVERFLOW)
+
+        self.assertEqual(self.server.ledger.balances["alice"], MAX_UNITS)
+        self.assertEqual(len(self.server.block_chain), 1)
+
+        self.server.chain_store.close()
+        stored = list(ChainStore(self.chain_file, read_only=True).load())
+        self.assertEqual(len(stored), len(self.server.block_chain))
+
+    def test_deposit_up_to_largest_balance_is_accepted(self):
+        self.assertEqual(self.deposit(MAX_UNITS - 1), "ok")
+        self.assertEqual(self.deposit(1), "ok")
+        self.assertEqual(self.server.ledger.balances["alice"], MAX_UNITS)
+
+    def test_batch_counts_earlier_deposits(self):
+        transactions = [("alice", MAX_UNITS, Operation.DEPOSIT)] * 2
+        results = Transaction.execute_merkle_batch(self.server, transactions)
+
+        self.assertEqual(results, [(True, "ok"), (False, OVERFLOW)])
+
+    def test_binary_status(self):
+        self.assertEqual(WireProtocol.status_of(OVERFLOW), Status.INVALID_AMOUNT)
+
+
+if __name__ == "__main__":
+    unittest.main()